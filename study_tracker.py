@@ -4,26 +4,1998 @@ C++ Study Progress Tracker
 A simple CLI tool to track progress through the C++ Quantitative Finance Learning Path
 """
 
-import argparse
+import hashlib
+import io
 import json
+import marshal
 import os
 import re
-import shutil
 import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from collections.abc import Mapping
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
+from functools import wraps
+from itertools import accumulate, compress, repeat
+from operator import itemgetter, ne
 from typing import Optional
 
+# Modules that only some commands need (argparse, shutil, sqlite3,
+# concurrent.futures, random, rich, numpy) are imported where they are
+# used, so a one-line command like `--status --plain` starts quickly
+
 try:
-    from rich import box
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.table import Table
-except ImportError:
-    print("Please install 'rich' library: pip install rich")
-    sys.exit(1)
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writers are not serialized
+    fcntl = None
+
+# Set by load_numpy on first use; None when NumPy is not installed
+_NOT_LOADED = object()
+np = _NOT_LOADED
+
+
+def load_numpy():
+    """The numpy module, imported on first use, or None if it is missing
+
+    Optional: StatsEngine and the forecast fall back to lists without it.
+    """
+    global np
+    if np is _NOT_LOADED:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
+
+
+def import_rich() -> tuple:
+    """rich's box, Console, Panel and Table, imported on first use"""
+    try:
+        from rich import box
+        from rich.console import Console
+        from rich.panel import Panel
+        from rich.table import Table
+    except ImportError:
+        print("Please install 'rich' library: pip install rich")
+        sys.exit(1)
+    return box, Console, Panel, Table
+
+
+class LazyConsole:
+    """rich Console that is only created, and rich imported, once used"""
+
+    def __init__(self):
+        self.console = None
+
+    def __getattr__(self, name):
+        if self.console is None:
+            _, Console, _, _ = import_rich()
+            self.console = Console()
+        return getattr(self.console, name)
+
+
+# Rich markup tags used in the tracker's output, stripped under --plain
+_MARKUP_PATTERN = re.compile(
+    r"\[/?(?:bold|dim|red|green|yellow|cyan|white)(?: (?:bold|dim|red|green|yellow|cyan|white))*\]"
+)
+
+
+class PlainConsole:
+    """Console for --plain: prints text with markup removed, without rich"""
+
+    def print(self, *objects, **kwargs):
+        print(*(_MARKUP_PATTERN.sub("", str(obj)) for obj in objects))
+
+
+console = LazyConsole()
+
+
+def panel(text: str, title: str):
+    """Rounded rich Panel of text, or the title above the text under --plain"""
+    if isinstance(console, PlainConsole):
+        return f"{title}\n{text}"
+    box, _, Panel, _ = import_rich()
+    return Panel(text, title=title, box=box.ROUNDED)
+
+
+def table(title: str, columns: list, rows):
+    """Simple rich Table, or tab-separated lines under --plain
+
+    ``columns`` holds add_column keyword arguments, "header" included.
+    """
+    if isinstance(console, PlainConsole):
+        lines = [title, "\t".join(column["header"] for column in columns)]
+        lines.extend("\t".join(row) for row in rows)
+        return "\n".join(lines)
+    box, _, _, Table = import_rich()
+    rich_table = Table(title=title, box=box.SIMPLE)
+    for column in columns:
+        rich_table.add_column(**column)
+    for row in rows:
+        rich_table.add_row(*row)
+    return rich_table
+
+# Master line classifier used by parse_plan_lines. Each branch is anchored at
+# the start of the line and is named after the kind of line it recognises, so
+# one match both classifies the line (``lastgroup``) and captures its value:
+#   "- [ ] task" / "  - [x] subtask"  -> unchecked / checked
+#   "#### Day 12 (1 hour - Weekday)"  -> day number
+#   "### Week 3: Templates"           -> week number
+#   "## 📅 PHASE 2: ADVANCED C++"     -> phase header
+_LINE_PATTERN = re.compile(
+    r"[ \t]*- (?:(?P<unchecked>\[ \])|(?P<checked>\[[xX]\]))"
+    r"|#### Day (?P<day>\d+)"
+    r"|#{3,} Week (?P<week>\d+)"
+    r"|#{2,} 📅 (?P<phase>PHASE)"
+)
+
+# Week headers in the raw file, which split the plan into blocks that are
+# hashed and re-parsed independently. Matches are only headers when they
+# start a line; that is checked separately since a lookbehind here would
+# disable the fast literal search.
+_BLOCK_PATTERN = re.compile(rb"###+ Week \d")
+
+
+# Day/week placeholder for the context a plan file inherits from the files
+# before it; parsed separately, it is only known once the files are merged
+_INHERITED = 0xFFFFFFFF
+
+# Plan directories smaller than this are parsed serially, since starting a
+# process pool costs more than it saves
+_PARALLEL_PARSE_MIN_BYTES = 1 << 20
+
+# Bump whenever the layout of the parse cache file changes
+_PARSE_CACHE_VERSION = 8
+
+# Bump whenever the layout of the write-ahead journal record changes
+_JOURNAL_VERSION = 1
+
+# History entries older than this are rolled up into per-day aggregates
+# by default, and the rollup starts on its own once the stored history
+# grows past the size below
+_HISTORY_RETENTION_DAYS = 90
+_AUTO_COMPACT_BYTES = 4 << 20
+
+# A file modified this close to the moment its stat is recorded can change
+# again within the same timestamp tick without its mtime moving, so such a
+# fingerprint is only trusted after the content hash has been re-checked
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Trajectories simulated per completion forecast, and the percentiles of
+# their finishing dates that are reported
+_FORECAST_TRIALS = 4000
+_FORECAST_PERCENTILES = (10, 50, 90)
+
+# Bump whenever the layout of the forecast cache file changes
+_FORECAST_CACHE_VERSION = 1
+
+# Checkbox counts at which --status announces a milestone
+_MILESTONES = {84: "Junior C++ Level", 168: "Course Completion"}
+
+
+def _fill_prefix(column: array, old, new) -> int:
+    """Replace the leading run of ``old`` values in a column with ``new``"""
+    k = 0
+    while k < len(column) and column[k] == old:
+        k += 1
+    column[:k] = array(column.typecode, [new]) * k
+    return k
+
+
+class CheckboxRecord(Mapping):
+    """Read-only dict-style view of one checkbox in a CheckboxStore"""
+
+    __slots__ = ("_store", "_index")
+
+    FIELDS = (
+        "line_index",
+        "day",
+        "week",
+        "phase",
+        "checked",
+        "content",
+        "full_line",
+        "offset",
+    )
+
+    def __init__(self, store: "CheckboxStore", index: int):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str):
+        store = self._store
+        i = self._index
+        if key == "day":
+            return store.day[i]
+        if key == "checked":
+            return store.is_checked(i)
+        if key == "week":
+            return store.week[i]
+        if key == "content":
+            return store.full_line(i).strip()
+        if key == "phase":
+            return store.phases[store.phase_id[i]]
+        if key == "line_index":
+            return store.line_index[i]
+        if key == "full_line":
+            return store.full_line(i)
+        if key == "offset":
+            offset = store.offset[i]
+            return offset if offset >= 0 else None
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"CheckboxRecord({dict(self)!r})"
+
+
+class CheckboxStore:
+    """Columnar checkbox index
+
+    Numeric fields live in typed arrays, the checked state in a packed
+    bitset and phase headers in a small interned table. Line text is only
+    materialised on first access. Indexing or iterating yields read-only
+    CheckboxRecord views, so code written against the old list of dicts
+    keeps working.
+    """
+
+    def __init__(self):
+        self.line_index = array("I")
+        self.day = array("I")
+        self.week = array("I")
+        self.phase_id = array("H")
+        self.offset = array("q")  # byte offset of the mark, -1 if unknown
+        self.checked = bytearray()  # bit i set <=> checkbox i is checked
+        self.phases = []
+        self._phase_ids = {}
+        # Range index: key -> list of (start, stop) runs of consecutive
+        # checkboxes
+        self.day_runs = {}
+        self.week_runs = {}
+        self.phase_runs = {}
+        self._context_starts = []
+        self._masks = {}  # cached bit masks, see mask_of_runs/mask_where
+        self.next_unchecked = 0
+        # One tuple per week block of the file it was parsed from:
+        # (digest, entry context, exit context, first checkbox, checkbox stop,
+        #  first context start, context start stop, first line, first byte),
+        # contexts being (day, week, phase header)
+        self.blocks = []
+        self._full_lines = None
+        self._load_full_lines = None
+        self._full_lines_blob = None
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [CheckboxRecord(self, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("checkbox index out of range")
+        return CheckboxRecord(self, index)
+
+    def __iter__(self):
+        return map(CheckboxRecord, repeat(self), range(len(self)))
+
+    def intern_phase(self, phase: str) -> int:
+        """Return the id of a phase header, adding it to the table if new"""
+        phase_id = self._phase_ids.get(phase)
+        if phase_id is None:
+            phase_id = self._phase_ids[phase] = len(self.phases)
+            self.phases.append(phase)
+        return phase_id
+
+    def start_context(self, position: int, day: int, week: int, phase_id: int):
+        """Record the day/week/phase in effect from checkbox ``position`` on"""
+        self._context_starts.append((position, day, week, phase_id))
+
+    def build_index(self):
+        """Turn the recorded context changes into day/week/phase runs"""
+        self._masks = {}
+        positions = [context[0] for context in self._context_starts]
+        if not positions:
+            self.day_runs, self.week_runs, self.phase_runs = {}, {}, {}
+            return
+        for field, runs in enumerate(
+            (self.day_runs, self.week_runs, self.phase_runs), 1
+        ):
+            runs.clear()
+            keys = list(map(itemgetter(field), self._context_starts))
+            # A run starts wherever this field's key differs from the
+            # previous context's
+            changes = [0]
+            changes.extend(compress(range(1, len(keys)), map(ne, keys[1:], keys)))
+            stops = [positions[i] for i in changes[1:]]
+            stops.append(len(self))
+            for i, stop in zip(changes, stops):
+                runs.setdefault(keys[i], []).append((positions[i], stop))
+
+    def day_indices(self, day: int) -> list:
+        """Indices of the checkboxes of a day, in file order"""
+        return [i for run in self.day_runs.get(day, ()) for i in range(*run)]
+
+    def week_indices(self, week: int) -> list:
+        """Indices of the checkboxes of a week, in file order"""
+        return [i for run in self.week_runs.get(week, ()) for i in range(*run)]
+
+    def first_index_of_day(self, day: int) -> Optional[int]:
+        """Index of the first checkbox of a day, or None if it has none"""
+        runs = self.day_runs.get(day)
+        return runs[0][0] if runs else None
+
+    def week_mask(self, week: int) -> tuple:
+        """Mask of the checkboxes of a week"""
+        return self.mask_of_runs(("week", week), self.week_runs.get(week, ()))
+
+    def phase_mask(self, phase_id: int) -> tuple:
+        """Mask of the checkboxes under a phase header"""
+        return self.mask_of_runs(("phase", phase_id), self.phase_runs.get(phase_id, ()))
+
+    def mask_of_runs(self, key, runs) -> tuple:
+        """Mask covering (start, stop) runs, cached under ``key``
+
+        A mask is a (start, bits) pair: bit j of ``bits`` selects checkbox
+        start + j, so its cost follows the span it covers rather than the
+        plan. Masks only depend on where checkboxes sit, so they stay valid
+        while boxes are checked and unchecked.
+        """
+        mask = self._masks.get(key)
+        if mask is None:
+            base = runs[0][0] if runs else 0
+            bits = 0
+            for start, stop in runs:
+                bits |= ((1 << (stop - start)) - 1) << (start - base)
+            mask = self._masks[key] = (base, bits)
+        return mask
+
+    def mask_where(self, key, predicate) -> tuple:
+        """Mask of the checkboxes whose line satisfies ``predicate``"""
+        mask = self._masks.get(key)
+        if mask is None:
+            selected = bytearray((len(self) + 7) // 8)
+            for i in range(len(self)):
+                if predicate(self.full_line(i)):
+                    selected[i >> 3] |= 1 << (i & 7)
+            bits = int.from_bytes(selected, "little")
+            base = (bits & -bits).bit_length() - 1 if bits else 0
+            mask = self._masks[key] = (base, bits >> base)
+        return mask
+
+    def count_in(self, mask: tuple) -> int:
+        """Number of checked boxes within a mask, as one masked popcount"""
+        start, bits = mask
+        return (self.checked_bits(start, start + bits.bit_length()) & bits).bit_count()
+
+    def checked_int(self) -> int:
+        """The checked bitset as one int, bit i being checkbox i"""
+        return int.from_bytes(self.checked, "little")
+
+    def splice_blocks(
+        self,
+        source: "CheckboxStore",
+        first: int,
+        stop: int,
+        line_start: int,
+        byte_start: int,
+        checked_runs: list,
+    ):
+        """Append the checkboxes of ``source.blocks[first:stop]``
+
+        The blocks must still be consecutive in the file; their line and
+        byte positions are shifted to where the first one now starts.
+        """
+        head, tail = source.blocks[first], source.blocks[stop - 1]
+        self.extend_from(
+            source,
+            head[3],
+            tail[4],
+            head[5],
+            tail[6],
+            line_start - head[7],
+            byte_start - head[8],
+            checked_runs,
+        )
+
+    def extend_from(
+        self,
+        source: "CheckboxStore",
+        start: int,
+        end: int,
+        ctx_start: int,
+        ctx_stop: int,
+        line_shift: int,
+        byte_shift: int,
+        checked_runs: list,
+    ):
+        """Append checkboxes [start, end) of another store
+
+        ``ctx_start:ctx_stop`` selects their context starts. Line and byte
+        positions are moved by the given shifts, and the checked bits are
+        added to ``checked_runs`` as a (start, bits) pair for
+        set_checked_positions.
+        """
+        shift = len(self) - start
+        phase_ids = source.phase_id[start:end]
+        phase_map = {
+            pid: self.intern_phase(source.phases[pid]) for pid in set(phase_ids)
+        }
+
+        line_index = source.line_index[start:end]
+        if line_shift:
+            line_index = [i + line_shift for i in line_index]
+        offset = source.offset[start:end]
+        if byte_shift:
+            offset = [off + byte_shift for off in offset]
+        remap = any(old != new for old, new in phase_map.items())
+        if remap:
+            phase_ids = [phase_map[pid] for pid in phase_ids]
+
+        checked_runs.append((len(self), source.checked_bits(start, end)))
+        self.line_index.extend(line_index)
+        self.day.extend(source.day[start:end])
+        self.week.extend(source.week[start:end])
+        self.phase_id.extend(phase_ids)
+        self.offset.extend(offset)
+        context_starts = source._context_starts[ctx_start:ctx_stop]
+        if shift or remap:
+            context_starts = [
+                (position + shift, day, week, phase_map[pid])
+                for position, day, week, pid in context_starts
+            ]
+        self._context_starts.extend(context_starts)
+
+    def resolve_inherited(self, day: int, week: int, phase: str) -> int:
+        """Fill in the context a separately parsed plan file starts in
+
+        Checkboxes above the file's first day, week or phase header were
+        parsed with the _INHERITED placeholder. Returns how many leading
+        checkboxes to drop because no day header precedes them at all.
+        """
+        phase_id = self.intern_phase(phase)
+        inherited_phase = self._phase_ids.get(None)
+        leading = _fill_prefix(self.day, _INHERITED, day)
+        _fill_prefix(self.week, _INHERITED, week)
+        _fill_prefix(self.phase_id, inherited_phase, phase_id)
+
+        self._context_starts = [
+            (
+                position,
+                day if d == _INHERITED else d,
+                week if w == _INHERITED else w,
+                phase_id if pid == inherited_phase else pid,
+            )
+            for position, d, w, pid in self._context_starts
+        ]
+        return leading if day == 0 else 0
+
+    def forget_blocks(self, indices: list):
+        """Keep the blocks holding these checkboxes from being reused
+
+        Called once their marks change on disk, since the block digests
+        still describe the old text.
+        """
+        starts = [block[3] for block in self.blocks]
+        for i in indices:
+            # Empty blocks share their start with the next one, so take
+            # the last block starting at or before i
+            k = bisect_right(starts, i) - 1
+            if k >= 0:
+                self.blocks[k] = (b"",) + tuple(self.blocks[k][1:])
+
+    def set_checked_positions(self, positions: list, runs: list = ()):
+        """Rebuild the bitset with exactly the given checkboxes checked
+
+        ``runs`` adds (start, bits) pairs of checked bits, bit 0 of each
+        landing on checkbox ``start``.
+        """
+        bits = bytearray((len(self) + 7) // 8)
+        for i in positions:
+            bits[i >> 3] |= 1 << (i & 7)
+        if runs:
+            merged = int.from_bytes(bits, "little")
+            for start, run_bits in runs:
+                merged |= run_bits << start
+            bits = bytearray(merged.to_bytes(len(bits), "little"))
+        self.checked = bits
+        self.next_unchecked = self._scan_unchecked(0)
+
+    def is_checked(self, i: int) -> bool:
+        return bool(self.checked[i >> 3] >> (i & 7) & 1)
+
+    def set_checked(self, i: int, value: bool):
+        if value:
+            self.checked[i >> 3] |= 1 << (i & 7)
+            if i == self.next_unchecked:
+                self.next_unchecked = self._scan_unchecked(i + 1)
+        else:
+            self.checked[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+            if i < self.next_unchecked:
+                self.next_unchecked = i
+
+    def count_checked(self) -> int:
+        return self.checked_int().bit_count()
+
+    def checked_bits(self, start: int, stop: int) -> int:
+        """The checked bits of [start, stop) as an int, bit 0 being ``start``"""
+        bits = int.from_bytes(self.checked[start >> 3 : (stop + 7) >> 3], "little")
+        return bits >> (start & 7) & ((1 << (stop - start)) - 1)
+
+    def first_unchecked(self) -> int:
+        """Index of the first unchecked checkbox, or len(self) if none"""
+        return self.next_unchecked
+
+    def _scan_unchecked(self, start: int) -> int:
+        total = len(self)
+        i = start
+        # Finish the partial byte, skip whole bytes of checked boxes in C,
+        # then look at single bits again
+        while i < total and i & 7:
+            if not self.is_checked(i):
+                return i
+            i += 1
+        if i >= total:
+            return total
+        tail = self.checked[i >> 3 :]
+        i += (len(tail) - len(tail.lstrip(b"\xff"))) * 8
+        while i < total:
+            if not self.is_checked(i):
+                return i
+            i += 1
+        return total
+
+    def set_full_lines_loader(self, loader):
+        """Defer reading line text until a record's content is requested"""
+        self._full_lines = None
+        self._load_full_lines = loader
+        self._full_lines_blob = None
+
+    def full_line(self, i: int) -> str:
+        """Line text of checkbox i, its mark taken from the bitset
+
+        The text is kept as it was parsed (and cached); later writes only
+        flip bits, so the mark is put back from the current state here.
+        """
+        if self._full_lines is None:
+            self._full_lines = self._load_full_lines()
+        line = self._full_lines[i]
+        pos = line.find("- [") + 3
+        checked = self.is_checked(i)
+        if pos > 2 and (line[pos] != " ") != checked:
+            line = line[:pos] + ("x" if checked else " ") + line[pos + 1 :]
+        return line
+
+    def to_cache(self) -> dict:
+        """Serialise the columns for the parse cache"""
+        return {
+            "line_index": self.line_index.tobytes(),
+            "day": self.day.tobytes(),
+            "week": self.week.tobytes(),
+            "phase_id": self.phase_id.tobytes(),
+            "offset": self.offset.tobytes(),
+            "checked": bytes(self.checked),
+            "phases": list(self.phases),
+            "context_starts": list(self._context_starts),
+            "day_runs": self.day_runs,
+            "week_runs": self.week_runs,
+            "phase_runs": self.phase_runs,
+            "blocks": list(self.blocks),
+            # Nested so the text is only decoded when content is requested
+            "full_line": self._full_lines_blob
+            or marshal.dumps([self.full_line(i) for i in range(len(self))]),
+        }
+
+    @classmethod
+    def from_cache(cls, cache: dict) -> "CheckboxStore":
+        """Rebuild a store from columns written by to_cache"""
+        store = cls()
+        store.line_index.frombytes(cache["line_index"])
+        store.day.frombytes(cache["day"])
+        store.week.frombytes(cache["week"])
+        store.phase_id.frombytes(cache["phase_id"])
+        store.offset.frombytes(cache["offset"])
+        store.checked = bytearray(cache["checked"])
+        store.next_unchecked = store._scan_unchecked(0)
+        for phase in cache["phases"]:
+            store.intern_phase(phase)
+        store._context_starts = cache["context_starts"]
+        store.blocks = cache["blocks"]
+        store.day_runs = cache["day_runs"]
+        store.week_runs = cache["week_runs"]
+        store.phase_runs = cache["phase_runs"]
+        full_line = cache["full_line"]
+        store.set_full_lines_loader(lambda: marshal.loads(full_line))
+        store._full_lines_blob = full_line
+        return store
+
+
+def split_plan_blocks(data: bytes, line_starts: list) -> list:
+    """Split the raw plan at its week headers and hash each block
+
+    Returns one (first line, first byte, sha256 digest) tuple per block; the
+    first block holds whatever precedes the first week header.
+    """
+    starts = [0]
+    for m in _BLOCK_PATTERN.finditer(data):
+        start = m.start()
+        # A lone \r also ends a line under universal newlines
+        if start and data[start - 1] in b"\n\r":
+            starts.append(start)
+    stops = starts[1:] + [len(data)]
+    view = memoryview(data)
+    return [
+        (
+            bisect_left(line_starts, start),
+            start,
+            hashlib.sha256(view[start:stop]).digest(),
+        )
+        for start, stop in zip(starts, stops)
+    ]
+
+
+def _parse_range(
+    store: CheckboxStore,
+    lines: list,
+    start: int,
+    stop: int,
+    line_starts: Optional[list],
+    context: tuple,
+    checked_positions: list,
+) -> tuple:
+    """Append the checkboxes of lines[start:stop] to the store
+
+    Parsing begins in the given (day, week, phase_id) context, and the
+    context in effect after the last line is returned.
+    """
+    add_line_index = store.line_index.append
+    add_day = store.day.append
+    add_week = store.week.append
+    add_phase_id = store.phase_id.append
+    add_offset = store.offset.append
+    add_checked = checked_positions.append
+
+    match_line = _LINE_PATTERN.match
+    current_day, current_week, current_phase_id = context
+    count = len(store)
+    # Set by every header so the next checkbox records where a new
+    # day/week/phase run may begin
+    new_context = True
+
+    for i, line in enumerate(lines[start:stop], start):
+        m = match_line(line)
+        if m is None:
+            continue
+        kind = m.lastgroup
+
+        if kind == "unchecked" or kind == "checked":
+            # Only checkboxes below a day header are tracked
+            if current_day > 0:
+                if new_context:
+                    store.start_context(
+                        count, current_day, current_week, current_phase_id
+                    )
+                    new_context = False
+                add_line_index(i)
+                add_day(current_day)
+                add_week(current_week)
+                add_phase_id(current_phase_id)
+                # Only ASCII precedes the mark, so the character position
+                # within the line is also its byte position
+                add_offset(line_starts[i] + m.end() - 2 if line_starts else -1)
+                if kind == "checked":
+                    add_checked(count)
+                count += 1
+        elif kind == "day":
+            current_day = int(m.group("day"))
+            new_context = True
+        elif kind == "week":
+            current_week = int(m.group("week"))
+            new_context = True
+        else:
+            current_phase_id = store.intern_phase(line.strip())
+            new_context = True
+
+    return current_day, current_week, current_phase_id
+
+
+def parse_plan_lines(
+    lines: list, line_starts: Optional[list] = None
+) -> CheckboxStore:
+    """Classify plan lines in a single pass and return the checkbox store
+
+    When ``line_starts`` holds the byte offset of each line in the file, every
+    checkbox also records the byte offset of its mark character so the mark
+    can later be flipped in place.
+    """
+    store = CheckboxStore()
+    checked_positions = []
+    context = (0, 0, store.intern_phase(""))
+    _parse_range(store, lines, 0, len(lines), line_starts, context, checked_positions)
+
+    store.set_checked_positions(checked_positions)
+    store.build_index()
+    store.set_full_lines_loader(lambda: [lines[i] for i in store.line_index])
+    return store
+
+
+def parse_plan_blocks(
+    lines: list,
+    line_starts: list,
+    blocks: list,
+    previous: Optional[CheckboxStore] = None,
+) -> CheckboxStore:
+    """Parse the plan block by block, reusing unchanged blocks of ``previous``
+
+    ``blocks`` comes from split_plan_blocks. A block is copied from the
+    previous store when both its digest and the day/week/phase context it
+    starts in are unchanged, so only edited blocks (and blocks whose
+    inherited context changed) are parsed again.
+    """
+    reusable = {}
+    if previous is not None:
+        for k, block in enumerate(previous.blocks):
+            reusable.setdefault((block[0], block[1]), k)
+
+    store = CheckboxStore()
+    store.intern_phase("")
+    checked_positions = []
+    checked_runs = []
+    # Reused blocks are copied in chunks of blocks that were already
+    # consecutive: [first, stop, line start, byte start] of previous.blocks
+    chunk = None
+    context = (0, 0, "")
+    count = 0  # checkboxes so far, including the pending chunk
+    contexts = 0
+    line_stops = [block[0] for block in blocks[1:]] + [len(lines)]
+
+    for (line_start, byte_start, digest), line_stop in zip(blocks, line_stops):
+        k = reusable.get((digest, context))
+        if k is not None:
+            if chunk is not None and chunk[1] == k:
+                chunk[1] = k + 1
+            else:
+                if chunk is not None:
+                    store.splice_blocks(previous, *chunk, checked_runs)
+                chunk = [k, k + 1, line_start, byte_start]
+            old = previous.blocks[k]
+            exit_context = old[2]
+            size = old[4] - old[3]
+            context_count = old[6] - old[5]
+        else:
+            if chunk is not None:
+                store.splice_blocks(previous, *chunk, checked_runs)
+                chunk = None
+            day, week, phase = context
+            day, week, phase_id = _parse_range(
+                store,
+                lines,
+                line_start,
+                line_stop,
+                line_starts,
+                (day, week, store.intern_phase(phase)),
+                checked_positions,
+            )
+            exit_context = (day, week, store.phases[phase_id])
+            size = len(store) - count
+            context_count = len(store._context_starts) - contexts
+
+        store.blocks.append(
+            (
+                digest,
+                context,
+                exit_context,
+                count,
+                count + size,
+                contexts,
+                contexts + context_count,
+                line_start,
+                byte_start,
+            )
+        )
+        count += size
+        contexts += context_count
+        context = exit_context
+
+    if chunk is not None:
+        store.splice_blocks(previous, *chunk, checked_runs)
+
+    store.set_checked_positions(checked_positions, checked_runs)
+    store.build_index()
+    store.set_full_lines_loader(lambda: [lines[i] for i in store.line_index])
+    return store
+
+
+def list_plan_files(directory: str) -> list:
+    """Markdown files of a plan directory in reading order
+
+    Names are compared with their digit runs as numbers, so week-2.md comes
+    before week-10.md.
+    """
+
+    def natural_key(name):
+        parts = re.split(r"(\d+)", name)
+        return [int(part) if part.isdigit() else part.lower() for part in parts]
+
+    names = [
+        name
+        for name in os.listdir(directory)
+        if name.endswith(".md") and not name.startswith(".")
+    ]
+    return [os.path.join(directory, name) for name in sorted(names, key=natural_key)]
+
+
+def _parse_plan_file(path: str) -> tuple:
+    """Parse one file of a plan directory on its own
+
+    Runs in a worker process. The file is parsed in the _INHERITED context
+    and the store is returned with the context it ends in, so the caller
+    can chain the files together with merge_plan_parts.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").readlines()
+    line_starts = [0]
+    line_starts.extend(accumulate(map(len, data.splitlines(keepends=True))))
+
+    store = CheckboxStore()
+    checked_positions = []
+    context = (_INHERITED, _INHERITED, store.intern_phase(None))
+    day, week, phase_id = _parse_range(
+        store, lines, 0, len(lines), line_starts, context, checked_positions
+    )
+    store.set_checked_positions(checked_positions)
+    return store, (day, week, store.phases[phase_id])
+
+
+def parse_plan_files(paths: list, total_size: int) -> list:
+    """Parse the files of a plan directory, in a process pool if worthwhile"""
+    workers = min(len(paths), os.cpu_count() or 1)
+    if workers > 1 and total_size >= _PARALLEL_PARSE_MIN_BYTES:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_parse_plan_file, paths))
+        except (OSError, BrokenProcessPool):
+            pass  # No usable worker processes here: parse serially
+    return [_parse_plan_file(path) for path in paths]
+
+
+def merge_plan_parts(parts: list, sources: list) -> CheckboxStore:
+    """Chain separately parsed plan files into one ordered store
+
+    ``parts`` comes from parse_plan_files and ``sources`` holds the
+    (path, first line, first byte) of each file within the concatenated
+    plan. Each file inherits the day/week/phase context the files before it
+    end in, and its line and byte positions are moved to where it starts.
+    """
+    store = CheckboxStore()
+    store.intern_phase("")
+    checked_runs = []
+    context = (0, 0, "")
+
+    for (part, exit_context), (_, line_start, byte_start) in zip(parts, sources):
+        start = part.resolve_inherited(*context)
+        ctx_start = bisect_left([ctx[0] for ctx in part._context_starts], start)
+        store.extend_from(
+            part,
+            start,
+            len(part),
+            ctx_start,
+            len(part._context_starts),
+            line_start,
+            byte_start,
+            checked_runs,
+        )
+        context = tuple(
+            inherited if value in (_INHERITED, None) else value
+            for value, inherited in zip(exit_context, context)
+        )
+
+    store.set_checked_positions([], checked_runs)
+    store.build_index()
+    return store
+
+
+def day_ranges(days) -> list:
+    """Compress day numbers into sorted [first, last] runs
+
+    [3, 1, 2, 7] becomes [[1, 3], [7, 7]]; lists rather than tuples so the
+    runs read back from JSON unchanged.
+    """
+    ranges = []
+    for day in sorted(set(days)):
+        if ranges and ranges[-1][1] == day - 1:
+            ranges[-1][1] = day
+        else:
+            ranges.append([day, day])
+    return ranges
+
+
+def expand_day_ranges(ranges: list) -> list:
+    """The day numbers covered by [first, last] runs"""
+    return [day for first, last in ranges for day in range(first, last + 1)]
+
+
+def phase_title(header: Optional[str]) -> str:
+    """Phase name shown for a phase header, "Unknown" before the first"""
+    return header.replace("## 📅 ", "").strip() if header else "Unknown"
+
+
+def plan_layout_digest(datas: list) -> str:
+    """Digest of the plan files with every checkbox mark blanked
+
+    It changes when the plan is edited but not when boxes are checked, so
+    it tells whether counts kept for one checked state still fit the plan.
+    """
+    digest = hashlib.sha256()
+    for data in datas:
+        digest.update(data.replace(b"[x]", b"[ ]").replace(b"[X]", b"[ ]"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def project_kind(line: str) -> Optional[str]:
+    """"mini" or "major" for a project checkbox line, None for other tasks"""
+    if "Mini Project:" in line:
+        return "mini"
+    if "Project:" in line and "Mini" not in line:
+        return "major"
+    return None
+
+
+def next_milestone(completed: int) -> Optional[list]:
+    """[count, description] of the first milestone past completed, if any"""
+    for count, description in sorted(_MILESTONES.items()):
+        if count > completed:
+            return [count, description]
+    return None
+
+
+def stamp_entry(entry: dict, when: datetime) -> dict:
+    """Set a history entry's time: ISO timestamp, epoch seconds, day ordinal
+
+    The integer fields let streak and frequency calculations skip parsing
+    the timestamp; the ordinal is that of the local calendar date.
+    """
+    entry["timestamp"] = when.isoformat()
+    entry["epoch"] = int(when.timestamp())
+    entry["ordinal"] = when.toordinal()
+    return entry
+
+
+def entry_ordinal(entry: dict) -> int:
+    """Local day ordinal of a history entry, parsed only for old entries"""
+    ordinal = entry.get("ordinal")
+    if ordinal is None:
+        ordinal = datetime.fromisoformat(entry["timestamp"]).toordinal()
+    return ordinal
+
+
+def migrate_history(history: list) -> list:
+    """Add epoch seconds and day ordinals to entries written without them
+
+    Returns a new list if any entry needed them, so that the storage
+    rewrites the stored history once rather than appending to it.
+    """
+    if all("ordinal" in entry for entry in history):
+        return history
+    migrated = []
+    for entry in history:
+        if "ordinal" not in entry:
+            when = datetime.fromisoformat(entry["timestamp"])
+            entry = {**entry, "epoch": int(when.timestamp()), "ordinal": when.toordinal()}
+        migrated.append(entry)
+    return migrated
+
+
+def _fsync_directory(path: str):
+    """Make renames and removals inside path's directory durable"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened on this platform
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class WriteJournal:
+    """Write-ahead journal that commits changes to several files atomically
+
+    Changes are staged first: byte patches to write in place, and whole-file
+    replacements written to a temporary file beside their target. commit()
+    fsyncs the staged files, then writes a record of every change and
+    renames it into place; that rename is the commit point. Only then are
+    the patches written and the temporary files renamed over their targets.
+    A crash before the commit point leaves every target untouched, and
+    recover() redoes a commit that was cut short after it.
+
+    Batches nest and only the outermost one commits, so any number of
+    updates share one journal record and one fsync per file.
+
+    A batch can also hand its commit point to a database transaction (see
+    decide_with()). The record is then written first as a prepared commit
+    and the database commits the record's id along with its own changes;
+    recover() only redoes a record whose id the database holds.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.depth = 0
+        self.patches = {}  # target path -> {offset: bytes}
+        self.replacements = {}  # target path -> staged temporary file
+        self.callbacks = {}  # key -> function to run once committed
+        self.rollbacks = {}  # key -> function to run if discarded instead
+        # (identity, commit, rollback) of the transaction deciding this
+        # batch, see decide_with()
+        self.decider = None
+
+    @contextmanager
+    def batch(self):
+        """Group the changes staged inside into one commit"""
+        self.depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.depth -= 1
+            if self.depth == 0:
+                self.discard()
+            raise
+        self.depth -= 1
+        if self.depth == 0:
+            self.commit()
+
+    def patch(self, path: str, offset: int, data: bytes):
+        """Stage bytes to write over ``path`` at ``offset``"""
+        self.patches.setdefault(path, {})[offset] = data
+
+    def stage(self, path: str) -> str:
+        """Stage a replacement of ``path``, returning the file to write it to
+
+        The replacement supersedes patches staged for the same file, so its
+        content must already include them (see read()).
+        """
+        self.patches.pop(path, None)
+        tmp_file = self.replacements[path] = f"{path}.tmp"
+        return tmp_file
+
+    def staged(self, path: str) -> bool:
+        """Whether a replacement of ``path`` is waiting to be committed"""
+        return path in self.replacements
+
+    def after_commit(self, key, callback, rollback=None):
+        """Run ``callback`` once the current batch has committed
+
+        Registering under an existing key replaces that callback and moves
+        it to the end, so repeated bookkeeping runs once, after the rest.
+        ``rollback`` runs instead if the batch is discarded.
+        """
+        self.callbacks.pop(key, None)
+        self.callbacks[key] = callback
+        if rollback is not None:
+            self.rollbacks[key] = rollback
+
+    def decide_with(self, identity, commit, rollback):
+        """Make a database transaction the commit point of this batch
+
+        ``commit(txid)`` must durably store txid in the same transaction as
+        its other changes; ``rollback()`` runs if the batch is discarded.
+        ``identity`` is kept in the record and passed with the id to the
+        ``committed`` check of recover().
+        """
+        self.decider = (identity, commit, rollback)
+
+    def read(self, path: str) -> bytes:
+        """Content of ``path`` as it will be once the staged changes commit"""
+        with open(self.replacements.get(path, path), "rb") as f:
+            data = bytearray(f.read())
+        for offset, patch in self.patches.get(path, {}).items():
+            data[offset : offset + len(patch)] = patch
+        return bytes(data)
+
+    def commit(self):
+        """Durably apply everything staged since the last commit"""
+        record = {
+            "version": _JOURNAL_VERSION,
+            "patches": [
+                (os.path.abspath(path), offset, data)
+                for path, patches in self.patches.items()
+                for offset, data in patches.items()
+            ],
+            "replace": [
+                (os.path.abspath(tmp_file), os.path.abspath(path))
+                for path, tmp_file in self.replacements.items()
+            ],
+        }
+        changed = record["patches"] or record["replace"]
+        decider = self.decider
+        if decider is not None:
+            record["decider"] = decider[0]
+            record["txid"] = os.urandom(8).hex()
+        if changed:
+            try:
+                for tmp_file, _ in record["replace"]:
+                    fd = os.open(tmp_file, os.O_RDWR)
+                    try:
+                        os.fsync(fd)
+                    finally:
+                        os.close(fd)
+
+                tmp_record = f"{self.path}.tmp"
+                with open(tmp_record, "wb") as f:
+                    f.write(marshal.dumps(record))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_record, self.path)
+                if decider is not None:
+                    # The record must survive a crash after the database
+                    # commits, which is the commit point
+                    _fsync_directory(self.path)
+            except BaseException:
+                # Failed before the commit point: as if never staged
+                self.discard()
+                raise
+
+        if decider is not None:
+            try:
+                decider[1](record["txid"])
+            except BaseException:
+                if changed:
+                    os.remove(self.path)
+                self.discard()
+                raise
+
+        callbacks = self.callbacks
+        self.patches, self.replacements, self.callbacks = {}, {}, {}
+        self.rollbacks, self.decider = {}, None
+
+        if changed:
+            if decider is None:
+                _fsync_directory(self.path)
+            self.apply(record)
+            os.remove(self.path)
+
+        for callback in callbacks.values():
+            callback()
+
+    def discard(self):
+        """Drop everything staged since the last commit"""
+        for tmp_file in self.replacements.values():
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        rollbacks = list(self.rollbacks.values())
+        if self.decider is not None:
+            rollbacks.append(self.decider[2])
+        self.patches, self.replacements, self.callbacks = {}, {}, {}
+        self.rollbacks, self.decider = {}, None
+        for rollback in rollbacks:
+            rollback()
+
+    @staticmethod
+    def apply(record: dict, missing_ok: bool = False):
+        """Write a committed record's changes; doing so twice is harmless"""
+        targets = defaultdict(list)
+        for path, offset, data in record["patches"]:
+            targets[path].append((offset, data))
+        for path, patches in targets.items():
+            try:
+                fd = os.open(path, os.O_RDWR)
+            except FileNotFoundError:
+                if missing_ok:
+                    continue
+                raise
+            try:
+                for offset, data in patches:
+                    os.pwrite(fd, data, offset)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        for tmp_file, path in record["replace"]:
+            # Gone when the rename happened before the crash
+            if os.path.exists(tmp_file):
+                os.replace(tmp_file, path)
+        for path in {path for _, path in record["replace"]}:
+            _fsync_directory(path)
+
+    def recover(self, committed=None) -> bool:
+        """Finish a commit interrupted by a crash; True if there was one
+
+        A record decided by a database is only redone if
+        ``committed(identity, txid)`` finds its id there; otherwise the crash
+        came before the commit point and its staged files are dropped.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                record = marshal.loads(f.read())
+        except FileNotFoundError:
+            return False
+        except (EOFError, ValueError, TypeError):
+            record = None
+
+        # The record only appears by rename once complete, so anything
+        # unreadable was never committed
+        recovered = (
+            isinstance(record, dict) and record.get("version") == _JOURNAL_VERSION
+        )
+        if recovered and "decider" in record:
+            recovered = committed is not None and committed(
+                record["decider"], record["txid"]
+            )
+            if not recovered:
+                for tmp_file, _ in record["replace"]:
+                    if os.path.exists(tmp_file):
+                        os.remove(tmp_file)
+        if recovered:
+            self.apply(record, missing_ok=True)
+        os.remove(self.path)
+        _fsync_directory(self.path)
+        return recovered
+
+
+class LazyProgress(dict):
+    """Progress whose history is read only when first looked up
+
+    The snapshot fields are loaded up front; ``progress["history"]`` calls
+    the storage's loader once and keeps the list. Read-only commands that
+    never touch the history skip reading it altogether. Until then the
+    history is left out when iterating the keys or items, and entries
+    added with append_event() wait in ``appended``.
+    """
+
+    def __init__(self, fields: dict, load_history):
+        super().__init__(fields)
+        self.load_history = load_history
+        # Entries appended before the history was loaded, how many of them
+        # the storage already holds and how many update_streak has counted
+        self.appended = []
+        self.appended_saved = 0
+        self.appended_streaked = 0
+
+    def __missing__(self, key):
+        if key != "history" or self.load_history is None:
+            raise KeyError(key)
+        history = self["history"] = self.load_history()
+        history.extend(self.appended[self.appended_saved :])
+        self.load_history = None
+        return history
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or (
+            key == "history" and self.load_history is not None
+        )
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __eq__(self, other):
+        for progress in (self, other):
+            if isinstance(progress, LazyProgress) and "history" in progress:
+                progress["history"]
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+
+def history_loaded(progress: dict) -> bool:
+    """Whether the history of progress is in memory"""
+    return dict.__contains__(progress, "history")
+
+
+def append_event(progress: dict, entry: dict):
+    """Add an entry to the history without reading the stored history
+
+    While the history is not loaded the entry waits in the LazyProgress
+    until the next save appends it to the stored log.
+    """
+    if history_loaded(progress):
+        progress["history"].append(entry)
+    else:
+        progress.appended.append(entry)
+
+
+class JsonProgressStorage:
+    """Progress kept as a JSON snapshot plus an append-only events log
+
+    The snapshot holds everything but the history, which is stored one
+    JSON line per entry so that each action appends instead of rewriting.
+    Both files are written through the tracker's journal.
+    """
+
+    def __init__(self, progress_file: str, events_file: str, journal: WriteJournal):
+        self.progress_file = progress_file
+        self.events_file = events_file
+        self.journal = journal
+        # (history list, entries, bytes) last written to the events log
+        self.saved_history = (None, 0, 0)
+
+    def load(self) -> Optional[dict]:
+        """The stored progress, or None if there is none or it is unreadable
+
+        The events log is only read when the history is first used. Files
+        from before the split still carry their history inline; it moves
+        to the log on the next save.
+        """
+        if not os.path.exists(self.progress_file):
+            return None
+        try:
+            with open(self.progress_file, "r") as f:
+                progress = json.load(f)
+        except:
+            return None
+        if "history" not in progress:
+            progress = LazyProgress(progress, self.load_events)
+        return progress
+
+    def load_events(self) -> list:
+        """Read the history entries from the events log"""
+        history = []
+        try:
+            with open(self.events_file, "rb") as f:
+                data = f.read()
+        except OSError:
+            return history
+
+        for line in data.splitlines():
+            try:
+                history.append(json.loads(line))
+            except ValueError:
+                continue  # Blank or hand-mangled line
+        self.saved_history = (history, len(history), len(data))
+        return history
+
+    def save(self, progress: dict):
+        """Rewrite the snapshot and append new history entries to the log
+
+        A history that was replaced or shortened in memory rewrites the log
+        instead. One that was never loaded is not read: only the entries
+        appended to it since are added to the end of the log.
+        """
+        snapshot = {key: value for key, value in progress.items() if key != "history"}
+        if not history_loaded(progress):
+            appended = progress.appended
+            new_entries = appended[progress.appended_saved :]
+            data = "".join(json.dumps(entry) + "\n" for entry in new_entries)
+            with self.journal.batch():
+                appending = os.path.exists(self.events_file) and not (
+                    self.journal.staged(self.events_file)
+                )
+                if new_entries and appending:
+                    # Like the appends below, a later patch in the same
+                    # batch starts at the same offset and supersedes this
+                    self.journal.patch(
+                        self.events_file,
+                        os.path.getsize(self.events_file),
+                        data.encode("utf-8"),
+                    )
+                elif new_entries:
+                    with open(self.journal.stage(self.events_file), "w") as f:
+                        f.write(data)
+                with open(self.journal.stage(self.progress_file), "w") as f:
+                    json.dump(snapshot, f, indent=2)
+
+                count = len(appended)
+
+                def record_appended():
+                    progress.appended_saved = count
+
+                self.journal.after_commit("appended_saved", record_appended)
+            return
+
+        history = progress["history"]
+        saved, count, size = self.saved_history
+
+        appending = (
+            history is saved
+            and len(history) >= count
+            and not self.journal.staged(self.events_file)
+            and os.path.exists(self.events_file)
+            and os.path.getsize(self.events_file) == size
+        )
+        new_entries = history[count:] if appending else history
+        data = "".join(json.dumps(entry) + "\n" for entry in new_entries).encode("utf-8")
+
+        with self.journal.batch():
+            if appending:
+                # Appends staged earlier in the batch start at the same
+                # offset, so this patch supersedes them
+                if data:
+                    self.journal.patch(self.events_file, size, data)
+                size += len(data)
+            else:
+                with open(self.journal.stage(self.events_file), "wb") as f:
+                    f.write(data)
+                size = len(data)
+
+            with open(self.journal.stage(self.progress_file), "w") as f:
+                json.dump(snapshot, f, indent=2)
+
+            saved_state = (history, len(history), size)
+
+            def record_saved():
+                self.saved_history = saved_state
+
+            self.journal.after_commit("saved_history", record_saved)
+
+    def last_event(self, progress: dict, action: str) -> Optional[dict]:
+        """The most recent history entry with the given action"""
+        for entry in reversed(progress["history"]):
+            if entry["action"] == action:
+                return entry
+        return None
+
+    def history_bytes(self) -> int:
+        """Size of the events log as last read or written"""
+        if self.saved_history[0] is None and os.path.exists(self.events_file):
+            return os.path.getsize(self.events_file)
+        return self.saved_history[2]
+
+    def stored_version(self) -> int:
+        """Version of the snapshot, counting one staged in the journal"""
+        try:
+            return json.loads(self.journal.read(self.progress_file)).get("version", 0)
+        except (OSError, ValueError):
+            return 0
+
+
+class SqliteProgressStorage:
+    """Progress kept in an SQLite database in WAL mode
+
+    Events, completed days and stats are rows of their own, so a save is
+    one small transaction inserting or updating just the rows that changed
+    rather than a rewrite of the whole document. The transaction is the
+    commit point of the tracker's journal batch: it stores the batch's id in
+    the journal table, so recovery redoes the plan writes of exactly the
+    batches the database committed. It rolls back if the batch is
+    discarded. Fields without a table of their own (start date, last
+    activity, ...) are JSON values in the meta table.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS completed_days (
+            seq INTEGER PRIMARY KEY,
+            day INTEGER NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY,
+            action TEXT NOT NULL,
+            day INTEGER,
+            timestamp TEXT NOT NULL,
+            extra TEXT
+        );
+        CREATE INDEX IF NOT EXISTS events_action ON events (action, id);
+        CREATE INDEX IF NOT EXISTS events_day ON events (day);
+        CREATE INDEX IF NOT EXISTS events_timestamp ON events (timestamp);
+        CREATE TABLE IF NOT EXISTS journal (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            txid TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_file: str, journal: WriteJournal, legacy=None):
+        self.db_file = db_file
+        self.journal = journal
+        # Storage to import from while the database is still empty
+        self.legacy = legacy
+        import sqlite3
+
+        self.connection = sqlite3.connect(db_file, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self._SCHEMA)
+        # What the database holds, to diff the next save against, and what
+        # it held before the open transaction
+        self.saved = None
+        self.before_transaction = None
+
+    def load(self) -> Optional[dict]:
+        """The stored progress, or None if the database is empty"""
+        db = self.connection
+        meta = {
+            key: json.loads(value)
+            for key, value in db.execute("SELECT key, value FROM meta")
+        }
+        if not meta:
+            progress = self.legacy.load() if self.legacy is not None else None
+            if progress is not None:
+                progress["history"]  # The import copies the events too
+                self.write(progress)
+                db.execute("COMMIT")
+            return progress
+
+        progress = LazyProgress(meta, self.load_events)
+        progress["completed_days"] = [
+            day for (day,) in db.execute("SELECT day FROM completed_days ORDER BY seq")
+        ]
+        progress["stats"] = dict(db.execute("SELECT name, value FROM stats"))
+        self.saved = self.snapshot_of(progress)
+        return progress
+
+    def load_events(self) -> list:
+        """Read the history from the events table
+
+        The list becomes the saved history, so later saves insert only the
+        entries appended to it.
+        """
+        history = [
+            self.event_entry(row)
+            for row in self.connection.execute(
+                "SELECT action, day, timestamp, extra FROM events ORDER BY id"
+            )
+        ]
+        if self.saved is not None and self.saved["history"] is None:
+            self.saved["history"] = history
+            self.saved["events"] = len(history)
+        return history
+
+    @staticmethod
+    def event_entry(row: tuple) -> dict:
+        """History entry of an events row"""
+        action, day, timestamp, extra = row
+        entry = {"action": action}
+        if day is not None:
+            entry["day"] = day
+        entry["timestamp"] = timestamp
+        if extra is not None:
+            entry.update(json.loads(extra))
+        return entry
+
+    @staticmethod
+    def event_row(entry: dict) -> tuple:
+        """Events row of a history entry"""
+        extra = {
+            key: value
+            for key, value in entry.items()
+            if key not in ("action", "day", "timestamp")
+        }
+        return (
+            entry["action"],
+            entry.get("day"),
+            entry["timestamp"],
+            json.dumps(extra) if extra else None,
+        )
+
+    @staticmethod
+    def snapshot_of(progress: dict) -> dict:
+        """Copy of what a save writes, for diffing against later"""
+        history = progress["history"] if history_loaded(progress) else None
+        return {
+            "history": history,
+            "events": len(history) if history is not None else None,
+            "completed_days": list(progress["completed_days"]),
+            "stats": dict(progress["stats"]),
+            "meta": {
+                key: json.dumps(value)
+                for key, value in progress.items()
+                if key not in ("history", "completed_days", "stats")
+            },
+        }
+
+    def save(self, progress: dict):
+        """Write the rows that changed since the last save"""
+        with self.journal.batch():
+            if not self.connection.in_transaction:
+                self.journal.decide_with(
+                    ("sqlite", os.path.abspath(self.db_file)),
+                    self.commit,
+                    self.rollback,
+                )
+                self.before_transaction = (
+                    self.saved,
+                    progress,
+                    getattr(progress, "appended_saved", 0),
+                )
+            self.write(progress)
+
+    def write(self, progress: dict):
+        """Issue the inserts, updates and deletes for a save
+
+        Opens the transaction if needed; committing it is up to the caller.
+        """
+        db = self.connection
+        if not db.in_transaction:
+            db.execute("BEGIN IMMEDIATE")
+        saved = self.saved or {
+            "history": None,
+            "events": 0,
+            "completed_days": [],
+            "stats": {},
+            "meta": {},
+        }
+        new = self.snapshot_of(progress)
+
+        # An unloaded history is still the one in the table, plus whatever
+        # was appended to it since
+        history = new["history"]
+        if history is None and isinstance(progress, LazyProgress):
+            db.executemany(
+                "INSERT INTO events (action, day, timestamp, extra) VALUES (?, ?, ?, ?)",
+                map(self.event_row, progress.appended[progress.appended_saved :]),
+            )
+            progress.appended_saved = len(progress.appended)
+        elif history is not None:
+            if history is saved["history"] and len(history) >= saved["events"]:
+                new_entries = history[saved["events"] :]
+            else:
+                db.execute("DELETE FROM events")
+                new_entries = history
+            db.executemany(
+                "INSERT INTO events (action, day, timestamp, extra) VALUES (?, ?, ?, ?)",
+                map(self.event_row, new_entries),
+            )
+
+        # Completed days keep their order: drop the removed ones and append
+        # the new ones, unless the list was reordered in some other way
+        days = new["completed_days"]
+        kept = set(days)
+        known = set(saved["completed_days"])
+        added = [day for day in days if day not in known]
+        if [day for day in saved["completed_days"] if day in kept] + added != days:
+            db.execute("DELETE FROM completed_days")
+            added = days
+        else:
+            db.executemany(
+                "DELETE FROM completed_days WHERE day = ?",
+                [(day,) for day in known - kept],
+            )
+        db.executemany(
+            "INSERT INTO completed_days (day) VALUES (?)", [(day,) for day in added]
+        )
+
+        for table, column, old, current in (
+            ("stats", "name", saved["stats"], new["stats"]),
+            ("meta", "key", saved["meta"], new["meta"]),
+        ):
+            db.executemany(
+                f"DELETE FROM {table} WHERE {column} = ?",
+                [(key,) for key in old.keys() - current.keys()],
+            )
+            db.executemany(
+                f"INSERT OR REPLACE INTO {table} VALUES (?, ?)",
+                [(key, value) for key, value in current.items() if old.get(key) != value],
+            )
+        self.saved = new
+
+    def commit(self, txid: str):
+        """Commit the open transaction as the journal batch ``txid``"""
+        if self.connection.in_transaction:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO journal VALUES (0, ?)", (txid,)
+            )
+            self.connection.execute("COMMIT")
+
+    @staticmethod
+    def journal_committed(identity, txid: str) -> bool:
+        """Whether the database named by identity committed journal batch txid"""
+        kind, db_file = identity
+        if kind != "sqlite" or not os.path.exists(db_file):
+            return False
+        import sqlite3
+
+        connection = sqlite3.connect(db_file)
+        try:
+            row = connection.execute("SELECT txid FROM journal").fetchone()
+        except sqlite3.Error:
+            return False
+        finally:
+            connection.close()
+        return row is not None and row[0] == txid
+
+    def rollback(self):
+        """Drop the open transaction along with a discarded journal batch"""
+        if self.connection.in_transaction:
+            self.connection.execute("ROLLBACK")
+        self.saved, progress, appended_saved = self.before_transaction
+        if isinstance(progress, LazyProgress):
+            progress.appended_saved = appended_saved
+
+    def last_event(self, progress: dict, action: str) -> Optional[dict]:
+        """The most recent history entry with the given action
+
+        Answered by the (action, id) index while the history in memory is
+        the one last saved, or not loaded at all; otherwise the unsaved
+        entries are scanned. So are entries appended to an unloaded history,
+        which are newer than any row.
+        """
+        saved = self.saved
+        if not history_loaded(progress):
+            for entry in reversed(progress.appended):
+                if entry["action"] == action:
+                    return entry
+        else:
+            history = progress["history"]
+            if saved is None or history is not saved["history"] or (
+                len(history) != saved["events"]
+            ):
+                for entry in reversed(history):
+                    if entry["action"] == action:
+                        return entry
+                return None
+
+        row = self.connection.execute(
+            "SELECT action, day, timestamp, extra FROM events"
+            " WHERE action = ? ORDER BY id DESC LIMIT 1",
+            (action,),
+        ).fetchone()
+        return self.event_entry(row) if row is not None else None
+
+    def history_bytes(self) -> int:
+        """Bytes of the database in use, leaving out freed pages"""
+        db = self.connection
+        (pages,) = db.execute("PRAGMA page_count").fetchone()
+        (free,) = db.execute("PRAGMA freelist_count").fetchone()
+        (page_size,) = db.execute("PRAGMA page_size").fetchone()
+        return (pages - free) * page_size
+
+    def stored_version(self) -> int:
+        """Version of the progress in the database, 0 if there is none"""
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else 0
+
+
+class ProgressConflict(Exception):
+    """The stored progress changed since this tracker loaded it"""
 
-console = Console()
+
+def _progress_change(method):
+    """Run a StudyTracker method through apply_change"""
+
+    @wraps(method)
+    def change(self, *args, **kwargs):
+        return self.apply_change(lambda: method(self, *args, **kwargs))
+
+    return change
+
+
+class StreakRuns:
+    """Study dates as sorted runs of consecutive day ordinals
+
+    ``starts`` and ``ends`` hold the first and last ordinal of each run.
+    Adding a date touches at most the two runs beside it, so the current
+    and longest streak are kept up to date without rescanning the dates.
+    """
+
+    def __init__(self, runs=()):
+        self.starts = [start for start, _ in runs]
+        self.ends = [end for _, end in runs]
+        self.longest = max(
+            (end - start + 1 for start, end in zip(self.starts, self.ends)), default=0
+        )
+
+    @classmethod
+    def from_ordinals(cls, ordinals) -> "StreakRuns":
+        """Runs of any collection of ordinals, in O(n log n)"""
+        runs = []
+        for ordinal in sorted(set(ordinals)):
+            if runs and runs[-1][1] == ordinal - 1:
+                runs[-1][1] = ordinal
+            else:
+                runs.append([ordinal, ordinal])
+        return cls(runs)
+
+    def add(self, ordinal: int):
+        """Record a study date, merging it with the runs beside it"""
+        starts, ends = self.starts, self.ends
+        i = bisect_right(starts, ordinal)
+        if i and ends[i - 1] >= ordinal:
+            return  # Already a study date
+
+        joins_left = i > 0 and ends[i - 1] == ordinal - 1
+        joins_right = i < len(starts) and starts[i] == ordinal + 1
+        if joins_left and joins_right:
+            ends[i - 1] = ends[i]
+            del starts[i], ends[i]
+            i -= 1
+        elif joins_left:
+            i -= 1
+            ends[i] = ordinal
+        elif joins_right:
+            starts[i] = ordinal
+        else:
+            starts.insert(i, ordinal)
+            ends.insert(i, ordinal)
+        self.longest = max(self.longest, ends[i] - starts[i] + 1)
+
+    def current(self, today: int) -> int:
+        """Length of the run ending today or yesterday, else 0"""
+        if not self.ends or self.ends[-1] not in (today, today - 1):
+            return 0
+        return self.ends[-1] - self.starts[-1] + 1
+
+    def to_list(self) -> list:
+        return [[start, end] for start, end in zip(self.starts, self.ends)]
+
+    def gap_counts(self) -> dict:
+        """How many times each gap in days separates consecutive study dates"""
+        counts = defaultdict(int)
+        for start, end in zip(self.starts, self.ends):
+            if end > start:
+                counts[1] += end - start
+        for end, start in zip(self.ends, self.starts[1:]):
+            counts[start - end] += 1
+        return dict(counts)
+
+
+def forecast_offsets(
+    gap_counts: dict, remaining: int, trials: int = _FORECAST_TRIALS, seed: int = 0
+) -> list:
+    """Days until ``remaining`` more study days, at _FORECAST_PERCENTILES
+
+    Each trajectory takes one session per remaining plan day, each after a
+    gap drawn from the learner's own gaps between study dates, so its
+    length is a sum of ``remaining`` draws. With NumPy all trajectories are
+    drawn as one multinomial batch of how often each distinct gap occurs,
+    which costs the same however many days remain; without it every gap is
+    drawn with random.choices. The percentiles are nearest-rank.
+    """
+    gaps = sorted(gap_counts)
+    weights = [gap_counts[gap] for gap in gaps]
+    np = load_numpy()
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        probabilities = np.asarray(weights, dtype=np.float64) / sum(weights)
+        counts = rng.multinomial(remaining, probabilities, size=trials)
+        totals = np.sort(counts @ np.asarray(gaps, dtype=np.int64)).tolist()
+    else:
+        import random
+
+        rng = random.Random(seed)
+        totals = sorted(
+            sum(rng.choices(gaps, weights, k=remaining)) for _ in range(trials)
+        )
+    return [totals[min(trials - 1, trials * q // 100)] for q in _FORECAST_PERCENTILES]
+
+
+class StatsEngine:
+    """Study history loaded once into per-day columns for windowed statistics
+
+    Each history entry, and each rolled-up day, contributes ``sessions``
+    (completions) and ``net_days`` (days completed minus days undone) to
+    its local day. The totals are grouped by day into sorted ``days``
+    with prefix sums of both counts, so any day window is two binary
+    searches and a subtraction, and whole-history scans (best windows,
+    the weekday histogram) run over distinct days rather than events.
+    With NumPy the grouping and scans are vectorized; without it the
+    same columns are plain lists.
+    """
+
+    WINDOWS = (7, 30, 90)
+
+    def __init__(self, ordinals, sessions, net_days):
+        np = load_numpy()
+        if np is not None:
+            days, rows = np.unique(np.asarray(ordinals, dtype=np.int64), return_inverse=True)
+            sessions = np.bincount(rows, weights=sessions, minlength=len(days))
+            net_days = np.bincount(rows, weights=net_days, minlength=len(days))
+            self.days = days
+            self.sessions = sessions.astype(np.int64)
+            self.session_sums = np.concatenate(([0], np.cumsum(self.sessions)))
+            self.net_sums = np.concatenate(([0], np.cumsum(net_days.astype(np.int64))))
+        else:
+            totals = defaultdict(lambda: [0, 0])
+            for ordinal, session, net in zip(ordinals, sessions, net_days):
+                total = totals[ordinal]
+                total[0] += session
+                total[1] += net
+            self.days = sorted(totals)
+            self.sessions = [totals[day][0] for day in self.days]
+            self.session_sums = list(accumulate(self.sessions, initial=0))
+            self.net_sums = list(accumulate((totals[day][1] for day in self.days), initial=0))
+
+    @classmethod
+    def from_progress(cls, progress: dict) -> "StatsEngine":
+        """Columns of the rollup followed by the history"""
+        ordinals, sessions, net_days = [], [], []
+        for date, day in progress.get("rollup", {}).items():
+            ordinals.append(datetime.fromisoformat(date).toordinal())
+            sessions.append(day["sessions"])
+            # Rollups written before days_undone was kept undid one day each
+            net_days.append(day["days_completed"] - day.get("days_undone", day["undos"]))
+
+        for entry in progress["history"]:
+            action = entry["action"]
+            if action not in ("complete", "undo"):
+                continue
+            if "days" in entry:
+                days = sum(last - first + 1 for first, last in entry["days"])
+            else:
+                days = 1
+            ordinals.append(entry_ordinal(entry))
+            if action == "complete":
+                sessions.append(1)
+                net_days.append(days)
+            else:
+                sessions.append(0)
+                net_days.append(-days)
+        return cls(ordinals, sessions, net_days)
+
+    def days_through(self, ordinal: int) -> int:
+        """Number of study days on or before ordinal"""
+        np = load_numpy()
+        if np is not None:
+            return int(np.searchsorted(self.days, ordinal, side="right"))
+        return bisect_right(self.days, ordinal)
+
+    def window(self, sums, today: int, days: int) -> int:
+        """Total of a prefix-summed column over the days ending today"""
+        return int(sums[self.days_through(today)] - sums[self.days_through(today - days)])
+
+    def window_sessions(self, today: int, days: int) -> int:
+        """Sessions in the last ``days`` days, today included"""
+        return self.window(self.session_sums, today, days)
+
+    def best_window(self, days: int) -> int:
+        """Most sessions in any ``days``-day window of the history"""
+        if not len(self.days):
+            return 0
+        study_days, sums = self.days, self.session_sums
+        np = load_numpy()
+        if np is not None:
+            starts = np.searchsorted(study_days, study_days - days, side="right")
+            return int((sums[1:] - sums[starts]).max())
+
+        best = start = 0
+        for end, day in enumerate(study_days, 1):
+            while study_days[start] <= day - days:
+                start += 1
+            best = max(best, sums[end] - sums[start])
+        return best
+
+    def weekday_histogram(self) -> list:
+        """Sessions per weekday, Monday first"""
+        np = load_numpy()
+        if np is not None:
+            # Ordinal 1 (0001-01-01) was a Monday
+            counts = np.bincount((self.days - 1) % 7, weights=self.sessions, minlength=7)
+            return [int(count) for count in counts]
+
+        counts = [0] * 7
+        for day, sessions in zip(self.days, self.sessions):
+            counts[(day - 1) % 7] += sessions
+        return counts
+
+    def velocity(self, today: int, weeks: Optional[int] = None) -> float:
+        """Net days completed per week over the last ``weeks`` weeks
+
+        Without ``weeks`` the whole history up to today is used.
+        """
+        if weeks is None:
+            if not len(self.days):
+                return 0.0
+            span = today - int(self.days[0]) + 1
+            return self.window(self.net_sums, today, span) / max(span / 7, 1)
+        return self.window(self.net_sums, today, weeks * 7) / weeks
 
 
 class StudyTracker:
@@ -31,22 +2003,89 @@ class StudyTracker:
         self,
         markdown_file="cpp-quant-study-plan.md",
         progress_file=".study_progress.json",
+        cache_file=None,
+        journal_file=None,
+        events_file=None,
+        storage=None,
     ):
         self.markdown_file = markdown_file
         self.progress_file = progress_file
+        # History lives in an append-only log beside the progress snapshot
+        self.events_file = events_file or os.path.join(
+            os.path.dirname(progress_file), ".study_events.jsonl"
+        )
+        self.markdown_stat = None
+        # (path, first line, first byte) of each plan file, in reading order
+        self.plan_sources = []
+        self.cache_file = cache_file or os.path.join(
+            os.path.dirname(progress_file), ".study_parse_cache.bin"
+        )
+        # Checked state written in place since the cache was saved, kept
+        # apart so a mark never rewrites the cached columns
+        self.marks_file = f"{self.cache_file}.marks"
+        # Ties the marks file to the cache it amends, None until one is used
+        self.parse_cache_token = None
+        self.forecast_file = os.path.join(
+            os.path.dirname(progress_file), ".study_forecast.json"
+        )
         self.markdown_content = []
-        self.checkboxes = []
+        self.checkboxes = CheckboxStore()
+        # plan_layout_digest of the parsed plan, None until it is parsed
+        self.plan_layout = None
+        # Finish any commit a crash cut short before reading either file
+        self.journal = WriteJournal(
+            journal_file
+            or os.path.join(os.path.dirname(progress_file), ".study_journal")
+        )
+        self.lock_file = os.path.join(os.path.dirname(progress_file), ".study_lock")
+        self.lock_depth = 0
+        with self.progress_lock():
+            self.journal.recover(SqliteProgressStorage.journal_committed)
+        self.storage = self.open_storage(storage)
         self.progress_data = self.load_progress()
+        # History list the streak index was last brought up to date with
+        self.streak_history = None
+        # Work deferred by an open transaction(), None outside of one
+        self.pending = None
+
+    def open_storage(self, kind: Optional[str]):
+        """Progress storage backend: "json" files or an "sqlite" database
+
+        The database sits beside the progress file under a .db extension
+        and imports the JSON progress the first time it is opened. From
+        then on it holds the progress: it is used when no kind is given,
+        and asking for JSON is refused rather than reading stale files.
+        """
+        db_file = os.path.splitext(self.progress_file)[0] + ".db"
+        if kind is None:
+            kind = "sqlite" if os.path.exists(db_file) else "json"
+        elif kind == "json" and os.path.exists(db_file):
+            console.print(
+                f"[red]Error: progress is kept in {db_file}; "
+                "use --storage sqlite or remove it[/red]"
+            )
+            sys.exit(1)
+
+        json_storage = JsonProgressStorage(
+            self.progress_file, self.events_file, self.journal
+        )
+        if kind == "sqlite":
+            return SqliteProgressStorage(db_file, self.journal, legacy=json_storage)
+        return json_storage
 
     def load_progress(self) -> dict:
-        """Load progress data from hidden JSON file"""
-        if os.path.exists(self.progress_file):
-            try:
-                with open(self.progress_file, "r") as f:
-                    return json.load(f)
-            except:
-                return self.create_initial_progress()
-        return self.create_initial_progress()
+        """Load progress data from the storage backend"""
+        progress = self.storage.load()
+        if progress is None:
+            return self.create_initial_progress()
+
+        # Entries from before epoch/ordinal stamps gain them once loaded
+        if isinstance(progress, LazyProgress) and progress.load_history is not None:
+            load_history = progress.load_history
+            progress.load_history = lambda: migrate_history(load_history())
+        else:
+            progress["history"] = migrate_history(progress["history"])
+        return progress
 
     def create_initial_progress(self) -> dict:
         """Create initial progress structure"""
@@ -55,6 +2094,8 @@ class StudyTracker:
             "last_activity": None,
             "completed_days": [],
             "history": [],
+            "rollup": {},
+            "version": 0,
             "stats": {
                 "total_study_sessions": 0,
                 "longest_streak": 0,
@@ -63,90 +2104,330 @@ class StudyTracker:
         }
 
     def save_progress(self):
-        """Save progress data to hidden JSON file"""
-        with open(self.progress_file, "w") as f:
-            json.dump(self.progress_data, f, indent=2)
+        """Save progress data to the storage backend
+
+        Once the stored history passes _AUTO_COMPACT_BYTES, entries past
+        the default retention are rolled up before saving.
+        """
+        if self.pending is not None:
+            self.pending["progress"] = True
+            return
+        if self.storage.history_bytes() > _AUTO_COMPACT_BYTES:
+            self.roll_up_history(_HISTORY_RETENTION_DAYS)
+        self.storage.save(self.progress_data)
+
+    @_progress_change
+    def compact_history(self, retention_days: int = _HISTORY_RETENTION_DAYS) -> int:
+        """Roll up history older than retention_days and save
+
+        Returns the number of entries folded.
+        """
+        folded = self.roll_up_history(retention_days)
+        if folded:
+            self.save_progress()
+        return folded
+
+    def roll_up_history(self, retention_days: int) -> int:
+        """Fold history entries older than retention_days into the rollup
+
+        The rollup maps each ISO date to its sessions, days completed, undo
+        count and days undone, which is all update_streak and the stats need
+        from old entries. The last completion always stays in the history so
+        it can be undone. Returns the number of entries folded.
+        """
+        history = self.progress_data["history"]
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+
+        last_complete = len(history)
+        for i in range(len(history) - 1, -1, -1):
+            if history[i]["action"] == "complete":
+                last_complete = i
+                break
+
+        cut = 0
+        while cut < last_complete and history[cut]["timestamp"] < cutoff:
+            cut += 1
+        if not cut:
+            return 0
+
+        rollup = self.progress_data.setdefault("rollup", {})
+        for entry in history[:cut]:
+            date = datetime.fromordinal(entry_ordinal(entry)).date().isoformat()
+            day = rollup.setdefault(
+                date, {"sessions": 0, "days_completed": 0, "undos": 0, "days_undone": 0}
+            )
+            days = len(expand_day_ranges(entry["days"])) if "days" in entry else 1
+            if entry["action"] == "complete":
+                day["sessions"] += 1
+                day["days_completed"] += days
+            elif entry["action"] == "undo":
+                # A date rolled up by an older version undid one day per undo
+                day["days_undone"] = day.get("days_undone", day["undos"]) + days
+                day["undos"] += 1
+
+        self.progress_data["history"] = history[cut:]
+
+        # The folded entries were indexed already, or are now in the rollup
+        index = self.progress_data.get("streak_index")
+        if index is not None and index["events"] >= cut and (
+            self.streak_history is None or history is self.streak_history
+        ):
+            index["events"] -= cut
+            self.streak_history = self.progress_data["history"]
+        else:
+            self.progress_data.pop("streak_index", None)
+        return cut
 
     def parse_markdown(self):
-        """Parse markdown file to find all checkboxes and their content"""
+        """Parse markdown file to find all checkboxes and their content
+
+        ``markdown_file`` may also be a directory of plan files, which are
+        read in list_plan_files order as if they were one file.
+        """
         if not os.path.exists(self.markdown_file):
             console.print(f"[red]Error: {self.markdown_file} not found![/red]")
             sys.exit(1)
 
-        with open(self.markdown_file, "r", encoding="utf-8") as f:
-            self.markdown_content = f.readlines()
-
-        self.checkboxes = []
-        current_week = 0
-        current_phase = ""
-        current_day = 0
-
-        for i, line in enumerate(self.markdown_content):
-            # Track current week
-            if "### Week" in line:
-                week_match = re.search(r"Week (\d+)", line)
-                if week_match:
-                    current_week = int(week_match.group(1))
-
-            # Track current phase
-            if "## 📅 PHASE" in line:
-                current_phase = line.strip()
-
-            # Track current day from headers like "#### Day 1 (1 hour - Weekday)"
-            if line.startswith("#### Day"):
-                day_match = re.search(r"Day (\d+)", line)
-                if day_match:
-                    current_day = int(day_match.group(1))
-
-            # Find checkboxes and associate them with the current day
-            if "- [ ]" in line or "- [x]" in line or "- [X]" in line:
-                # Only process if we have a valid current_day
-                if current_day > 0:
-                    is_checked = "- [x]" in line.lower()
-                    content = line.strip()
-
-                    self.checkboxes.append(
-                        {
-                            "line_index": i,
-                            "day": current_day,
-                            "week": current_week,
-                            "phase": current_phase,
-                            "checked": is_checked,
-                            "content": content,
-                            "full_line": line,
-                        }
+        paths = self.plan_files()
+        stats = [os.stat(path) for path in paths]
+        cache = self.load_parse_cache()
+
+        # In-place writes only proceed while each file still has its stat
+        self.markdown_stat = {
+            path: (stat.st_mtime_ns, stat.st_size) for path, stat in zip(paths, stats)
+        }
+        fingerprint = [
+            (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+            for path, stat in zip(paths, stats)
+        ]
+
+        # Unchanged stats: serve the index without reading the markdown
+        if cache is not None and cache["stat_trusted"] and (
+            [entry[:3] for entry in cache["files"]] == fingerprint
+        ):
+            self.markdown_content = []
+            self.plan_sources = cache["sources"]
+            self.plan_layout = cache["layout"]
+            self.checkboxes = CheckboxStore.from_cache(cache)
+            if "block_checked" in cache:
+                # Boxes marked in place no longer match their block's digest
+                self.checkboxes.forget_blocks(
+                    [
+                        i
+                        for i, (now, then) in enumerate(
+                            zip(cache["checked"], cache["block_checked"])
+                        )
+                        if now != then
+                    ]
+                )
+            return
+
+        datas = []
+        for path in paths:
+            with open(path, "rb") as f:
+                datas.append(f.read())
+        files = [
+            entry + (hashlib.sha256(data).hexdigest(),)
+            for entry, data in zip(fingerprint, datas)
+        ]
+
+        # Same universal-newline decoding as reading the files in text mode;
+        # bytes.splitlines breaks on the same \n, \r and \r\n boundaries
+        self.markdown_content = []
+        self.plan_sources = []
+        line_starts = [0]
+        for path, data in zip(paths, datas):
+            self.plan_sources.append((path, len(self.markdown_content), line_starts[-1]))
+            self.markdown_content.extend(
+                io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").readlines()
+            )
+            # The file's end doubles as the start of the next one
+            line_starts[-1:] = accumulate(
+                map(len, data.splitlines(keepends=True)), initial=line_starts[-1]
+            )
+
+        digests = [entry[3] for entry in files]
+        if cache is not None and [entry[3] for entry in cache["files"]] == digests:
+            # Touched but not edited: keep the index, refresh the stats
+            self.plan_layout = cache["layout"]
+            self.checkboxes = CheckboxStore.from_cache(cache)
+        elif len(paths) == 1:
+            # Re-parse only the week blocks that changed since the last run
+            previous = None
+            if cache is not None:
+                # Blocks are reused against the text they were hashed from,
+                # which had the cache's own marks
+                previous = CheckboxStore.from_cache(
+                    dict(cache, checked=cache.get("block_checked", cache["checked"]))
+                )
+            self.checkboxes = parse_plan_blocks(
+                self.markdown_content,
+                line_starts,
+                split_plan_blocks(datas[0], line_starts),
+                previous,
+            )
+        else:
+            parts = parse_plan_files(paths, sum(map(len, datas)))
+            store = merge_plan_parts(parts, self.plan_sources)
+            lines = self.markdown_content
+            store.set_full_lines_loader(lambda: [lines[i] for i in store.line_index])
+            self.checkboxes = store
+        self.plan_layout = plan_layout_digest(datas)
+        self.save_parse_cache(files)
+
+    def plan_files(self) -> list:
+        """The markdown files making up the plan, in reading order"""
+        if os.path.isdir(self.markdown_file):
+            return list_plan_files(self.markdown_file)
+        return [self.markdown_file]
+
+    def load_markdown_content(self):
+        """Read the markdown lines when the parse was served from cache"""
+        if not self.markdown_content:
+            # Read through the journal so marks staged but not yet committed
+            # are part of the lines
+            for path, _, _ in self.plan_sources:
+                data = self.journal.read(path)
+                self.markdown_content.extend(
+                    io.TextIOWrapper(io.BytesIO(data), encoding="utf-8").readlines()
+                )
+
+    def load_parse_cache(self) -> Optional[dict]:
+        """Load the cached checkbox index, or None if it is missing or unusable"""
+        try:
+            with open(self.cache_file, "rb") as f:
+                cache = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if (
+            not isinstance(cache, dict)
+            or cache.get("version") != self.parse_cache_version()
+            or cache.get("markdown_file") != os.path.abspath(self.markdown_file)
+        ):
+            return None
+
+        marks = self.load_parse_marks()
+        if marks is not None and marks.get("token") == cache["token"]:
+            cache["block_checked"] = cache["checked"]
+            cache["files"] = marks["files"]
+            cache["checked"] = marks["checked"]
+            cache["stat_trusted"] = marks["stat_trusted"]
+        self.parse_cache_token = cache["token"]
+        return cache
+
+    def load_parse_marks(self) -> Optional[dict]:
+        """Load the marks written in place since the cache was saved, if any"""
+        try:
+            with open(self.marks_file, "rb") as f:
+                marks = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return marks if isinstance(marks, dict) else None
+
+    def save_parse_marks(self):
+        """Record the checked state and stats left by an in-place write
+
+        Only the marks changed, so the cached columns still hold. The plan's
+        digests are left unknown: the next run that cannot trust the stats
+        re-parses the week blocks instead of comparing them.
+        """
+        if self.parse_cache_token is None or not self.markdown_stat:
+            return
+        files = []
+        for path, _, _ in self.plan_sources:
+            if path not in self.markdown_stat:
+                return
+            mtime_ns, size = self.markdown_stat[path]
+            files.append((os.path.abspath(path), mtime_ns, size, None))
+
+        now = time.time_ns()
+        marks = {
+            "token": self.parse_cache_token,
+            "files": files,
+            "stat_trusted": all(now - entry[1] > _RACY_WINDOW_NS for entry in files),
+            "checked": bytes(self.checkboxes.checked),
+        }
+        tmp_file = f"{self.marks_file}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(marshal.dumps(marks))
+            os.replace(tmp_file, self.marks_file)
+        except OSError:
+            pass
+
+    def save_parse_cache(self, files: Optional[list] = None):
+        """Store the checkbox index keyed on the plan files' fingerprints
+
+        ``files`` holds an (absolute path, mtime_ns, size, sha256) tuple per
+        plan file; it is recomputed from disk when not given.
+        """
+        if files is None:
+            files = []
+            try:
+                for path, _, _ in self.plan_sources:
+                    stat = os.stat(path)
+                    with open(path, "rb") as f:
+                        digest = hashlib.sha256(f.read()).hexdigest()
+                    files.append(
+                        (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, digest)
                     )
+            except OSError:
+                return
+
+        now = time.time_ns()
+        token = os.urandom(8).hex()
+        cache = {
+            "version": self.parse_cache_version(),
+            "markdown_file": os.path.abspath(self.markdown_file),
+            "token": token,
+            "files": files,
+            "sources": self.plan_sources,
+            "layout": self.plan_layout,
+            "stat_trusted": all(now - entry[1] > _RACY_WINDOW_NS for entry in files),
+        }
+        # Raw array bytes, which marshal round-trips far faster than json
+        cache.update(self.checkboxes.to_cache())
+
+        # The cache is disposable: a failed write only costs a re-parse
+        tmp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(tmp_file, "wb") as f:
+                f.write(marshal.dumps(cache))
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            return
+        # A marks file left for the previous cache no longer applies
+        self.parse_cache_token = token
+
+    @staticmethod
+    def parse_cache_version() -> tuple:
+        """Cache key component covering the on-disk column encoding"""
+        return (_PARSE_CACHE_VERSION, marshal.version, sys.byteorder)
 
     def get_current_day(self) -> int:
         """Get the next uncompleted day number"""
-        for cb in self.checkboxes:
-            if not cb["checked"]:
-                return cb["day"]
+        i = self.checkboxes.first_unchecked()
+        if i < len(self.checkboxes):
+            return self.checkboxes.day[i]
         return len(self.checkboxes) + 1  # All completed
 
+    @_progress_change
     def mark_day_complete(self, day: Optional[int] = None) -> bool:
         """Mark a day as complete"""
         if day is None:
             day = self.get_current_day()
 
+        store = self.checkboxes
+
         # Find all unchecked boxes for this day
-        day_checkboxes = [
-            cb for cb in self.checkboxes if cb["day"] == day and not cb["checked"]
-        ]
-        
+        day_checkboxes = [i for i in store.day_indices(day) if not store.is_checked(i)]
+
         if not day_checkboxes:
             return False
 
-        # Update all checkboxes for this day
-        for cb in day_checkboxes:
-            # Update markdown content
-            line_index = cb["line_index"]
-            self.markdown_content[line_index] = self.markdown_content[
-                line_index
-            ].replace("- [ ]", "- [x]")
-
-            # Update checkbox state in memory
-            cb["checked"] = True
+        # Update checkbox state and the summary in memory
+        self.flip_checkboxes(day_checkboxes, True)
 
         # Update progress data (add day to completed_days if not already there)
         if day not in self.progress_data["completed_days"]:
@@ -156,315 +2437,842 @@ class StudyTracker:
         self.progress_data["stats"]["total_study_sessions"] += 1
 
         # Add single completion entry to history
-        self.progress_data["history"].append(
-            {
-                "action": "complete",
-                "day": day,
-                "timestamp": datetime.now().isoformat(),
-            }
+        append_event(
+            self.progress_data,
+            stamp_entry({"action": "complete", "day": day}, datetime.now()),
         )
 
         # Update streak
         self.update_streak()
 
-        # Save files once
-        self.save_markdown()
-        self.save_progress()
+        # Save both files in one journaled commit
+        with self.journal.batch():
+            self.save_checkbox_marks(day_checkboxes)
+            self.save_progress()
 
         return True
 
-    def save_markdown(self):
-        """Save updated markdown content back to file"""
-        with open(self.markdown_file, "w", encoding="utf-8") as f:
-            f.writelines(self.markdown_content)
+    @contextmanager
+    def transaction(self):
+        """Defer saving and streak updates until the block exits
+
+        Inside the block, marking and undoing days only change memory:
+        save_checkbox_marks, save_markdown, save_progress and update_streak
+        just note that they are due. On exit each runs once, all in one
+        journal commit. A nested transaction joins the outer one, and if
+        the block raises nothing is written.
+        """
+        if self.pending is not None:
+            yield self
+            return
 
-    def update_streak(self):
-        """Update study streak statistics"""
-        if not self.progress_data["history"]:
+        pending = self.pending = {
+            "marks": [],
+            "markdown": False,
+            "progress": False,
+            "streak": False,
+        }
+        try:
+            # Held open throughout, so the batches of the methods called
+            # inside join it instead of committing on their own
+            with ExitStack() as lock, self.journal.batch():
+                yield self
+
+                self.pending = None
+                if pending["marks"] or pending["markdown"] or pending["progress"]:
+                    # Locked from the version check until the commit only
+                    lock.enter_context(self.progress_lock())
+                    self.claim_version()
+                    pending["progress"] = True
+                if pending["marks"]:
+                    self.save_checkbox_marks(list(dict.fromkeys(pending["marks"])))
+                if pending["markdown"]:
+                    self.save_markdown()
+                if pending["streak"]:
+                    self.update_streak()
+                if pending["progress"]:
+                    self.save_progress()
+        finally:
+            self.pending = None
+
+    @contextmanager
+    def progress_lock(self):
+        """Hold the advisory lock that serializes writers of these files
+
+        Reentrant within one tracker; a no-op where fcntl is unavailable.
+        """
+        if fcntl is None or self.lock_depth:
+            self.lock_depth += 1
+            try:
+                yield
+            finally:
+                self.lock_depth -= 1
             return
 
-        # Sort history by date
-        dates = []
-        for entry in self.progress_data["history"]:
-            if entry["action"] == "complete":
-                date = datetime.fromisoformat(entry["timestamp"]).date()
-                if date not in dates:
-                    dates.append(date)
+        with open(self.lock_file, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            self.lock_depth += 1
+            try:
+                yield
+            finally:
+                self.lock_depth -= 1
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def claim_version(self):
+        """Bump the progress version for a write, under the lock
+
+        Raises ProgressConflict if another writer saved since this tracker
+        loaded its progress, rather than overwriting that writer's changes.
+        """
+        stored = self.storage.stored_version()
+        if stored != self.progress_data.get("version", 0):
+            raise ProgressConflict(
+                f"progress is at version {stored}, "
+                f"loaded version {self.progress_data.get('version', 0)}"
+            )
+        self.progress_data["version"] = stored + 1
+
+    def apply_change(self, change):
+        """Run change() as one transaction, redoing it after a conflict
+
+        The change is made in memory without holding the lock, which is
+        only taken to check the version and commit. If another process
+        wrote in between, the progress and plan are re-read and the change
+        is made again with the lock held throughout, so it cannot conflict
+        twice. Inside an open transaction the outer one does the checking.
+        """
+        if self.pending is not None:
+            return change()
+        try:
+            with self.transaction():
+                return change()
+        except ProgressConflict:
+            pass
+
+        with self.progress_lock():
+            self.reload()
+            with self.transaction():
+                return change()
+
+    def reload(self):
+        """Re-read the progress and the plan from disk"""
+        self.progress_data = self.load_progress()
+        self.streak_history = None
+        self.parse_markdown()
 
-        dates.sort()
+    def save_markdown(self):
+        """Save updated markdown content back to file
 
-        if not dates:
+        For a plan directory, each file is rewritten from its own slice of
+        the lines.
+        """
+        if self.pending is not None:
+            self.pending["markdown"] = True
             return
 
-        # Calculate current streak
-        current_streak = 1
-        today = datetime.now().date()
-        yesterday = today - timedelta(days=1)
-
-        if dates[-1] == today or dates[-1] == yesterday:
-            for i in range(len(dates) - 2, -1, -1):
-                if dates[i + 1] - dates[i] == timedelta(days=1):
-                    current_streak += 1
-                else:
-                    break
+        sources = self.plan_sources or [(self.markdown_file, 0, 0)]
+        stops = [source[1] for source in sources[1:]] + [len(self.markdown_content)]
+        # Stats the recorded offsets belong to; nothing reaches disk before
+        # the batch commits, so these are still the parsed files' stats
+        old_stat = dict(self.markdown_stat or {})
+        with self.journal.batch():
+            for (path, start, _), stop in zip(sources, stops):
+                with open(self.journal.stage(path), "w", encoding="utf-8") as f:
+                    f.writelines(self.markdown_content[start:stop])
+
+            # A full rewrite may move bytes around, so no block can be reused
+            self.checkboxes.blocks = []
+            self.journal.after_commit(
+                "markdown_rewrite",
+                lambda: self.record_markdown_rewrite(sources, old_stat),
+            )
+
+    def record_markdown_rewrite(self, sources: list, old_stat: dict):
+        """Refresh stats, offsets and the parse cache after a full rewrite"""
+        self.markdown_stat = {}
+        for path, _, _ in sources:
+            stat = os.stat(path)
+            self.markdown_stat[path] = (stat.st_mtime_ns, stat.st_size)
+
+        if any(
+            old_stat.get(path, (0, None))[1] != size
+            for path, (_, size) in self.markdown_stat.items()
+        ):
+            # Sizes changed (CRLF files come back with LF endings): the
+            # recorded offsets are stale until the next parse
+            self.checkboxes.offset = array("q", [-1]) * len(self.checkboxes)
+            try:
+                os.remove(self.cache_file)
+            except OSError:
+                pass
+            self.parse_cache_token = None
         else:
-            current_streak = 0
+            self.save_parse_cache()
+
+    def save_checkbox_marks(self, checkboxes: list):
+        """Write the checked state of the given checkbox indices to the markdown"""
+        if self.pending is not None:
+            self.pending["marks"].extend(checkboxes)
+            return
+
+        self.checkboxes.forget_blocks(checkboxes)
+        with self.journal.batch():
+            if self.write_marks_in_place(checkboxes):
+                # Keep any loaded lines in step with the file
+                if self.markdown_content:
+                    self.apply_marks_to_lines(checkboxes)
+                self.journal.after_commit("parse_cache", self.save_parse_marks)
+                return
+
+            # A plan edited since it was parsed may have moved its boxes to
+            # other lines: have apply_change re-parse and redo the change
+            if self.plan_changed():
+                raise ProgressConflict("the plan changed since it was parsed")
+
+            # Offsets are unknown or in-place writes are unavailable: rewrite
+            # the unchanged file from its lines
+            self.load_markdown_content()
+            self.apply_marks_to_lines(checkboxes)
+            self.save_markdown()
+
+    def plan_changed(self) -> bool:
+        """Whether a plan file's stat differs from the one it was parsed with"""
+        if not self.markdown_stat:
+            return False
+        for path, _, _ in self.plan_sources:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return True
+            if (stat.st_mtime_ns, stat.st_size) != self.markdown_stat.get(path):
+                return True
+        return False
+
+    def apply_marks_to_lines(self, checkboxes: list):
+        """Set the mark character of each checkbox in markdown_content"""
+        store = self.checkboxes
+        for i in checkboxes:
+            line_index = store.line_index[i]
+            line = self.markdown_content[line_index]
+            pos = line.find("- [")
+            if pos < 0:
+                continue
+            pos += 3
+            mark = "x" if store.is_checked(i) else " "
+            self.markdown_content[line_index] = line[:pos] + mark + line[pos + 1 :]
+
+    def write_marks_in_place(self, checkboxes: list) -> bool:
+        """Flip checkbox marks at their byte offsets
+
+        The flips are staged as journal patches, written with pwrite once
+        the batch commits, so marking a day costs I/O proportional to its
+        tasks rather than to the file. Returns False without staging anything
+        if a plan file changed since it was parsed, or is already being
+        rewritten, so the caller can fall back to a full rewrite.
+        """
+        store = self.checkboxes
+        if not hasattr(os, "pwrite") or not self.markdown_stat:
+            return False
+        if any(store.offset[i] < 0 for i in checkboxes):
+            return False
+
+        # Offsets count from the start of the first plan file; route each
+        # mark to the file holding it. Empty files share their start with
+        # the next one, so take the last file starting at or before it.
+        file_starts = [source[2] for source in self.plan_sources]
+        targets = defaultdict(list)
+        for i in checkboxes:
+            k = bisect_right(file_starts, store.offset[i]) - 1
+            path, _, byte_start = self.plan_sources[k]
+            targets[path].append((i, store.offset[i] - byte_start))
+        if any(self.journal.staged(path) for path in targets):
+            return False
+
+        fds = {}
+        try:
+            for path in targets:
+                try:
+                    fds[path] = os.open(path, os.O_RDWR)
+                except OSError:
+                    return False
+
+            for path, marks in targets.items():
+                stat = os.fstat(fds[path])
+                if (stat.st_mtime_ns, stat.st_size) != self.markdown_stat.get(path):
+                    return False
+
+                # Verify every target before touching any of them
+                for _, offset in marks:
+                    found = os.pread(fds[path], 3, offset - 1)
+                    if found not in (b"[ ]", b"[x]", b"[X]"):
+                        return False
+        finally:
+            for fd in fds.values():
+                os.close(fd)
+
+        with self.journal.batch():
+            for path, marks in targets.items():
+                for i, offset in marks:
+                    self.journal.patch(
+                        path, offset, b"x" if store.is_checked(i) else b" "
+                    )
+                self.journal.after_commit(
+                    ("markdown_stat", path), lambda path=path: self.refresh_stat(path)
+                )
+        return True
+
+    def refresh_stat(self, path: str):
+        """Record a plan file's stat after the tracker itself wrote to it"""
+        stat = os.stat(path)
+        self.markdown_stat[path] = (stat.st_mtime_ns, stat.st_size)
 
-        self.progress_data["stats"]["current_streak"] = current_streak
-        self.progress_data["stats"]["longest_streak"] = max(
-            self.progress_data["stats"]["longest_streak"], current_streak
+    def update_streak(self):
+        """Update study streak statistics
+
+        The dates with a completion are kept as StreakRuns in the progress's
+        streak_index, along with how many history entries they cover, so
+        only the entries added since the last call are read. While the
+        history is not loaded those are the entries appended to it, so the
+        stored log is not read at all. An index that no longer matches the
+        history is rebuilt from scratch.
+        """
+        if self.pending is not None:
+            self.pending["streak"] = True
+            return
+
+        progress = self.progress_data
+        index = progress.get("streak_index")
+        if index is not None and not history_loaded(progress):
+            runs = StreakRuns(index["runs"])
+            new_entries = progress.appended[progress.appended_streaked :]
+            for entry in new_entries:
+                if entry["action"] == "complete":
+                    runs.add(entry_ordinal(entry))
+            progress.appended_streaked = len(progress.appended)
+            events = index["events"] + len(new_entries)
+        else:
+            history = progress["history"]
+            if index is None or index["events"] > len(history) or (
+                self.streak_history is not None and history is not self.streak_history
+            ):
+                runs = self.rebuild_streaks()
+            else:
+                runs = StreakRuns(index["runs"])
+                for entry in history[index["events"] :]:
+                    if entry["action"] == "complete":
+                        runs.add(entry_ordinal(entry))
+            events = len(history)
+            self.streak_history = history
+
+        progress["streak_index"] = {"runs": runs.to_list(), "events": events}
+
+        stats = self.progress_data["stats"]
+        stats["current_streak"] = runs.current(datetime.now().date().toordinal())
+        stats["longest_streak"] = runs.longest
+
+    def rebuild_streaks(self) -> StreakRuns:
+        """Study date runs from the rollup and the whole history"""
+        ordinals = [
+            datetime.fromisoformat(date).date().toordinal()
+            for date, day in self.progress_data.get("rollup", {}).items()
+            if day["sessions"]
+        ]
+        ordinals.extend(
+            entry_ordinal(entry)
+            for entry in self.progress_data["history"]
+            if entry["action"] == "complete"
         )
+        return StreakRuns.from_ordinals(ordinals)
 
+    @_progress_change
     def undo_last_action(self) -> bool:
-        """Undo the last completed day"""
+        """Undo the last completed day, or the last group of days"""
         self.parse_markdown()
-        if not self.progress_data["history"]:
-            return False
 
         # Find last 'complete' action
-        last_complete = None
-        for entry in reversed(self.progress_data["history"]):
-            if entry["action"] == "complete":
-                last_complete = entry
-                break
+        last_complete = self.storage.last_event(self.progress_data, "complete")
 
         if not last_complete:
             return False
 
-        day = last_complete["day"]
+        # Grouped entries cover their days as [first, last] runs
+        if "days" in last_complete:
+            days = expand_day_ranges(last_complete["days"])
+        else:
+            days = [last_complete["day"]]
+
+        store = self.checkboxes
 
-        # Find all checked boxes for this day
+        # Find all checked boxes for these days
         day_checkboxes = [
-            cb for cb in self.checkboxes if cb["day"] == day and cb["checked"]
+            i for day in days for i in store.day_indices(day) if store.is_checked(i)
         ]
-        
+
         if not day_checkboxes:
             return False
 
-        # Update all checkboxes for this day
-        for cb in day_checkboxes:
-            line_index = cb["line_index"]
-            self.markdown_content[line_index] = self.markdown_content[
-                line_index
-            ].replace("- [x]", "- [ ]")
+        # Update checkbox state and the summary in memory
+        self.flip_checkboxes(day_checkboxes, False)
 
-            # Update checkbox state in memory
-            cb["checked"] = False
+        # Update progress data (remove the days from completed_days)
+        undone = set(days)
+        self.progress_data["completed_days"] = [
+            day for day in self.progress_data["completed_days"] if day not in undone
+        ]
 
-        # Update progress data (remove day from completed_days if it exists)
-        if day in self.progress_data["completed_days"]:
-            self.progress_data["completed_days"].remove(day)
-        
         # Add single undo entry to history
-        self.progress_data["history"].append(
-            {
-                "action": "undo",
-                "day": day,
-                "timestamp": datetime.now().isoformat(),
-            }
-        )
+        entry = {"action": "undo"}
+        if "days" in last_complete:
+            entry["days"] = last_complete["days"]
+        else:
+            entry["day"] = last_complete["day"]
+        append_event(self.progress_data, stamp_entry(entry, datetime.now()))
 
-        # Save files once
-        self.save_markdown()
-        self.save_progress()
+        # Save both files in one journaled commit
+        with self.journal.batch():
+            self.save_checkbox_marks(day_checkboxes)
+            self.save_progress()
         return True
 
-    def show_status(self):
-        """Show detailed progress status"""
-        self.parse_markdown()
+    def complete_day_range(self, first: int, last: int) -> Optional[int]:
+        """Mark every day from first to last complete as one action
 
-        total_days = len(self.checkboxes)
-        completed_days = len([cb for cb in self.checkboxes if cb["checked"]])
-        current_day = self.get_current_day()
+        Returns the number of days that had unchecked boxes, None if the
+        range lies past the end of the plan.
+        """
+        return self.set_day_range(first, last, True)
+
+    def undo_day_range(self, first: int, last: int) -> Optional[int]:
+        """Uncheck every day from first to last as one action
 
-        # Calculate phase progress
-        phase_progress = defaultdict(lambda: {"total": 0, "completed": 0})
-        for cb in self.checkboxes:
-            phase = (
-                cb["phase"].replace("## 📅 ", "").strip() if cb["phase"] else "Unknown"
+        Returns the number of days that had checked boxes, None if the
+        range lies past the end of the plan.
+        """
+        return self.set_day_range(first, last, False)
+
+    def set_day_range(self, first: int, last: int, checked: bool) -> Optional[int]:
+        """Set the boxes of days first..last checked or unchecked
+
+        The range is cut off at the plan's last day. A range starting past
+        it is rejected with a message and None is returned.
+        """
+        self.parse_markdown()
+        last_day = max(self.checkboxes.day_runs, default=0)
+        if first > last_day:
+            console.print(
+                f"[red]Invalid day range. Must start between 1 and {last_day}[/red]"
             )
-            phase_progress[phase]["total"] += 1
-            if cb["checked"]:
-                phase_progress[phase]["completed"] += 1
+            return None
+        return self.set_days(range(first, min(last, last_day) + 1), checked)
+
+    @_progress_change
+    def set_days(self, days_to_set, checked: bool) -> int:
+        """Set the boxes of several days checked or unchecked as one action
+
+        Every box that changes is flipped in one pass and written with one
+        commit, and the days are recorded as a single grouped history entry
+        of [first, last] runs that undo_last_action reverts as a unit.
+        Returns the number of days that changed.
+        """
+        store = self.checkboxes
+
+        changed = []
+        days = []
+        for day in days_to_set:
+            indices = [i for i in store.day_indices(day) if store.is_checked(i) != checked]
+            if indices:
+                changed.extend(indices)
+                days.append(day)
+
+        if not days:
+            return 0
+
+        self.flip_checkboxes(changed, checked)
+
+        progress = self.progress_data
+        if checked:
+            known = set(progress["completed_days"])
+            progress["completed_days"].extend(day for day in days if day not in known)
+            progress["last_activity"] = datetime.now().isoformat()
+            progress["stats"]["total_study_sessions"] += len(days)
+        else:
+            undone = set(days)
+            progress["completed_days"] = [
+                day for day in progress["completed_days"] if day not in undone
+            ]
+
+        entry = {"action": "complete" if checked else "undo", "days": day_ranges(days)}
+        append_event(progress, stamp_entry(entry, datetime.now()))
+        if checked:
+            self.update_streak()
+
+        # Save both files in one journaled commit
+        with self.journal.batch():
+            self.save_checkbox_marks(changed)
+            self.save_progress()
+        return len(days)
+
+    def project_masks(self) -> tuple:
+        """Masks of the mini-project and major-project checkboxes"""
+        store = self.checkboxes
+        mini_mask = store.mask_where(
+            "mini_project", lambda line: project_kind(line) == "mini"
+        )
+        major_mask = store.mask_where(
+            "major_project", lambda line: project_kind(line) == "major"
+        )
+        return mini_mask, major_mask
+
+    def build_summary(self) -> dict:
+        """Count the checked and total boxes per phase and week from the store
+
+        The summary also holds the checked project counts and the next
+        milestone, and records the plan layout and checked state it was
+        counted for, which summary() checks before trusting it.
+        """
+        store = self.checkboxes
+        phases = {}
+        for phase_id, runs in store.phase_runs.items():
+            mask = store.phase_mask(phase_id)
+            days = [day for start, stop in runs for day in store.day[start:stop]]
+            phase = phases.setdefault(
+                phase_title(store.phases[phase_id]),
+                {"completed": 0, "total": 0, "start_day": min(days), "end_day": 0},
+            )
+            phase["completed"] += store.count_in(mask)
+            phase["total"] += mask[1].bit_count()
+            phase["start_day"] = min(phase["start_day"], min(days))
+            phase["end_day"] = max(phase["end_day"], max(days))
+
+        weeks = {}
+        for week in store.week_runs:
+            mask = store.week_mask(week)
+            weeks[str(week)] = [store.count_in(mask), mask[1].bit_count()]
+
+        mini_mask, major_mask = self.project_masks()
+        completed = store.count_checked()
+        return {
+            "layout": self.plan_layout,
+            "checked": hashlib.blake2b(store.checked, digest_size=16).hexdigest(),
+            "completed": completed,
+            "total": len(store),
+            "phases": phases,
+            "weeks": weeks,
+            "projects": {
+                "mini": store.count_in(mini_mask),
+                "major": store.count_in(major_mask),
+            },
+            "next_milestone": next_milestone(completed),
+        }
+
+    def summary(self) -> dict:
+        """The progress's stored summary, rebuilt if it no longer fits the plan
+
+        The stored one is used as long as the plan layout and the checked
+        boxes are those it was counted for, so read commands skip the
+        counting. A rebuilt summary is kept in memory and saved with the
+        next write.
+        """
+        summary = self.progress_data.get("summary")
+        if (
+            summary is None
+            or self.plan_layout is None
+            or summary["layout"] != self.plan_layout
+            or summary["checked"]
+            != hashlib.blake2b(self.checkboxes.checked, digest_size=16).hexdigest()
+        ):
+            summary = self.progress_data["summary"] = self.build_summary()
+        return summary
+
+    def flip_checkboxes(self, indices: list, checked: bool):
+        """Check or uncheck boxes, updating the summary by their changes only"""
+        summary = self.summary()
+        store = self.checkboxes
+        delta = 1 if checked else -1
+        for i in indices:
+            if store.is_checked(i) == checked:
+                continue
+            store.set_checked(i, checked)
+            summary["completed"] += delta
+            summary["phases"][phase_title(store.phases[store.phase_id[i]])][
+                "completed"
+            ] += delta
+            summary["weeks"][str(store.week[i])][0] += delta
+            # Only the flipped boxes are classified, not the whole plan
+            kind = project_kind(store.full_line(i))
+            if kind is not None:
+                summary["projects"][kind] += delta
+
+        summary["checked"] = hashlib.blake2b(store.checked, digest_size=16).hexdigest()
+        summary["next_milestone"] = next_milestone(summary["completed"])
+
+    def status_report(self) -> tuple:
+        """Fields of --status and a generator of its phase rows"""
+        self.parse_markdown()
+
+        store = self.checkboxes
+        summary = self.summary()
+        total_days = summary["total"]
+        completed_days = summary["completed"]
+        current_day = self.get_current_day()
+        first = store.first_index_of_day(current_day)
 
         # Calculate week progress
-        current_week = 0
-        week_total = 0
-        week_completed = 0
-        for cb in self.checkboxes:
-            if cb["day"] == current_day:
-                current_week = cb["week"]
-                break
+        current_week = store.week[first] if first is not None else 0
+        week_completed, week_total = summary["weeks"].get(str(current_week), (0, 0))
 
-        for cb in self.checkboxes:
-            if cb["week"] == current_week:
-                week_total += 1
-                if cb["checked"]:
-                    week_completed += 1
+        if current_day <= total_days and first is not None:
+            current_phase = store.phases[store.phase_id[first]].replace("## 📅 ", "")
+        else:
+            current_phase = "Completed!"
 
-        # Create status panel
-        progress_percent = (completed_days / total_days * 100) if total_days > 0 else 0
+        milestone = None
+        if summary["next_milestone"]:
+            day, desc = summary["next_milestone"]
+            milestone = {
+                "day": day,
+                "description": desc,
+                "days_away": day - completed_days,
+            }
 
-        status_text = f"""[bold cyan]Current:[/bold cyan] Day {current_day}/{total_days} ({progress_percent:.1f}%)
-[bold cyan]Phase:[/bold cyan] {[cb["phase"].replace("## 📅 ", "") for cb in self.checkboxes if cb["day"] == current_day][0] if current_day <= total_days else "Completed!"}
-[bold cyan]This Week:[/bold cyan] {week_completed}/{week_total} days completed (Week {current_week})
-[bold cyan]Total Study Sessions:[/bold cyan] {self.progress_data["stats"]["total_study_sessions"]}
-[bold cyan]Current Streak:[/bold cyan] {self.progress_data["stats"]["current_streak"]} days
-[bold cyan]Longest Streak:[/bold cyan] {self.progress_data["stats"]["longest_streak"]} days"""
+        fields = {
+            "current_day": current_day,
+            "total_days": total_days,
+            "completed_days": completed_days,
+            "progress_percent": (
+                (completed_days / total_days * 100) if total_days > 0 else 0
+            ),
+            "phase": current_phase,
+            "week": current_week,
+            "week_completed": week_completed,
+            "week_total": week_total,
+            "total_study_sessions": self.progress_data["stats"]["total_study_sessions"],
+            "current_streak": self.progress_data["stats"]["current_streak"],
+            "longest_streak": self.progress_data["stats"]["longest_streak"],
+            "next_milestone": milestone,
+            "mini_projects": summary["projects"]["mini"],
+            "major_projects": summary["projects"]["major"],
+        }
 
-        # Milestones
-        milestones = {84: "Junior C++ Level", 168: "Course Completion"}
+        def rows():
+            for phase, data in summary["phases"].items():
+                if phase and phase != "Unknown":
+                    yield {
+                        "phase": phase,
+                        "completed": data["completed"],
+                        "total": data["total"],
+                        "percentage": (
+                            (data["completed"] / data["total"] * 100)
+                            if data["total"] > 0
+                            else 0
+                        ),
+                    }
+
+        return fields, rows()
 
-        next_milestone = None
-        for day, desc in sorted(milestones.items()):
-            if day > completed_days:
-                next_milestone = (
-                    f"Day {day} - {desc} ({day - completed_days} days away)"
-                )
-                break
+    def show_status(self):
+        """Show detailed progress status"""
+        fields, phase_rows = self.status_report()
+
+        # Create status panel
+        status_text = f"""[bold cyan]Current:[/bold cyan] Day {fields["current_day"]}/{fields["total_days"]} ({fields["progress_percent"]:.1f}%)
+[bold cyan]Phase:[/bold cyan] {fields["phase"]}
+[bold cyan]This Week:[/bold cyan] {fields["week_completed"]}/{fields["week_total"]} days completed (Week {fields["week"]})
+[bold cyan]Total Study Sessions:[/bold cyan] {fields["total_study_sessions"]}
+[bold cyan]Current Streak:[/bold cyan] {fields["current_streak"]} days
+[bold cyan]Longest Streak:[/bold cyan] {fields["longest_streak"]} days"""
 
-        if next_milestone:
+        # Milestones
+        milestone = fields["next_milestone"]
+        if milestone:
+            next_milestone = f"Day {milestone['day']} - {milestone['description']} ({milestone['days_away']} days away)"
             status_text += f"\n[bold cyan]Next Milestone:[/bold cyan] {next_milestone}"
 
         # Projects completed
-        mini_projects = 0
-        major_projects = 0
-        for cb in self.checkboxes:
-            if cb["checked"] and "Mini Project:" in cb["content"]:
-                mini_projects += 1
-            elif (
-                cb["checked"]
-                and "Project:" in cb["content"]
-                and "Mini" not in cb["content"]
-            ):
-                major_projects += 1
-
-        status_text += f"\n[bold cyan]Projects Completed:[/bold cyan] {mini_projects}/8 mini, {major_projects}/8 major"
+        status_text += f"\n[bold cyan]Projects Completed:[/bold cyan] {fields['mini_projects']}/8 mini, {fields['major_projects']}/8 major"
 
-        console.print(Panel(status_text, title="📊 Study Progress", box=box.ROUNDED))
+        console.print(panel(status_text, "📊 Study Progress"))
 
         # Phase breakdown table
-        if len(phase_progress) > 1:
-            table = Table(title="Phase Breakdown", box=box.SIMPLE)
-            table.add_column("Phase", style="cyan")
-            table.add_column("Progress", style="green")
-            table.add_column("Percentage", style="yellow")
-
-            for phase, data in phase_progress.items():
-                if phase and phase != "Unknown":
-                    percentage = (
-                        (data["completed"] / data["total"] * 100)
-                        if data["total"] > 0
-                        else 0
-                    )
-                    table.add_row(
-                        phase,
-                        f"{data['completed']}/{data['total']}",
-                        f"{percentage:.1f}%",
-                    )
-
-            console.print(table)
+        if len(self.summary()["phases"]) > 1:
+            rows = [
+                (
+                    row["phase"],
+                    f"{row['completed']}/{row['total']}",
+                    f"{row['percentage']:.1f}%",
+                )
+                for row in phase_rows
+            ]
+            console.print(
+                table(
+                    "Phase Breakdown",
+                    [
+                        {"header": "Phase", "style": "cyan"},
+                        {"header": "Progress", "style": "green"},
+                        {"header": "Percentage", "style": "yellow"},
+                    ],
+                    rows,
+                )
+            )
 
-    def show_next(self):
-        """Show next day's tasks"""
+    def next_report(self) -> tuple:
+        """Fields of --next and a generator of the next day's task rows"""
         self.parse_markdown()
         current_day = self.get_current_day()
+        store = self.checkboxes
 
-        if current_day > len(self.checkboxes):
-            console.print(
-                "[green]🎉 Congratulations! You've completed the entire course![/green]"
-            )
-            return
+        if current_day > len(store):
+            return {"day": current_day, "course_complete": True}, iter(())
 
         # Find all tasks for the next day
-        day_tasks = []
+        day_indices = store.day_indices(current_day)
+        day_tasks = [store[i]["content"] for i in day_indices]
         week = 0
         phase = ""
 
-        for cb in self.checkboxes:
-            if cb["day"] == current_day:
-                day_tasks.append(cb["content"])
-                week = cb["week"]
-                phase = cb["phase"].replace("## 📅 ", "") if cb["phase"] else ""
+        if day_indices:
+            last = store[day_indices[-1]]
+            week = last["week"]
+            phase = last["phase"].replace("## 📅 ", "") if last["phase"] else ""
+
+        fields = {
+            "day": current_day,
+            "course_complete": False,
+            "week": week,
+            "phase": phase,
+            # Difficult topics, weekend projects and review days
+            "challenging": any("🔥" in task for task in day_tasks),
+            "project_day": any("Project:" in task for task in day_tasks),
+            "review_day": any("REVIEW" in task for task in day_tasks),
+        }
+        # Clean up the task text
+        rows = ({"task": re.sub(r"^- \[.\] ", "", task)} for task in day_tasks)
+        return fields, rows
 
-        # Check if it's a difficult topic
-        is_difficult = any("🔥" in task for task in day_tasks)
+    def show_next(self):
+        """Show next day's tasks"""
+        fields, task_rows = self.next_report()
+
+        if fields["course_complete"]:
+            console.print(
+                "[green]🎉 Congratulations! You've completed the entire course![/green]"
+            )
+            return
 
         # Create next day panel
-        next_text = f"[bold]Day {current_day} - Week {week}[/bold]\n"
-        next_text += f"[dim]{phase}[/dim]\n\n"
+        next_text = f"[bold]Day {fields['day']} - Week {fields['week']}[/bold]\n"
+        next_text += f"[dim]{fields['phase']}[/dim]\n\n"
 
-        if is_difficult:
+        if fields["challenging"]:
             next_text += "[red]🔥 Challenging Topic Alert![/red]\n\n"
 
         next_text += "[bold]Tasks:[/bold]\n"
-        for task in day_tasks:
-            # Clean up the task text
-            task_clean = re.sub(r"^- \[.\] ", "", task)
-            next_text += f"  • {task_clean}\n"
+        for row in task_rows:
+            next_text += f"  • {row['task']}\n"
 
-        # Check if weekend project
-        if any("Project:" in task for task in day_tasks):
+        if fields["project_day"]:
             next_text += "\n[yellow]📝 Project Day - Allow extra time![/yellow]"
 
-        # Check if review day
-        if any("REVIEW" in task for task in day_tasks):
+        if fields["review_day"]:
             next_text += "\n[green]📚 Review Day - Consolidate your learning![/green]"
 
-        console.print(Panel(next_text, title="📅 Next Study Session", box=box.ROUNDED))
+        console.print(panel(next_text, "📅 Next Study Session"))
 
-    def show_week_summary(self):
-        """Show current week's progress"""
+    def week_summary_report(self) -> tuple:
+        """Fields of --week-summary and a generator of the week's task rows
+
+        Rows are made from the store as they are consumed, so a large week
+        is never held as a list of records.
+        """
         self.parse_markdown()
         current_day = self.get_current_day()
 
         # Find current week
-        current_week = 1
-        for cb in self.checkboxes:
-            if cb["day"] >= current_day:
-                current_week = cb["week"]
-                break
+        store = self.checkboxes
+        first = store.first_index_of_day(current_day)
+        if first is None:
+            # Past the last day: fall back to the first later-numbered day
+            first = next((i for i, d in enumerate(store.day) if d >= current_day), None)
+        current_week = store.week[first] if first is not None else 1
+        indices = store.week_indices(current_week)
+
+        # Week statistics
+        week_mask = store.week_mask(current_week)
+        completed = store.count_in(week_mask)
+        total = week_mask[1].bit_count()
 
-        # Get all days in current week
-        week_days = [cb for cb in self.checkboxes if cb["week"] == current_week]
+        # Check for projects this week
+        projects = []
+        for i in indices:
+            content = store[i]["content"]
+            if "Project:" in content:
+                project_name = re.search(r"Project: ([^-]+)", content)
+                projects.append(
+                    {
+                        "name": project_name.group(1).strip() if project_name else None,
+                        "checked": store.is_checked(i),
+                    }
+                )
 
-        if not week_days:
+        fields = {
+            "week": current_week,
+            "completed": completed,
+            "total": total,
+            "percentage": (completed / total * 100) if total > 0 else 0,
+            "projects": projects,
+        }
+        rows = (
+            {
+                "day": store.day[i],
+                "checked": store.is_checked(i),
+                "topic": re.sub(
+                    r"^- \[.\] Day \d+ \([^)]+\)\s*", "", store[i]["content"]
+                ),
+            }
+            for i in indices
+        )
+        return fields, rows
+
+    def show_week_summary(self):
+        """Show current week's progress"""
+        fields, day_rows = self.week_summary_report()
+
+        if not fields["total"]:
             console.print("[red]No data found for current week[/red]")
             return
 
         # Create week summary
-        table = Table(title=f"Week {current_week} Summary", box=box.SIMPLE)
-        table.add_column("Day", style="cyan", width=8)
-        table.add_column("Status", style="green", width=10)
-        table.add_column("Topic", style="white")
-
-        for cb in week_days:
-            status = "✅ Done" if cb["checked"] else "⏳ Pending"
-            topic = re.sub(r"^- \[.\] Day \d+ \([^)]+\)\s*", "", cb["content"])
+        rows = []
+        for row in day_rows:
+            status = "✅ Done" if row["checked"] else "⏳ Pending"
+            topic = row["topic"]
             topic = topic[:50] + "..." if len(topic) > 50 else topic
 
-            table.add_row(f"Day {cb['day']}", status, topic)
-
-        console.print(table)
-
-        # Week statistics
-        completed = len([d for d in week_days if d["checked"]])
-        total = len(week_days)
-        percentage = (completed / total * 100) if total > 0 else 0
+            rows.append((f"Day {row['day']}", status, topic))
+
+        console.print(
+            table(
+                f"Week {fields['week']} Summary",
+                [
+                    {"header": "Day", "style": "cyan", "width": 8},
+                    {"header": "Status", "style": "green", "width": 10},
+                    {"header": "Topic", "style": "white"},
+                ],
+                rows,
+            )
+        )
 
-        stats_text = f"\n[bold]Week Progress:[/bold] {completed}/{total} days ({percentage:.1f}%)"
+        stats_text = f"\n[bold]Week Progress:[/bold] {fields['completed']}/{fields['total']} days ({fields['percentage']:.1f}%)"
 
-        # Check for projects this week
-        projects = [d for d in week_days if "Project:" in d["content"]]
+        projects = fields["projects"]
         if projects:
             stats_text += (
                 f"\n[bold]Projects:[/bold] {len(projects)} project(s) this week"
             )
-            for p in projects:
-                project_name = re.search(r"Project: ([^-]+)", p["content"])
-                if project_name:
-                    status = "✅" if p["checked"] else "⏳"
-                    stats_text += f"\n  {status} {project_name.group(1).strip()}"
+            for project in projects:
+                if project["name"]:
+                    status = "✅" if project["checked"] else "⏳"
+                    stats_text += f"\n  {status} {project['name']}"
 
         console.print(stats_text)
 
@@ -478,11 +3286,17 @@ class StudyTracker:
             )
             return
 
-        completed_count = 0
-        for cb in self.checkboxes:
-            if cb["day"] < day and not cb["checked"]:
-                self.mark_day_complete(cb["day"])
-                completed_count += 1
+        # Days with an unchecked box before the target, in plan order;
+        # every box before the first unchecked one is done already
+        store = self.checkboxes
+        start = store.first_unchecked()
+        pending_days = dict.fromkeys(
+            d
+            for i, d in enumerate(store.day[start:], start)
+            if d < day and not store.is_checked(i)
+        )
+
+        completed_count = self.set_days(pending_days, True)
 
         if completed_count > 0:
             console.print(f"[green]Marked {completed_count} days as complete[/green]")
@@ -492,12 +3306,62 @@ class StudyTracker:
                 "[yellow]No changes needed - already at or past this day[/yellow]"
             )
 
-    def show_stats(self):
-        """Show overall statistics"""
+    def forecast_completion(self) -> Optional[list]:
+        """Completion date ordinals at _FORECAST_PERCENTILES, simulated
+
+        The gaps between study dates come from the streak index in the
+        snapshot, so the history is not read. The result is cached in
+        forecast_file keyed on the progress version, the plan days left and
+        today, so --stats repeats the simulation only after a write or on a
+        new day. The fixed seed gives the same dates for the same gaps.
+        Returns None until there are two study dates to take a gap from.
+        """
+        store = self.checkboxes
+        remaining = len(
+            {day for i, day in enumerate(store.day) if not store.is_checked(i)}
+        )
+        version = self.progress_data.get("version", 0)
+        today = datetime.now().date().toordinal()
+        key = [_FORECAST_CACHE_VERSION, version, remaining, today]
+
+        try:
+            with open(self.forecast_file, "r") as f:
+                cache = json.load(f)
+            if cache["key"] == key:
+                return cache["dates"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        index = self.progress_data.get("streak_index")
+        runs = StreakRuns(index["runs"]) if index is not None else self.rebuild_streaks()
+        gap_counts = runs.gap_counts()
+        if not gap_counts:
+            return None
+        offsets = forecast_offsets(gap_counts, remaining)
+        dates = [today + offset for offset in offsets]
+
+        # The cache is disposable: a failed write only costs a re-simulation
+        tmp_file = f"{self.forecast_file}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump({"key": key, "dates": dates}, f)
+            os.replace(tmp_file, self.forecast_file)
+        except OSError:
+            pass
+        return dates
+
+    def stats_report(self, detailed: bool = False) -> tuple:
+        """Fields of --stats and a generator of its phase timeline rows
+
+        Dates are ISO strings. With ``detailed`` the fields also hold the
+        rolling session counts, weekdays and velocity of detailed_stats.
+        """
         self.parse_markdown()
 
-        total_days = len(self.checkboxes)
-        completed_days = len([cb for cb in self.checkboxes if cb["checked"]])
+        summary = self.summary()
+        total_days = summary["total"]
+        completed_days = summary["completed"]
+        sessions = self.progress_data["stats"]["total_study_sessions"]
 
         # Calculate time-based stats
         start_date = datetime.fromisoformat(self.progress_data["start_date"])
@@ -505,89 +3369,269 @@ class StudyTracker:
 
         # Study frequency
         study_frequency = (
-            (
-                self.progress_data["stats"]["total_study_sessions"]
-                / days_since_start
-                * 100
-            )
-            if days_since_start > 0
-            else 0
+            (sessions / days_since_start * 100) if days_since_start > 0 else 0
         )
 
         # Average days per week
         weeks_elapsed = days_since_start / 7
-        avg_days_per_week = (
-            (self.progress_data["stats"]["total_study_sessions"] / weeks_elapsed)
-            if weeks_elapsed > 0
-            else 0
-        )
-
-        # Estimated completion
-        if completed_days > 0 and days_since_start > 0:
+        avg_days_per_week = (sessions / weeks_elapsed) if weeks_elapsed > 0 else 0
+
+        # Estimated completion: simulated from the gaps between study dates,
+        # else extrapolated from the pace so far
+        forecast = self.forecast_completion()
+        estimated = early = late = None
+        if forecast is not None:
+            early, estimated, late = (
+                datetime.fromordinal(ordinal).date().isoformat() for ordinal in forecast
+            )
+        elif completed_days > 0 and days_since_start > 0:
             days_per_session = days_since_start / completed_days
             remaining_days = total_days - completed_days
             estimated_days = remaining_days * days_per_session
-            estimated_completion = datetime.now() + timedelta(days=estimated_days)
-            estimated_date = estimated_completion.strftime("%B %d, %Y")
+            estimated = (datetime.now() + timedelta(days=estimated_days)).date().isoformat()
+
+        fields = {
+            "completed_days": completed_days,
+            "total_days": total_days,
+            "progress_percent": (
+                (completed_days / total_days * 100) if total_days > 0 else 0
+            ),
+            "start_date": start_date.date().isoformat(),
+            "days_since_start": days_since_start,
+            "total_sessions": sessions,
+            "study_frequency": study_frequency,
+            "avg_days_per_week": avg_days_per_week,
+            "current_streak": self.progress_data["stats"]["current_streak"],
+            "longest_streak": self.progress_data["stats"]["longest_streak"],
+            "estimated_completion": estimated,
+            "estimated_completion_p10": early,
+            "estimated_completion_p90": late,
+        }
+        if detailed:
+            fields.update(self.detailed_stats())
+
+        def rows():
+            for phase, data in summary["phases"].items():
+                if phase and phase != "Unknown":
+                    yield {
+                        "phase": phase,
+                        "start_day": data["start_day"],
+                        "end_day": data["end_day"],
+                        "completed": data["completed"],
+                        "total": data["total"],
+                        "percentage": (
+                            (data["completed"] / data["total"] * 100)
+                            if data["total"] > 0
+                            else 0
+                        ),
+                    }
+
+        return fields, rows()
+
+    def show_stats(self, detailed: bool = False):
+        """Show overall statistics, with history metrics when detailed"""
+        fields, phase_rows = self.stats_report(detailed)
+
+        def long_date(iso_date):
+            return datetime.fromisoformat(iso_date).strftime("%B %d, %Y")
+
+        if fields["estimated_completion_p10"] is not None:
+            estimated_date = (
+                f"{long_date(fields['estimated_completion'])} "
+                f"(P10 {long_date(fields['estimated_completion_p10'])}, "
+                f"P90 {long_date(fields['estimated_completion_p90'])})"
+            )
+        elif fields["estimated_completion"] is not None:
+            estimated_date = long_date(fields["estimated_completion"])
         else:
             estimated_date = "N/A"
 
         # Create statistics panel
-        stats_text = f"""[bold cyan]Overall Progress:[/bold cyan] {completed_days}/{total_days} days ({completed_days / total_days * 100:.1f}%)
-[bold cyan]Study Since:[/bold cyan] {start_date.strftime("%B %d, %Y")} ({days_since_start} days ago)
-[bold cyan]Total Sessions:[/bold cyan] {self.progress_data["stats"]["total_study_sessions"]}
-[bold cyan]Study Frequency:[/bold cyan] {study_frequency:.1f}% of days
-[bold cyan]Average:[/bold cyan] {avg_days_per_week:.1f} days per week
-[bold cyan]Current Streak:[/bold cyan] {self.progress_data["stats"]["current_streak"]} days
-[bold cyan]Longest Streak:[/bold cyan] {self.progress_data["stats"]["longest_streak"]} days
+        stats_text = f"""[bold cyan]Overall Progress:[/bold cyan] {fields["completed_days"]}/{fields["total_days"]} days ({fields["completed_days"] / fields["total_days"] * 100:.1f}%)
+[bold cyan]Study Since:[/bold cyan] {long_date(fields["start_date"])} ({fields["days_since_start"]} days ago)
+[bold cyan]Total Sessions:[/bold cyan] {fields["total_sessions"]}
+[bold cyan]Study Frequency:[/bold cyan] {fields["study_frequency"]:.1f}% of days
+[bold cyan]Average:[/bold cyan] {fields["avg_days_per_week"]:.1f} days per week
+[bold cyan]Current Streak:[/bold cyan] {fields["current_streak"]} days
+[bold cyan]Longest Streak:[/bold cyan] {fields["longest_streak"]} days
 [bold cyan]Estimated Completion:[/bold cyan] {estimated_date}"""
 
-        console.print(Panel(stats_text, title="📈 Study Statistics", box=box.ROUNDED))
-
-        # Phase timeline
-        phase_data = defaultdict(
-            lambda: {"total": 0, "completed": 0, "start_day": 999, "end_day": 0}
-        )
+        console.print(panel(stats_text, "📈 Study Statistics"))
 
-        for cb in self.checkboxes:
-            phase = (
-                cb["phase"].replace("## 📅 ", "").strip() if cb["phase"] else "Unknown"
+        # Create phase timeline
+        console.print("\n[bold]📍 Phase Timeline:[/bold]")
+        for row in phase_rows:
+            status = "✅" if row["percentage"] == 100 else "🔄"
+            console.print(
+                f"{status} {row['phase']}: Days {row['start_day']}-{row['end_day']} ({row['percentage']:.0f}% complete)"
             )
-            phase_data[phase]["total"] += 1
-            if cb["checked"]:
-                phase_data[phase]["completed"] += 1
-            phase_data[phase]["start_day"] = min(
-                phase_data[phase]["start_day"], cb["day"]
+
+        if detailed:
+            self.show_detailed_stats(fields)
+
+    def detailed_stats(self) -> dict:
+        """Rolling session counts, weekdays and velocity from the history"""
+        engine = StatsEngine.from_progress(self.progress_data)
+        today = datetime.now().date().toordinal()
+        return {
+            "rolling_sessions": {
+                str(days): {
+                    "last": engine.window_sessions(today, days),
+                    "best": engine.best_window(days),
+                }
+                for days in StatsEngine.WINDOWS
+            },
+            "weekday_sessions": dict(
+                zip(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"), engine.weekday_histogram())
+            ),
+            "velocity_4_weeks": engine.velocity(today, 4),
+            "velocity_overall": engine.velocity(today),
+        }
+
+    def show_detailed_stats(self, fields: Optional[dict] = None):
+        """Show rolling session counts, weekdays and velocity from the history"""
+        if fields is None:
+            fields = self.detailed_stats()
+
+        rows = [
+            (f"{days} days", str(window["last"]), str(window["best"]))
+            for days, window in fields["rolling_sessions"].items()
+        ]
+        console.print(
+            table(
+                "Rolling Sessions",
+                [
+                    {"header": "Window", "style": "cyan"},
+                    {"header": "Last", "style": "green"},
+                    {"header": "Best", "style": "yellow"},
+                ],
+                rows,
             )
-            phase_data[phase]["end_day"] = max(phase_data[phase]["end_day"], cb["day"])
+        )
 
-        # Create phase timeline
-        console.print("\n[bold]📍 Phase Timeline:[/bold]")
-        for phase, data in phase_data.items():
-            if phase and phase != "Unknown":
-                percentage = (
-                    (data["completed"] / data["total"] * 100)
-                    if data["total"] > 0
-                    else 0
-                )
-                status = "✅" if percentage == 100 else "🔄"
-                console.print(
-                    f"{status} {phase}: Days {data['start_day']}-{data['end_day']} ({percentage:.0f}% complete)"
-                )
+        weekdays = fields["weekday_sessions"]
+        peak = max(weekdays.values()) or 1
+        console.print("[bold]📅 Sessions by Weekday:[/bold]")
+        for name, count in weekdays.items():
+            console.print(f"  {name} {'█' * round(count / peak * 20):<20} {count}")
+
+        console.print(
+            f"\n[bold cyan]Velocity:[/bold cyan] {fields['velocity_4_weeks']:.1f} days/week "
+            f"(last 4 weeks), {fields['velocity_overall']:.1f} days/week overall"
+        )
+
+    # Report method, JSON key of its rows and record name of one row, for
+    # each command --format applies to
+    REPORTS = {
+        "status": ("status_report", "phases", "phase"),
+        "next": ("next_report", "tasks", "task"),
+        "week_summary": ("week_summary_report", "days", "day"),
+        "stats": ("stats_report", "phases", "phase"),
+    }
+
+    def write_report(self, name: str, fmt: str, out=None, **options):
+        """Write a report as json, csv or ndjson without rendering it
+
+        ``options`` go to the report method, e.g. detailed for stats.
+        """
+        method, rows_key, row_record = self.REPORTS[name]
+        fields, rows = getattr(self, method)(**options)
+        if out is not None:
+            dump_report(out, fmt, name, fields, rows, rows_key, row_record)
+            return
+        try:
+            dump_report(sys.stdout, fmt, name, fields, rows, rows_key, row_record)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader (e.g. head) stopped early; skip the rest quietly and
+            # keep the interpreter's final flush from failing again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
 
     def backup_markdown(self):
-        """Create a backup of the markdown file"""
+        """Create a backup of the markdown file (or plan directory)"""
+        import shutil
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"{self.markdown_file}.backup_{timestamp}"
+        backup_name = f"{self.markdown_file.rstrip(os.sep)}.backup_{timestamp}"
 
         try:
-            shutil.copy2(self.markdown_file, backup_name)
+            if os.path.isdir(self.markdown_file):
+                shutil.copytree(self.markdown_file, backup_name)
+            else:
+                shutil.copy2(self.markdown_file, backup_name)
             console.print(f"[green]✅ Backup created: {backup_name}[/green]")
         except Exception as e:
             console.print(f"[red]Error creating backup: {e}[/red]")
 
 
+def dump_report(
+    out, fmt: str, record: str, fields: dict, rows, rows_key: str, row_record: str
+):
+    """Stream a report to out as JSON, CSV or newline-delimited JSON
+
+    "json" is one object: the fields, then the rows as a list under
+    ``rows_key``. "ndjson" is the fields as one object tagged
+    {"record": record}, then one object per row tagged with ``row_record``.
+    "csv" tags its lines the same way in a leading record column: a fields
+    line, then the rows, with lists and objects as JSON text. Each row is
+    written as the generator yields it, so no report is built in full.
+    """
+    if fmt == "csv":
+        import csv
+
+        # The header needs the rows' keys: look at the first row only
+        rows = iter(rows)
+        first = next(rows, None)
+        columns = ["record", *fields]
+        if first is not None:
+            columns.extend(key for key in first if key not in fields)
+
+        def cells(line: dict) -> dict:
+            return {
+                key: json.dumps(value) if isinstance(value, (list, dict)) else value
+                for key, value in line.items()
+            }
+
+        writer = csv.DictWriter(out, fieldnames=columns)
+        writer.writeheader()
+        writer.writerow({"record": record, **cells(fields)})
+        if first is not None:
+            writer.writerow({"record": row_record, **cells(first)})
+        for row in rows:
+            writer.writerow({"record": row_record, **cells(row)})
+    elif fmt == "ndjson":
+        out.write(json.dumps({"record": record, **fields}) + "\n")
+        for row in rows:
+            out.write(json.dumps({"record": row_record, **row}) + "\n")
+    else:
+        # The fields' object, left open for the rows
+        out.write(json.dumps(fields)[:-1] + (", " if fields else ""))
+        out.write(json.dumps(rows_key) + ": [")
+        for n, row in enumerate(rows):
+            out.write((", " if n else "") + json.dumps(row))
+        out.write("]}\n")
+
+
+def parse_day_range(text: str) -> tuple:
+    """argparse type for "FIRST-LAST" day ranges; a single day also works"""
+    import argparse
+
+    first, dash, last = text.partition("-")
+    try:
+        first = int(first)
+        last = int(last) if dash else first
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid day range: {text!r}")
+    if first < 1 or last < first:
+        raise argparse.ArgumentTypeError(f"invalid day range: {text!r}")
+    return first, last
+
+
 def main():
+    import argparse
+
+    global console
+
     parser = argparse.ArgumentParser(description="C++ Study Progress Tracker")
     parser.add_argument(
         "--done", action="store_true", help="Mark next uncompleted day as done"
@@ -600,15 +3644,63 @@ def main():
         "--week-summary", action="store_true", help="Show current week summary"
     )
     parser.add_argument("--jump-to", type=int, help="Jump to specific day number")
+    parser.add_argument(
+        "--done-range",
+        type=parse_day_range,
+        metavar="FIRST-LAST",
+        help="Mark every day in a range as done",
+    )
+    parser.add_argument(
+        "--undo-range",
+        type=parse_day_range,
+        metavar="FIRST-LAST",
+        help="Uncheck every day in a range",
+    )
     parser.add_argument("--stats", action="store_true", help="Show overall statistics")
+    parser.add_argument(
+        "--detailed",
+        action="store_true",
+        help="With --stats, add rolling session counts, weekdays and velocity",
+    )
     parser.add_argument("--undo", action="store_true", help="Undo last completed day")
     parser.add_argument(
         "--backup", action="store_true", help="Create backup of markdown file"
     )
+    parser.add_argument(
+        "--compact",
+        type=int,
+        nargs="?",
+        const=_HISTORY_RETENTION_DAYS,
+        metavar="DAYS",
+        help="Roll history older than DAYS (default 90) into daily totals",
+    )
+    parser.add_argument(
+        "--plan",
+        default="cpp-quant-study-plan.md",
+        help="Study plan markdown file, or a directory of plan files",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["json", "sqlite"],
+        help="Where progress is kept: JSON files or an SQLite database "
+        "(the database once it exists, JSON otherwise)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "csv", "ndjson"],
+        help="Print --status, --next, --week-summary or --stats as data",
+    )
+    parser.add_argument(
+        "--plain",
+        action="store_true",
+        help="Print plain text without rich formatting (faster to start)",
+    )
 
     args = parser.parse_args()
+    if args.plain:
+        console = PlainConsole()
 
-    tracker = StudyTracker()
+    tracker = StudyTracker(args.plan, storage=args.storage)
 
     # Handle commands
     if args.done:
@@ -628,21 +3720,57 @@ def main():
             console.print("[red]No action to undo[/red]")
 
     elif args.next:
-        tracker.show_next()
+        if args.format:
+            tracker.write_report("next", args.format)
+        else:
+            tracker.show_next()
 
     elif args.week_summary:
-        tracker.show_week_summary()
+        if args.format:
+            tracker.write_report("week_summary", args.format)
+        else:
+            tracker.show_week_summary()
 
     elif args.jump_to:
         tracker.jump_to_day(args.jump_to)
 
+    elif args.done_range:
+        first, last = args.done_range
+        completed = tracker.complete_day_range(first, last)
+        if completed:
+            console.print(f"[green]✅ Days {first}-{last} marked as complete![/green]\n")
+            tracker.show_status()
+        elif completed is not None:
+            console.print(
+                "[yellow]No changes needed - every day in the range is complete[/yellow]"
+            )
+
+    elif args.undo_range:
+        first, last = args.undo_range
+        undone = tracker.undo_day_range(first, last)
+        if undone:
+            console.print(f"[green]✅ Days {first}-{last} unchecked![/green]\n")
+            tracker.show_status()
+        elif undone is not None:
+            console.print("[red]No completed days in that range[/red]")
+
     elif args.stats:
-        tracker.show_stats()
+        if args.format:
+            tracker.write_report("stats", args.format, detailed=args.detailed)
+        else:
+            tracker.show_stats(detailed=args.detailed)
 
     elif args.backup:
         tracker.backup_markdown()
 
-    else:  # Default to status
+    elif args.compact is not None:
+        folded = tracker.compact_history(args.compact)
+        console.print(f"[green]✅ Folded {folded} history events into the snapshot[/green]")
+
+    elif args.format:  # Default to status
+        tracker.write_report("status", args.format)
+
+    else:
         tracker.show_status()
 
 
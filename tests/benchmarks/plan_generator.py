@@ -0,0 +1,62 @@
+"""
+Synthetic study plan generator for the benchmarks
+Builds plans laid out like cpp-quant-study-plan.md at any number of tasks
+"""
+
+# Weekday days have four tasks, weekend days a project with nested subtasks
+_WEEKDAY_TASKS = [
+    "Watch: Topic {n} lecture",
+    "Code: Exercise {n}",
+    "Practice: Drill {n}",
+    "Compare with Python: Note {n}",
+]
+_WEEKEND_TASKS = [
+    "Hour 1: Review week's materials",
+    "Hour 2: {kind}: Build component {n}",
+    "  - [ ] Design component {n}",
+    "  - [ ] Test component {n}",
+]
+
+
+def generate_plan(tasks, completed_fraction=0.1, weeks_per_phase=8):
+    """Return markdown with exactly ``tasks`` checkboxes
+
+    Phases hold ``weeks_per_phase`` weeks of seven days; the last two days
+    of each week are two-hour weekend days whose project alternates between
+    mini and major projects. The first ``completed_fraction`` of the days are
+    checked, so the current day sits inside the plan.
+    """
+    # Every day holds four tasks
+    completed_days = int(-(-tasks // 4) * completed_fraction)
+
+    out = ["# Synthetic Study Plan\n", "## 6-Month Study Plan for Benchmarks\n\n", "---\n\n"]
+    remaining = tasks
+    day = 0
+    week = 0
+    while remaining > 0:
+        if week % weeks_per_phase == 0:
+            phase = week // weeks_per_phase + 1
+            out.append(f"## 📅 PHASE {phase}: SYNTHETIC TOPICS (Weeks {week + 1}-{week + weeks_per_phase})\n\n")
+        week += 1
+        out.append(f"### Week {week}: Generated Topics\n")
+        out.append("**Goal**: Exercise the tracker at scale\n\n")
+        for weekday in range(7):
+            if remaining <= 0:
+                break
+            day += 1
+            weekend = weekday >= 5
+            hours = "2 hours - Weekend" if weekend else "1 hour - Weekday"
+            out.append(f"#### Day {day} ({hours})\n")
+            mark = "x" if day <= completed_days else " "
+            kind = "Mini Project" if week % 2 else "Project"
+            for template in _WEEKEND_TASKS if weekend else _WEEKDAY_TASKS:
+                if remaining <= 0:
+                    break
+                task = template.format(n=day, kind=kind)
+                if task.startswith(" "):
+                    out.append(task.replace("[ ]", f"[{mark}]") + "\n")
+                else:
+                    out.append(f"- [{mark}] {task}\n")
+                remaining -= 1
+            out.append("\n")
+    return "".join(out)
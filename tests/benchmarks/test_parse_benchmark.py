@@ -0,0 +1,134 @@
+"""
+Benchmark for StudyTracker.parse_markdown
+Compares the single-pass line classifier against the previous
+substring-cascade parser on a synthetic 100k-line plan.
+
+Run with: pytest tests/benchmarks -m slow -s
+"""
+
+import pytest
+import gc
+import os
+import re
+import tempfile
+import shutil
+import time
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, parse_plan_lines
+from tests.benchmarks.plan_generator import generate_plan
+
+# Tasks in the benchmark plan, which comes to about 100k lines
+PLAN_TASKS = 62_500
+
+
+def legacy_parse(lines):
+    """Reference copy of the parser this benchmark measures against"""
+    checkboxes = []
+    current_week = 0
+    current_phase = ""
+    current_day = 0
+
+    for i, line in enumerate(lines):
+        if "### Week" in line:
+            week_match = re.search(r"Week (\d+)", line)
+            if week_match:
+                current_week = int(week_match.group(1))
+
+        if "## 📅 PHASE" in line:
+            current_phase = line.strip()
+
+        if line.startswith("#### Day"):
+            day_match = re.search(r"Day (\d+)", line)
+            if day_match:
+                current_day = int(day_match.group(1))
+
+        if "- [ ]" in line or "- [x]" in line or "- [X]" in line:
+            if current_day > 0:
+                checkboxes.append(
+                    {
+                        "line_index": i,
+                        "day": current_day,
+                        "week": current_week,
+                        "phase": current_phase,
+                        "checked": "- [x]" in line.lower(),
+                        "content": line.strip(),
+                        "full_line": line,
+                    }
+                )
+    return checkboxes
+
+
+def best_of(*funcs, repeat=3):
+    """Return the fastest wall-clock time of each function over several runs
+
+    The functions take turns, so a busy spell on the machine slows all of
+    them rather than whichever happened to be running. As in timeit, the
+    garbage collector is off while they run; it collects between rounds.
+    """
+    timings = [[] for _ in funcs]
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            for func, times in zip(funcs, timings):
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return [min(times) for times in timings]
+
+
+@pytest.mark.slow
+class TestParseBenchmark:
+    """Parse speed on a 100k-line synthetic plan"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def large_tracker(self, temp_dir):
+        """Tracker over a synthetic 100k-line plan"""
+        markdown_file = os.path.join(temp_dir, "synthetic_plan.md")
+        progress_file = os.path.join(temp_dir, ".synthetic_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(generate_plan(PLAN_TASKS))
+
+        return StudyTracker(markdown_file, progress_file)
+
+    def test_tokenizer_matches_legacy_parser(self, large_tracker):
+        """Both parsers must produce identical checkbox records"""
+        large_tracker.parse_markdown()
+        expected = legacy_parse(large_tracker.markdown_content)
+
+        assert len(large_tracker.checkboxes) == len(expected)
+        for cb, legacy in zip(large_tracker.checkboxes, expected):
+            assert {key: cb[key] for key in legacy} == legacy
+
+    def test_tokenizer_speedup(self, large_tracker):
+        """Report the single-pass classifier against the substring cascade
+
+        The gain is 10-15%, well within timing noise on a busy machine, so
+        the ratio is printed and only a gross slowdown fails the test.
+        """
+        large_tracker.parse_markdown()
+        lines = large_tracker.markdown_content
+
+        legacy, current = best_of(
+            lambda: legacy_parse(lines), lambda: parse_plan_lines(lines), repeat=21
+        )
+
+        print(
+            f"\nparse on {len(lines)} lines: "
+            f"legacy {legacy * 1000:.1f} ms, current {current * 1000:.1f} ms "
+            f"({legacy / current:.2f}x)"
+        )
+        assert current < 2 * legacy
@@ -0,0 +1,96 @@
+"""
+Startup benchmark for the study tracker CLI
+Runs fresh interpreters under python -X importtime, checks which modules a
+plain status command pulls in and times the import of study_tracker.
+
+Run the timing with: pytest tests/benchmarks -m slow -s
+"""
+
+import pytest
+import os
+import py_compile
+import subprocess
+import tempfile
+import shutil
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules only some commands need; importing study_tracker must not load them
+DEFERRED_MODULES = {
+    "argparse",
+    "concurrent.futures",
+    "numpy",
+    "random",
+    "rich",
+    "shutil",
+    "sqlite3",
+}
+
+# Cumulative import time of study_tracker allowed by the slow benchmark
+IMPORT_BUDGET_US = 60_000
+
+
+def import_times(code, cwd=ROOT):
+    """Run code in a fresh interpreter and parse its -X importtime report
+
+    Returns ({module: cumulative microseconds}, stdout).
+    """
+    code = f"import sys; sys.path.insert(0, {ROOT!r}); {code}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times, result.stdout
+
+
+class TestStartup:
+    """Test what a cold start imports"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    def test_import_defers_optional_modules(self):
+        """Importing the module loads none of the command-specific modules"""
+        times, _ = import_times("import study_tracker")
+        assert "study_tracker" in times
+        assert not DEFERRED_MODULES & times.keys()
+
+    def test_plain_status_skips_rich(self, temp_dir, sample_markdown):
+        """`--status --plain` prints text without importing rich"""
+        with open(os.path.join(temp_dir, "plan.md"), "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        times, output = import_times(
+            "import study_tracker; "
+            "sys.argv = ['study', '--status', '--plain', '--plan', 'plan.md']; "
+            "study_tracker.main()",
+            cwd=temp_dir,
+        )
+        assert not {"rich", "numpy", "sqlite3"} & times.keys()
+        assert "📊 Study Progress" in output
+        assert "Current: Day 1/" in output
+        assert "[bold cyan]" not in output
+
+    @pytest.mark.slow
+    def test_import_time(self):
+        """Cumulative import time of study_tracker stays within budget"""
+        # An installed script loads cached bytecode; don't time a recompile
+        # when the environment disables writing it
+        py_compile.compile(os.path.join(ROOT, "study_tracker.py"))
+        best = min(import_times("import study_tracker")[0]["study_tracker"] for _ in range(5))
+        print(f"\nstudy_tracker import: {best / 1000:.1f} ms")
+        assert best < IMPORT_BUDGET_US
@@ -0,0 +1,120 @@
+"""
+Benchmarks for the StudyTracker commands
+Times parsing, marking, jumping, undo and the status views on synthetic
+plans of 1k to 1M tasks and writes the timings as JSON for comparing runs.
+
+Run with: pytest tests/benchmarks -m slow -s
+Results go to benchmark_results.json, or STUDY_TRACKER_BENCHMARK_JSON if set.
+"""
+
+import pytest
+import json
+import os
+import platform
+import tempfile
+import shutil
+import time
+from datetime import datetime
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+from study_tracker import StudyTracker
+from tests.benchmarks.plan_generator import generate_plan
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_FILE = os.environ.get(
+    "STUDY_TRACKER_BENCHMARK_JSON", os.path.join(ROOT, "benchmark_results.json")
+)
+
+
+def timed(func, repeat=1):
+    """Return the result of func and its fastest wall-clock time"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+@pytest.fixture(scope="module")
+def benchmark_results():
+    """Collect timings from every size and write them out once"""
+    results = {}
+    yield results
+    if not results:
+        return
+    report = {
+        "created": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nbenchmark results written to {RESULTS_FILE}")
+
+
+@pytest.mark.slow
+class TestTrackerBenchmark:
+    """Command timings on synthetic plans of increasing size"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.mark.parametrize("tasks", SIZES)
+    def test_command_timings(self, temp_dir, benchmark_results, tasks):
+        """Each command runs on a fresh tracker, as one CLI invocation would"""
+        markdown_file = os.path.join(temp_dir, "synthetic_plan.md")
+        progress_file = os.path.join(temp_dir, ".synthetic_progress.json")
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(generate_plan(tasks))
+
+        def command(name, *args, repeat=1):
+            def run():
+                tracker = StudyTracker(markdown_file, progress_file)
+                if name == "mark_day_complete":
+                    tracker.parse_markdown()  # as main() does for --done
+                return getattr(tracker, name)(*args)
+
+            return timed(run, repeat)
+
+        timings = {}
+        with patch("study_tracker.console.print"):
+            _, timings["parse_markdown_cold"] = command("parse_markdown")
+            _, timings["parse_markdown"] = command("parse_markdown", repeat=3)
+
+            tracker = StudyTracker(markdown_file, progress_file)
+            tracker.parse_markdown()
+            day = tracker.get_current_day()
+            assert len(tracker.checkboxes) == tasks
+
+            done, timings["mark_day_complete"] = command("mark_day_complete")
+            undone, timings["undo_last_action"] = command("undo_last_action")
+            assert done and undone
+
+            _, timings["jump_to_day"] = command("jump_to_day", day + 7)
+            _, timings["show_status"] = command("show_status", repeat=3)
+            _, timings["show_stats"] = command("show_stats", repeat=3)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        assert tracker.get_current_day() == day + 7
+
+        benchmark_results[str(tasks)] = {
+            "tasks": tasks,
+            "plan_bytes": os.path.getsize(markdown_file),
+            "seconds": timings,
+        }
+        print(
+            f"\n{tasks} tasks: "
+            + ", ".join(f"{name} {t * 1000:.1f} ms" for name, t in timings.items())
+        )
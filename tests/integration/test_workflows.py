@@ -9,6 +9,7 @@ import os
 import tempfile
 import shutil
 import copy
+import multiprocessing
 from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -19,6 +20,14 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspa
 from study_tracker import StudyTracker
 
 
+def complete_day_in_process(markdown_file, progress_file, day, start):
+    """Mark one day from a separate process, once every process is ready"""
+    tracker = StudyTracker(markdown_file, progress_file)
+    tracker.parse_markdown()
+    start.wait()
+    tracker.mark_day_complete(day)
+
+
 class TestWorkflowIntegration:
     """Test complete user workflows and data consistency"""
 
@@ -329,6 +338,33 @@ class TestWorkflowIntegration:
         success = tracker.mark_day_complete(999)
         assert success == True
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="advisory locks need fcntl")
+    def test_concurrent_writers_keep_every_change(self, tracker):
+        """Processes marking days at the same time never lose a write"""
+        context = multiprocessing.get_context("fork")
+        start = context.Event()
+        days = [1, 2, 3, 4, 5, 6]
+        processes = [
+            context.Process(
+                target=complete_day_in_process,
+                args=(tracker.markdown_file, tracker.progress_file, day, start),
+            )
+            for day in days
+        ]
+        for process in processes:
+            process.start()
+        start.set()
+        for process in processes:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        reloaded.parse_markdown()
+        assert sorted(reloaded.progress_data["completed_days"]) == days
+        assert len(reloaded.progress_data["history"]) == len(days)
+        assert reloaded.progress_data["version"] == len(days)
+        assert reloaded.get_current_day() == 7
+
     def test_large_session_workflow(self, tracker):
         """Test workflow with extended study session"""
         tracker.parse_markdown()
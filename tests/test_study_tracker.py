@@ -261,7 +261,7 @@ class TestStudyTracker:
         tracker.parse_markdown()
 
         # Jump to day 4 (should mark days 1, 2, 3 as complete if not already)
-        with patch("study_tracker.Console.print"):  # Mock console output
+        with patch("study_tracker.console.print"):  # Mock console output
             tracker.jump_to_day(4)
 
         # Check that earlier days are marked complete
@@ -276,7 +276,7 @@ class TestStudyTracker:
         """Test jumping to invalid day numbers"""
         tracker.parse_markdown()
 
-        with patch("study_tracker.Console.print") as mock_print:
+        with patch("study_tracker.console.print") as mock_print:
             tracker.jump_to_day(0)  # Too low
             mock_print.assert_called()
 
@@ -374,7 +374,7 @@ class TestCLIFunctionality:
     def test_main_done_argument(self, mock_tracker):
         """Test --done argument"""
         with patch("sys.argv", ["study_tracker.py", "--done"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -385,7 +385,7 @@ class TestCLIFunctionality:
     def test_main_status_argument(self, mock_tracker):
         """Test --status argument"""
         with patch("sys.argv", ["study_tracker.py", "--status"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -395,7 +395,7 @@ class TestCLIFunctionality:
     def test_main_next_argument(self, mock_tracker):
         """Test --next argument"""
         with patch("sys.argv", ["study_tracker.py", "--next"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -405,7 +405,7 @@ class TestCLIFunctionality:
     def test_main_week_summary_argument(self, mock_tracker):
         """Test --week-summary argument"""
         with patch("sys.argv", ["study_tracker.py", "--week-summary"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -415,7 +415,7 @@ class TestCLIFunctionality:
     def test_main_undo_argument(self, mock_tracker):
         """Test --undo argument"""
         with patch("sys.argv", ["study_tracker.py", "--undo"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -425,7 +425,7 @@ class TestCLIFunctionality:
     def test_main_stats_argument(self, mock_tracker):
         """Test --stats argument"""
         with patch("sys.argv", ["study_tracker.py", "--stats"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -435,7 +435,7 @@ class TestCLIFunctionality:
     def test_main_backup_argument(self, mock_tracker):
         """Test --backup argument"""
         with patch("sys.argv", ["study_tracker.py", "--backup"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -445,7 +445,7 @@ class TestCLIFunctionality:
     def test_main_jump_to_argument(self, mock_tracker):
         """Test --jump-to argument"""
         with patch("sys.argv", ["study_tracker.py", "--jump-to", "10"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
@@ -455,7 +455,7 @@ class TestCLIFunctionality:
     def test_main_no_arguments(self, mock_tracker):
         """Test default behavior with no arguments"""
         with patch("sys.argv", ["study_tracker.py"]):
-            with patch("study_tracker.Console"):
+            with patch("study_tracker.console"):
                 from study_tracker import main
 
                 main()
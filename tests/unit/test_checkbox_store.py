@@ -0,0 +1,190 @@
+"""
+Unit tests for the columnar CheckboxStore in study_tracker.py
+Tests the bitset, record views and cache round-trips
+"""
+
+import pytest
+import os
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import CheckboxStore, parse_plan_lines
+
+
+class TestCheckboxStore:
+    """Test the array-backed checkbox index"""
+
+    @pytest.fixture
+    def sample_lines(self):
+        """Plan lines spanning two phases and ten checkboxes"""
+        text = """## 📅 PHASE 1: FUNDAMENTALS
+### Week 1
+#### Day 1 (1 hour)
+- [x] Task 1
+- [x] Task 2
+- [x] Task 3
+#### Day 2 (1 hour)
+- [x] Task 4
+- [x] Task 5
+- [x] Task 6
+- [x] Task 7
+- [x] Task 8
+## 📅 PHASE 2: ADVANCED
+### Week 2
+#### Day 3 (1 hour)
+- [ ] Task 9
+- [X] Mini Project: Task 10
+"""
+        return text.splitlines(keepends=True)
+
+    @pytest.fixture
+    def store(self, sample_lines):
+        return parse_plan_lines(sample_lines)
+
+    def test_columns(self, store):
+        """Numeric fields are stored column by column"""
+        assert len(store) == 10
+        assert list(store.day) == [1, 1, 1, 2, 2, 2, 2, 2, 3, 3]
+        assert list(store.week) == [1] * 8 + [2] * 2
+        assert list(store.line_index) == [3, 4, 5, 7, 8, 9, 10, 11, 15, 16]
+
+    def test_phases_are_interned(self, store):
+        """Each phase header is stored once and referenced by id"""
+        assert store.phases == [
+            "",
+            "## 📅 PHASE 1: FUNDAMENTALS",
+            "## 📅 PHASE 2: ADVANCED",
+        ]
+        assert list(store.phase_id) == [1] * 8 + [2] * 2
+
+    def test_checked_bitset(self, store):
+        """The checked state is packed eight boxes per byte"""
+        assert len(store.checked) == 2
+        assert store.count_checked() == 9
+        assert store.first_unchecked() == 8
+
+        store.set_checked(8, True)
+        assert store.count_checked() == 10
+        assert store.first_unchecked() == len(store)
+
+        store.set_checked(3, False)
+        assert store.is_checked(3) == False
+        assert store.first_unchecked() == 3
+
+    def test_record_view(self, store):
+        """Records read like the old checkbox dicts"""
+        record = store[-1]
+        assert record["day"] == 3
+        assert record["week"] == 2
+        assert record["checked"] == True
+        assert record["phase"] == "## 📅 PHASE 2: ADVANCED"
+        assert record["content"] == "- [X] Mini Project: Task 10"
+        assert record["full_line"] == "- [X] Mini Project: Task 10\n"
+        assert record["offset"] is None
+        assert set(record) == set(record.FIELDS)
+
+    def test_record_view_is_read_only(self, store):
+        """State changes go through the store, not the views"""
+        with pytest.raises(TypeError):
+            store[0]["checked"] = False
+
+    def test_indexing(self, store):
+        """Stores support len, slicing and bounds checks like a list"""
+        assert [cb["day"] for cb in store[7:9]] == [2, 3]
+        with pytest.raises(IndexError):
+            store[10]
+
+    def test_content_loaded_lazily(self, sample_lines):
+        """Line text is not touched until a record's content is read"""
+        calls = []
+        store = parse_plan_lines(sample_lines)
+        store.set_full_lines_loader(lambda: calls.append(1) or list(sample_lines))
+
+        assert store[0]["day"] == 1
+        assert calls == []
+        store[0]["content"]
+        store[1]["content"]
+        assert calls == [1]
+
+    def test_cache_round_trip(self, store):
+        """Stores survive serialisation to the parse cache"""
+        restored = CheckboxStore.from_cache(store.to_cache())
+
+        assert list(restored) == list(store)
+        assert restored.checked == store.checked
+        assert restored.phases == store.phases
+
+    def test_range_index(self, store):
+        """Days, weeks and phases map to runs of consecutive checkboxes"""
+        assert store.day_runs == {1: [(0, 3)], 2: [(3, 8)], 3: [(8, 10)]}
+        assert store.week_runs == {1: [(0, 8)], 2: [(8, 10)]}
+        assert store.phase_runs == {1: [(0, 8)], 2: [(8, 10)]}
+        assert store.day_indices(2) == [3, 4, 5, 6, 7]
+        assert store.week_indices(2) == [8, 9]
+        assert store.first_index_of_day(3) == 8
+        assert store.first_index_of_day(99) is None
+        assert store.day_indices(99) == []
+
+    def test_range_index_split_day(self):
+        """A day header that appears twice yields two runs"""
+        lines = """### Week 1
+#### Day 1
+- [ ] A
+#### Day 2
+- [ ] B
+#### Day 1
+- [ ] C
+""".splitlines(keepends=True)
+        store = parse_plan_lines(lines)
+
+        assert store.day_runs == {1: [(0, 1), (2, 3)], 2: [(1, 2)]}
+        assert store.day_indices(1) == [0, 2]
+        assert store.week_runs == {1: [(0, 3)]}
+
+    def test_first_unchecked_pointer(self, store):
+        """The next-unchecked pointer follows marks and unmarks"""
+        store.set_checked(8, True)
+        assert store.first_unchecked() == 10
+        store.set_checked(5, False)
+        store.set_checked(2, False)
+        assert store.first_unchecked() == 2
+        store.set_checked(2, True)
+        assert store.first_unchecked() == 5
+
+    def test_range_index_cache_round_trip(self, store):
+        """The range index is rebuilt from the parse cache"""
+        restored = CheckboxStore.from_cache(store.to_cache())
+
+        assert restored.day_runs == store.day_runs
+        assert restored.week_runs == store.week_runs
+        assert restored.phase_runs == store.phase_runs
+        assert restored.first_unchecked() == store.first_unchecked()
+
+    def test_week_and_phase_masks(self, store):
+        """Masks select a week's or phase's boxes for popcount counting"""
+        assert store.week_mask(1) == (0, 0b11111111)
+        assert store.week_mask(2) == (8, 0b11)
+        assert store.phase_mask(2) == (8, 0b11)
+        assert store.week_mask(99) == (0, 0)
+
+        assert store.count_in(store.week_mask(1)) == 8
+        assert store.count_in(store.phase_mask(2)) == 1
+        assert store.count_in(store.week_mask(99)) == 0
+
+    def test_masks_follow_marks_and_undo(self, store):
+        """Counts reflect set_checked without rebuilding any mask"""
+        mask = store.week_mask(2)
+        store.set_checked(8, True)
+        assert store.count_in(mask) == 2
+        store.set_checked(9, False)
+        store.set_checked(8, False)
+        assert store.count_in(mask) == 0
+        assert store.week_mask(2) is mask
+
+    def test_mask_where(self, store):
+        """Line predicates become cached masks"""
+        mask = store.mask_where("mini", lambda line: "Mini Project:" in line)
+        assert mask == (9, 1)
+        assert store.mask_where("mini", lambda line: True) is mask
+        assert store.count_in(mask) == 1
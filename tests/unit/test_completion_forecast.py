@@ -0,0 +1,133 @@
+"""
+Unit tests for the Monte Carlo completion forecast in study_tracker.py
+Tests gap sampling, the simulated percentiles and the version-keyed cache
+"""
+
+import pytest
+import io
+import os
+import tempfile
+import shutil
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import sys
+
+from rich.console import Console
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import study_tracker
+from study_tracker import StreakRuns, StudyTracker, forecast_offsets
+
+
+@pytest.fixture(params=["numpy", "lists"])
+def backend(request):
+    """Run each simulation test with NumPy and with random.choices"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        yield request.param
+    else:
+        with patch("study_tracker.np", None):
+            yield request.param
+
+
+class TestForecastOffsets:
+    """Test the simulated trajectories"""
+
+    def test_gap_counts(self):
+        """Gaps inside runs are one day, gaps between runs are measured"""
+        runs = StreakRuns([[10, 12], [15, 15], [20, 21]])
+        assert runs.gap_counts() == {1: 3, 3: 1, 5: 1}
+        assert StreakRuns([[4, 4]]).gap_counts() == {}
+
+    def test_constant_gap(self, backend):
+        """With one gap every trajectory finishes on the same day"""
+        assert forecast_offsets({2: 9}, 30, trials=200) == [60, 60, 60]
+        assert forecast_offsets({2: 9}, 0, trials=200) == [0, 0, 0]
+
+    def test_percentiles_bracket_the_mean(self, backend):
+        """P10 <= P50 <= P90, around remaining days times the mean gap"""
+        gaps = {1: 6, 2: 3, 7: 1}
+        mean_gap = (6 * 1 + 3 * 2 + 1 * 7) / 10
+        p10, p50, p90 = forecast_offsets(gaps, 100)
+
+        assert 100 <= p10 < p50 < p90 <= 700
+        assert p50 == pytest.approx(100 * mean_gap, rel=0.05)
+
+    def test_seeded(self, backend):
+        """The same gaps and seed give the same dates"""
+        gaps = {1: 5, 3: 2, 10: 1}
+        assert forecast_offsets(gaps, 50, seed=3) == forecast_offsets(gaps, 50, seed=3)
+
+
+class TestForecastCompletion:
+    """Test forecasting from the tracker's progress"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def tracker(self, temp_dir):
+        """Create a StudyTracker with ten days left and a study gap pattern"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write("# Test Study Plan\n\n### Week 1\n")
+            for day in range(1, 13):
+                mark = "x" if day <= 2 else " "
+                f.write(f"#### Day {day} (1 hour)\n- [{mark}] Task {day}\n\n")
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        today = datetime.now().date().toordinal()
+        tracker.progress_data["streak_index"] = {
+            "runs": [[today - 6, today - 6], [today - 2, today - 2]],
+            "events": 0,
+        }
+        return tracker
+
+    def test_dates_from_streak_gaps(self, tracker):
+        """Ten days left at a four-day gap finish forty days from today"""
+        today = datetime.now().date().toordinal()
+        assert tracker.forecast_completion() == [today + 40] * 3
+
+    def test_cached_until_version_changes(self, tracker):
+        """A second call reads the cache; a new version simulates again"""
+        first = tracker.forecast_completion()
+        assert os.path.exists(tracker.forecast_file)
+
+        with patch("study_tracker.forecast_offsets") as mock_forecast:
+            assert tracker.forecast_completion() == first
+            mock_forecast.assert_not_called()
+
+            mock_forecast.return_value = [1, 2, 3]
+            tracker.progress_data["version"] = 7
+            today = datetime.now().date().toordinal()
+            assert tracker.forecast_completion() == [today + 1, today + 2, today + 3]
+            mock_forecast.assert_called_once()
+
+    def test_corrupt_cache_is_ignored(self, tracker):
+        """An unreadable cache file is recomputed and replaced"""
+        with open(tracker.forecast_file, "w") as f:
+            f.write("{not json")
+        assert tracker.forecast_completion() is not None
+
+    def test_no_gaps_yet(self, tracker):
+        """A single study date gives no forecast"""
+        tracker.progress_data["streak_index"]["runs"] = [[738000, 738000]]
+        assert tracker.forecast_completion() is None
+
+    def test_stats_show_percentiles(self, tracker):
+        """--stats reports the median with the P10 and P90 dates"""
+        capture = Console(file=io.StringIO(), width=200)
+        with patch.object(study_tracker, "console", capture):
+            tracker.show_stats()
+        text = capture.file.getvalue()
+
+        median = (datetime.now() + timedelta(days=40)).strftime("%B %d, %Y")
+        assert f"Estimated Completion: {median} (P10 {median}, P90 {median})" in text
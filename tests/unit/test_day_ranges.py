@@ -0,0 +1,217 @@
+"""
+Unit tests for range completion in study_tracker.py
+Tests grouped history entries, single writes, grouped undo and the CLI flags
+"""
+
+import pytest
+import argparse
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, day_ranges, expand_day_ranges, parse_day_range, main
+
+
+class TestDayRanges:
+    """Test toggling a range of days as one action"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown with several tasks per day"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [x] Task 1
+- [ ] Task 2
+
+#### Day 2 (1 hour)
+- [x] Task 3
+- [x] Task 4
+
+#### Day 3 (1 hour)
+- [ ] Task 5
+  - [ ] Nested task 6
+
+#### Day 4 (1 hour)
+- [ ] Task 7
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with a parsed plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def read(self, tracker):
+        with open(tracker.markdown_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_range_helpers(self):
+        """Days compress to runs and expand back"""
+        assert day_ranges([3, 1, 2, 7, 2]) == [[1, 3], [7, 7]]
+        assert day_ranges([]) == []
+        assert expand_day_ranges([[1, 3], [7, 7]]) == [1, 2, 3, 7]
+
+    def test_complete_range_writes_once(self, tracker):
+        """Every box is checked and both files share one commit"""
+        with patch.object(
+            tracker.journal, "commit", wraps=tracker.journal.commit
+        ) as mock_commit, patch.object(
+            tracker.storage, "save", wraps=tracker.storage.save
+        ) as mock_save:
+            # Day 2 is already done, so only days 1 and 3 change
+            assert tracker.complete_day_range(1, 3) == 2
+            mock_commit.assert_called_once()
+            mock_save.assert_called_once()
+
+        content = self.read(tracker)
+        assert content.count("[x]") == 6
+        assert "- [ ] Task 7" in content
+        progress = tracker.progress_data
+        assert sorted(progress["completed_days"]) == [1, 3]
+        assert progress["stats"]["total_study_sessions"] == 2
+        assert len(progress["history"]) == 1
+        assert progress["history"][0]["action"] == "complete"
+        assert progress["history"][0]["days"] == [[1, 1], [3, 3]]
+        assert progress["stats"]["current_streak"] == 1
+
+    def test_complete_range_nothing_to_do(self, tracker):
+        """A range that is already checked records nothing"""
+        assert tracker.complete_day_range(2, 2) == 0
+        assert tracker.progress_data["history"] == []
+        assert not os.path.exists(tracker.progress_file)
+
+    def test_range_bounded_by_plan(self, tracker):
+        """Ranges stop at the last day; ranges past it are rejected"""
+        with patch.object(tracker, "set_days", wraps=tracker.set_days) as mock_set:
+            assert tracker.complete_day_range(3, 20000000) == 2
+        assert list(mock_set.call_args.args[0]) == [3, 4]
+
+        with patch("study_tracker.console.print") as mock_print:
+            assert tracker.complete_day_range(5, 20000000) is None
+            assert tracker.undo_day_range(5, 9) is None
+        mock_print.assert_called_with(
+            "[red]Invalid day range. Must start between 1 and 4[/red]"
+        )
+        assert tracker.progress_data["history"][-1]["days"] == [[3, 4]]
+
+    def test_undo_range(self, tracker):
+        """Unchecking a range clears its boxes and completed days"""
+        tracker.complete_day_range(1, 4)
+        assert tracker.undo_day_range(2, 3) == 2
+
+        content = self.read(tracker)
+        assert "- [x] Task 2\n\n#### Day 2 (1 hour)\n- [ ] Task 3\n- [ ] Task 4" in content
+        assert "- [ ] Nested task 6" in content
+        assert "- [x] Task 7" in content
+        assert sorted(tracker.progress_data["completed_days"]) == [1, 4]
+        assert tracker.progress_data["history"][-1]["days"] == [[2, 3]]
+
+    def test_undo_last_reverts_whole_group(self, tracker):
+        """undo_last_action reverts every day of a grouped entry"""
+        tracker.complete_day_range(3, 4)
+        assert tracker.undo_last_action() == True
+
+        content = self.read(tracker)
+        assert "- [ ] Task 5\n  - [ ] Nested task 6" in content
+        assert "- [ ] Task 7" in content
+        assert tracker.progress_data["completed_days"] == []
+        entry = tracker.progress_data["history"][-1]
+        assert entry["action"] == "undo"
+        assert entry["days"] == [[3, 4]]
+        assert "day" not in entry
+
+    def test_jump_records_one_group(self, tracker):
+        """A jump is one grouped entry that a single undo reverts"""
+        with patch("study_tracker.console.print"), patch.object(tracker, "show_status"):
+            tracker.jump_to_day(4)
+
+        history = tracker.progress_data["history"]
+        assert len(history) == 1
+        assert history[0]["days"] == [[1, 1], [3, 3]]
+        assert tracker.progress_data["stats"]["total_study_sessions"] == 2
+
+        with patch.object(
+            tracker.journal, "commit", wraps=tracker.journal.commit
+        ) as mock_commit:
+            assert tracker.undo_last_action() == True
+            mock_commit.assert_called_once()
+
+        content = self.read(tracker)
+        assert "- [ ] Task 1\n- [ ] Task 2" in content
+        assert "- [ ] Task 5\n  - [ ] Nested task 6" in content
+        assert tracker.get_current_day() == 1
+
+    def test_grouped_entry_round_trips(self, tracker):
+        """Grouped entries reload from the events log and the database"""
+        tracker.complete_day_range(1, 3)
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        assert reloaded.progress_data["history"] == tracker.progress_data["history"]
+
+        sqlite = StudyTracker(tracker.markdown_file, tracker.progress_file, storage="sqlite")
+        sqlite.parse_markdown()
+        sqlite.undo_day_range(1, 1)
+        reopened = StudyTracker(tracker.markdown_file, tracker.progress_file, storage="sqlite")
+        assert reopened.progress_data["history"] == sqlite.progress_data["history"]
+        assert reopened.progress_data["history"][-1]["days"] == [[1, 1]]
+
+    def test_parse_day_range(self):
+        """Ranges are FIRST-LAST or a single day"""
+        assert parse_day_range("10-40") == (10, 40)
+        assert parse_day_range("7") == (7, 7)
+        for text in ("40-10", "0-3", "a-b", "1-"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_day_range(text)
+
+    def test_range_commands(self, tracker):
+        """--done-range and --undo-range call the tracker methods"""
+        with patch(
+            "sys.argv",
+            ["study_tracker.py", "--plan", tracker.markdown_file, "--done-range", "10-40"],
+        ), patch("study_tracker.StudyTracker") as mock_tracker, patch(
+            "study_tracker.console.print"
+        ):
+            main()
+        mock_tracker.return_value.complete_day_range.assert_called_once_with(10, 40)
+        mock_tracker.return_value.show_status.assert_called_once()
+
+        with patch(
+            "sys.argv",
+            ["study_tracker.py", "--plan", tracker.markdown_file, "--undo-range", "3-4"],
+        ), patch("study_tracker.StudyTracker") as mock_tracker, patch(
+            "study_tracker.console.print"
+        ) as mock_print:
+            mock_tracker.return_value.undo_day_range.return_value = 0
+            main()
+        mock_tracker.return_value.undo_day_range.assert_called_once_with(3, 4)
+        mock_print.assert_called_with("[red]No completed days in that range[/red]")
+
+        with patch(
+            "sys.argv",
+            ["study_tracker.py", "--plan", tracker.markdown_file, "--done-range", "9-12"],
+        ), patch("study_tracker.console.print") as mock_print:
+            main()
+        mock_print.assert_called_once_with(
+            "[red]Invalid day range. Must start between 1 and 4[/red]"
+        )
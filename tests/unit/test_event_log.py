@@ -0,0 +1,197 @@
+"""
+Unit tests for the append-only history log in study_tracker.py
+Tests the snapshot/events split, appends, legacy migration and compaction
+"""
+
+import pytest
+import json
+import os
+import tempfile
+import shutil
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, main, migrate_history
+
+
+class TestEventLog:
+    """Test keeping history in .study_events.jsonl"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+
+#### Day 2 (1 hour)
+- [ ] Task 2
+
+#### Day 3 (1 hour)
+- [ ] Task 3
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with a parsed plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def read_events(self, tracker):
+        with open(tracker.events_file, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_events_written_beside_snapshot(self, tracker):
+        """History goes to the events log, everything else to the snapshot"""
+        assert tracker.mark_day_complete(1) == True
+
+        assert tracker.events_file == os.path.join(
+            os.path.dirname(tracker.progress_file), ".study_events.jsonl"
+        )
+        with open(tracker.progress_file) as f:
+            snapshot = json.load(f)
+        assert "history" not in snapshot
+        assert snapshot["completed_days"] == [1]
+        assert [entry["day"] for entry in self.read_events(tracker)] == [1]
+
+    def test_each_action_appends_one_line(self, tracker):
+        """Earlier log content is never rewritten"""
+        tracker.mark_day_complete(1)
+        with open(tracker.events_file, "rb") as f:
+            before = f.read()
+
+        tracker.mark_day_complete(2)
+        tracker.undo_last_action()
+
+        with open(tracker.events_file, "rb") as f:
+            after = f.read()
+        assert after.startswith(before)
+        assert after[len(before) :].count(b"\n") == 2
+
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        assert reloaded.progress_data["history"] == tracker.progress_data["history"]
+        assert [e["action"] for e in reloaded.progress_data["history"]] == [
+            "complete",
+            "complete",
+            "undo",
+        ]
+
+    def test_saves_in_one_batch_do_not_repeat_entries(self, tracker):
+        """Appends staged twice before a commit are written once"""
+        with tracker.journal.batch():
+            tracker.mark_day_complete(1)
+            tracker.mark_day_complete(2)
+
+        assert [entry["day"] for entry in self.read_events(tracker)] == [1, 2]
+
+    def test_writes_do_not_read_log(self, tracker):
+        """Marks, ranges and streaks on a fresh tracker only append"""
+        tracker.mark_day_complete(1)
+
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        reloaded.parse_markdown()
+        with patch.object(
+            reloaded.storage, "load_events", side_effect=AssertionError("log read")
+        ):
+            assert reloaded.mark_day_complete(2) == True
+            assert reloaded.complete_day_range(3, 3) == 1
+
+        assert reloaded.progress_data["stats"]["current_streak"] == 1
+        assert reloaded.progress_data["streak_index"]["events"] == 3
+        assert [entry.get("day") for entry in self.read_events(tracker)] == [1, 2, None]
+
+        again = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        assert again.progress_data["history"] == reloaded.progress_data["history"]
+        assert len(again.progress_data["history"]) == 3
+
+    def test_legacy_inline_history_moves_to_log(self, tracker):
+        """A progress file with inline history is split on the next save"""
+        legacy = tracker.create_initial_progress()
+        legacy["history"] = [
+            {"action": "complete", "day": 1, "timestamp": "2024-01-01T10:00:00"}
+        ]
+        with open(tracker.progress_file, "w") as f:
+            json.dump(legacy, f)
+
+        migrated = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        assert migrated.progress_data["history"] == migrate_history(legacy["history"])
+        migrated.parse_markdown()
+        migrated.mark_day_complete(2)
+
+        with open(tracker.progress_file) as f:
+            assert "history" not in json.load(f)
+        assert [entry["day"] for entry in self.read_events(tracker)] == [1, 2]
+
+    def test_replaced_history_rewrites_log(self, tracker):
+        """Assigning a new history list replaces the log's content"""
+        tracker.mark_day_complete(1)
+        tracker.progress_data["history"] = [
+            {"action": "complete", "day": 3, "timestamp": "2024-01-01T10:00:00"}
+        ]
+        tracker.save_progress()
+
+        assert [entry["day"] for entry in self.read_events(tracker)] == [3]
+
+    def test_compaction_keeps_streak_and_undo(self, tracker):
+        """Folded events still count towards the streak"""
+        today = datetime.now()
+        tracker.progress_data["history"] = [
+            {
+                "action": "complete",
+                "day": day,
+                "timestamp": (today - timedelta(days=3 - day)).isoformat(),
+            }
+            for day in (1, 2, 3)
+        ]
+        tracker.update_streak()
+        assert tracker.progress_data["stats"]["current_streak"] == 3
+
+        assert tracker.compact_history(0) == 2
+        assert [entry["day"] for entry in self.read_events(tracker)] == [3]
+
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        assert len(reloaded.progress_data["rollup"]) == 2
+        reloaded.update_streak()
+        assert reloaded.progress_data["stats"]["current_streak"] == 3
+
+        # The last completion is still in the log to be undone
+        reloaded.parse_markdown()
+        reloaded.mark_day_complete(3)
+        assert reloaded.undo_last_action() == True
+        assert reloaded.progress_data["history"][-1]["action"] == "undo"
+
+    def test_compact_command(self, tracker):
+        """--compact folds the log and reports how many events went"""
+        with patch(
+            "sys.argv", ["study_tracker.py", "--plan", tracker.markdown_file, "--compact"]
+        ), patch("study_tracker.StudyTracker") as mock_tracker, patch(
+            "study_tracker.console.print"
+        ) as mock_print:
+            mock_tracker.return_value.compact_history.return_value = 1
+            main()
+
+        mock_tracker.return_value.compact_history.assert_called_once_with(90)
+        mock_print.assert_called_with(
+            "[green]✅ Folded 1 history events into the snapshot[/green]"
+        )
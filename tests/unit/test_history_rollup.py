@@ -0,0 +1,161 @@
+"""
+Unit tests for history retention in study_tracker.py
+Tests rolling old events into per-day aggregates and automatic compaction
+"""
+
+import pytest
+import io
+import os
+import tempfile
+import shutil
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from rich.console import Console
+from study_tracker import StatsEngine, StudyTracker, main
+
+
+class TestHistoryRollup:
+    """Test folding history past the retention window"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+
+#### Day 2 (1 hour)
+- [ ] Task 2
+
+#### Day 3 (1 hour)
+- [ ] Task 3
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with a parsed plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def entry(self, action, days_ago, **fields):
+        timestamp = (datetime.now() - timedelta(days=days_ago)).isoformat()
+        return {"action": action, **fields, "timestamp": timestamp}
+
+    def shown_stats(self, tracker):
+        """show_stats rendered as text"""
+        capture = Console(file=io.StringIO(), width=100)
+        with patch("study_tracker.console", capture):
+            tracker.show_stats()
+        return capture.file.getvalue()
+
+    def old_history(self):
+        """A long streak that ended recently, mostly past the retention"""
+        history = [self.entry("complete", days_ago, day=1) for days_ago in range(200, 99, -1)]
+        history.append(self.entry("undo", 100, day=1))
+        history.append(self.entry("complete", 99, days=[[1, 3]]))
+        history.append(self.entry("complete", 1, day=2))
+        return history
+
+    def test_old_events_roll_up_by_day(self, tracker):
+        """Events past the retention become per-day totals"""
+        tracker.progress_data["history"] = self.old_history()
+
+        assert tracker.compact_history(30) == 103
+        assert len(tracker.progress_data["history"]) == 1
+
+        rollup = tracker.progress_data["rollup"]
+        assert len(rollup) == 102
+        day_100 = (datetime.now() - timedelta(days=100)).date().isoformat()
+        day_99 = (datetime.now() - timedelta(days=99)).date().isoformat()
+        assert rollup[day_100] == {
+            "sessions": 1, "days_completed": 1, "undos": 1, "days_undone": 1
+        }
+        assert rollup[day_99] == {
+            "sessions": 1, "days_completed": 3, "undos": 0, "days_undone": 0
+        }
+
+    def test_recent_events_are_kept(self, tracker):
+        """Nothing inside the retention window is folded"""
+        tracker.progress_data["history"] = self.old_history()
+        assert tracker.compact_history(365) == 0
+        assert len(tracker.progress_data["history"]) == 104
+        assert not os.path.exists(tracker.progress_file)
+
+    def test_streaks_and_stats_unchanged(self, tracker):
+        """update_streak and show_stats read the same after a rollup"""
+        tracker.progress_data["history"] = self.old_history()
+        tracker.update_streak()
+        stats_before = dict(tracker.progress_data["stats"])
+        shown_before = self.shown_stats(tracker)
+
+        tracker.compact_history(30)
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        reloaded.progress_data["stats"]["longest_streak"] = 0
+        reloaded.update_streak()
+        assert reloaded.progress_data["stats"] == stats_before
+        assert stats_before["current_streak"] == 1
+        assert self.shown_stats(reloaded) == shown_before
+
+    def test_grouped_undo_keeps_velocity(self, tracker):
+        """An undone range counts all its days once rolled up"""
+        tracker.progress_data["history"] = [
+            self.entry("complete", 200, days=[[4, 10]]),
+            self.entry("undo", 200, days=[[5, 9]]),
+            self.entry("complete", 1, day=2),
+        ]
+        today = datetime.now().date().toordinal()
+        before = StatsEngine.from_progress(tracker.progress_data).velocity(today)
+
+        tracker.compact_history(30)
+        day_200 = (datetime.now() - timedelta(days=200)).date().isoformat()
+        assert tracker.progress_data["rollup"][day_200]["days_undone"] == 5
+        after = StatsEngine.from_progress(tracker.progress_data).velocity(today)
+        assert after == pytest.approx(before)
+
+    def test_automatic_compaction(self, tracker):
+        """Saving past the size threshold rolls up old events first"""
+        tracker.progress_data["history"] = self.old_history()
+        tracker.save_progress()
+        assert tracker.storage.history_bytes() > 1000
+
+        with patch("study_tracker._AUTO_COMPACT_BYTES", 1000):
+            tracker.mark_day_complete(3)
+
+        assert len(tracker.progress_data["history"]) == 2
+        with open(tracker.events_file) as f:
+            assert len(f.readlines()) == 2
+
+    def test_compact_retention_option(self, tracker):
+        """--compact takes an optional number of days to keep"""
+        with patch(
+            "sys.argv",
+            ["study_tracker.py", "--plan", tracker.markdown_file, "--compact", "0"],
+        ), patch("study_tracker.StudyTracker") as mock_tracker, patch(
+            "study_tracker.console.print"
+        ):
+            mock_tracker.return_value.compact_history.return_value = 0
+            main()
+
+        mock_tracker.return_value.compact_history.assert_called_once_with(0)
@@ -0,0 +1,136 @@
+"""
+Unit tests for epoch and day-ordinal stamps on history entries in study_tracker.py
+Tests new entries, the one-time migration and parse-free streak updates
+"""
+
+import pytest
+import json
+import os
+import tempfile
+import shutil
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, migrate_history, stamp_entry
+
+
+class TestHistoryStamps:
+    """Test integer time fields on history entries"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+
+#### Day 2 (1 hour)
+- [ ] Task 2
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with a parsed plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def legacy_entries(self):
+        return [
+            {"action": "complete", "day": 1, "timestamp": "2024-01-01T23:30:00"},
+            {"action": "undo", "day": 1, "timestamp": "2024-01-02T00:10:00"},
+        ]
+
+    def read_events(self, tracker):
+        with open(tracker.events_file, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_new_entries_are_stamped(self, tracker):
+        """Completions and undos carry epoch seconds and the local day"""
+        tracker.mark_day_complete(1)
+        tracker.undo_last_action()
+
+        for entry in tracker.progress_data["history"]:
+            when = datetime.fromisoformat(entry["timestamp"])
+            assert entry["epoch"] == int(when.timestamp())
+            assert entry["ordinal"] == when.date().toordinal()
+
+    def test_stamp_entry(self):
+        """Fields follow the local calendar date of the time given"""
+        when = datetime(2024, 3, 10, 23, 59, 30)
+        entry = stamp_entry({"action": "complete", "day": 4}, when)
+        assert entry["timestamp"] == "2024-03-10T23:59:30"
+        assert entry["ordinal"] == when.date().toordinal()
+        assert datetime.fromtimestamp(entry["epoch"]) == when
+
+    def test_migration_adds_fields_once(self, tracker):
+        """Old entries are stamped on load and the log is rewritten once"""
+        tracker.save_progress()
+        with open(tracker.events_file, "w", encoding="utf-8") as f:
+            for entry in self.legacy_entries():
+                f.write(json.dumps(entry) + "\n")
+
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        history = reloaded.progress_data["history"]
+        assert [entry["ordinal"] for entry in history] == [738886, 738887]
+        reloaded.parse_markdown()
+        reloaded.mark_day_complete(2)
+
+        events = self.read_events(tracker)
+        assert len(events) == 3
+        assert all("epoch" in entry and "ordinal" in entry for entry in events)
+        assert events[0]["timestamp"] == "2024-01-01T23:30:00"
+
+        # Already migrated: the same list is kept and appended to
+        migrated = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        history = migrated.progress_data["history"]
+        assert migrate_history(history) is history
+
+    def test_sqlite_migration(self, tracker):
+        """The database import stamps old entries as well"""
+        legacy = tracker.create_initial_progress()
+        legacy["history"] = self.legacy_entries()
+        with open(tracker.progress_file, "w") as f:
+            json.dump(legacy, f)
+
+        StudyTracker(tracker.markdown_file, tracker.progress_file, storage="sqlite")
+        reopened = StudyTracker(tracker.markdown_file, tracker.progress_file, storage="sqlite")
+        assert [entry["ordinal"] for entry in reopened.progress_data["history"]] == [
+            738886,
+            738887,
+        ]
+
+    def test_streak_update_skips_parsing(self, tracker):
+        """Stamped entries are counted without parsing timestamps"""
+        now = datetime.now()
+        tracker.progress_data["history"] = [
+            stamp_entry({"action": "complete", "day": 1}, now - timedelta(days=days_ago))
+            for days_ago in (2, 1, 0)
+        ]
+
+        with patch("study_tracker.datetime") as mock_datetime:
+            mock_datetime.now.return_value = now
+            mock_datetime.fromisoformat.side_effect = AssertionError("parsed")
+            tracker.update_streak()
+
+        assert tracker.progress_data["stats"]["current_streak"] == 3
@@ -0,0 +1,178 @@
+"""
+Unit tests for incremental re-parsing in study_tracker.py
+Tests per-week block hashing, block reuse and context carry-over
+"""
+
+import pytest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import study_tracker
+from study_tracker import StudyTracker, parse_plan_lines, split_plan_blocks
+
+
+class TestIncrementalParse:
+    """Test re-parsing only the week blocks that changed"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown with three week blocks across two phases"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [x] Task 1
+- [ ] Task 2
+
+### Week 2
+#### Day 2 (1 hour)
+- [ ] Task 3
+- [ ] Task 4
+
+## 📅 PHASE 2: ADVANCED
+
+### Week 3
+#### Day 3 (1 hour)
+- [ ] Task 5
+- [X] Task 6
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with a parsed plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def edit(self, tracker, old, new):
+        with open(tracker.markdown_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        with open(tracker.markdown_file, "w", encoding="utf-8") as f:
+            f.write(content.replace(old, new))
+
+    def reparse(self, tracker):
+        """Parse again with a fresh tracker, returning the parsed line ranges"""
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        with patch(
+            "study_tracker._parse_range", wraps=study_tracker._parse_range
+        ) as mock_parse:
+            fresh.parse_markdown()
+        return fresh, [call.args[2:4] for call in mock_parse.call_args_list]
+
+    def assert_matches_full_parse(self, tracker):
+        store = tracker.checkboxes
+        with open(tracker.markdown_file, "r", encoding="utf-8") as f:
+            expected = parse_plan_lines(f.readlines())
+
+        assert [dict(cb) for cb in store] == [
+            dict(cb, offset=store[i]["offset"]) for i, cb in enumerate(expected)
+        ]
+        assert store.day_runs == expected.day_runs
+        assert store.week_runs == expected.week_runs
+
+    def test_blocks_split_at_week_headers(self, tracker):
+        """Each week header starts a block; the preamble forms the first"""
+        assert [block[7] for block in tracker.checkboxes.blocks] == [0, 4, 9, 16]
+        assert [block[3:5] for block in tracker.checkboxes.blocks] == [
+            (0, 0),
+            (0, 2),
+            (2, 4),
+            (4, 6),
+        ]
+
+    def test_split_handles_crlf(self, sample_markdown):
+        """Block starts line up with CRLF line boundaries"""
+        data = sample_markdown.replace("\n", "\r\n").encode("utf-8")
+        line_starts = [0]
+        for line in data.splitlines(keepends=True):
+            line_starts.append(line_starts[-1] + len(line))
+
+        assert [block[0] for block in split_plan_blocks(data, line_starts)] == [
+            0,
+            4,
+            9,
+            16,
+        ]
+
+    def test_only_edited_block_is_parsed(self, tracker):
+        """Editing one week re-parses that week block alone"""
+        self.edit(tracker, "- [ ] Task 4", "- [x] Task 4 (done by hand)")
+
+        fresh, parsed = self.reparse(tracker)
+
+        assert parsed == [(9, 16)]
+        assert fresh.checkboxes[3]["checked"] == True
+        assert fresh.checkboxes[3]["content"] == "- [x] Task 4 (done by hand)"
+        self.assert_matches_full_parse(fresh)
+
+    def test_inserted_lines_shift_later_blocks(self, tracker):
+        """Blocks after an insertion are reused at their new position"""
+        self.edit(tracker, "- [ ] Task 2\n", "- [ ] Task 2\n- [ ] Task 2b\n\nNotes\n")
+
+        fresh, parsed = self.reparse(tracker)
+
+        assert parsed == [(4, 12)]
+        assert len(fresh.checkboxes) == 7
+        self.assert_matches_full_parse(fresh)
+
+        # Shifted offsets still point at the marks
+        assert fresh.mark_day_complete(3) == True
+        with open(fresh.markdown_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        assert "- [x] Task 5\n- [X] Task 6\n" in content
+
+    def test_context_change_reparses_following_block(self, tracker):
+        """A block whose inherited phase changed is parsed again"""
+        self.edit(tracker, "- [ ] Task 2\n", "- [ ] Task 2\n## 📅 PHASE 1B: EXTRA\n")
+
+        fresh, parsed = self.reparse(tracker)
+
+        # Week 3 starts after the PHASE 2 header again, so it is reused
+        assert parsed == [(4, 10), (10, 17)]
+        assert fresh.checkboxes[2]["phase"] == "## 📅 PHASE 1B: EXTRA"
+        assert fresh.checkboxes[4]["phase"] == "## 📅 PHASE 2: ADVANCED"
+        self.assert_matches_full_parse(fresh)
+
+    def test_marks_written_by_tracker_are_parsed_again(self, tracker):
+        """A block marked by the tracker no longer matches its cached text"""
+        assert tracker.mark_day_complete(2) == True
+        self.edit(tracker, "- [ ] Task 2", "- [ ] Task 2 (renamed)")
+
+        fresh, parsed = self.reparse(tracker)
+
+        assert parsed == [(4, 9), (9, 16)]
+        assert fresh.checkboxes[2]["checked"] == True
+        assert fresh.checkboxes[3]["checked"] == True
+        self.assert_matches_full_parse(fresh)
+
+    def test_reverted_marks_reuse_cached_block(self, tracker):
+        """Reverting a mark by hand is seen even though the block text is old"""
+        assert tracker.mark_day_complete(2) == True
+        self.edit(tracker, "- [x] Task 3\n- [x] Task 4", "- [ ] Task 3\n- [ ] Task 4")
+
+        fresh, parsed = self.reparse(tracker)
+
+        # The cache still holds the block as parsed, before the mark
+        assert parsed == []
+        assert fresh.checkboxes[2]["checked"] == False
+        assert fresh.checkboxes[3]["checked"] == False
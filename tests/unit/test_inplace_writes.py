@@ -0,0 +1,163 @@
+"""
+Unit tests for in-place checkbox writes in study_tracker.py
+Tests byte-offset toggling and the full-rewrite fallback
+"""
+
+import pytest
+import marshal
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker
+
+
+class TestInPlaceWrites:
+    """Test toggling checkbox marks at their recorded byte offsets"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown with multi-byte characters before the checkboxes"""
+        return """# Test Study Plan 🔥
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task with unicode: α β γ
+- [ ] Task 2
+
+#### Day 2 (1 hour)
+- [X] Task 3
+  - [x] Nested task 4
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with test files"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        return StudyTracker(markdown_file, progress_file)
+
+    def read_bytes(self, tracker):
+        with open(tracker.markdown_file, "rb") as f:
+            return f.read()
+
+    def test_offsets_point_at_marks(self, tracker):
+        """Recorded offsets are byte positions of the mark characters"""
+        tracker.parse_markdown()
+        data = self.read_bytes(tracker)
+
+        marks = [data[cb["offset"] : cb["offset"] + 1] for cb in tracker.checkboxes]
+        assert marks == [b" ", b" ", b"X", b"x"]
+
+    def test_mark_day_complete_flips_only_marks(self, tracker):
+        """Marking a day changes exactly the mark bytes of that day"""
+        tracker.parse_markdown()
+        before = self.read_bytes(tracker)
+        offsets = [cb["offset"] for cb in tracker.checkboxes if cb["day"] == 1]
+
+        with patch.object(tracker, "save_markdown") as mock_save:
+            assert tracker.mark_day_complete(1) == True
+            mock_save.assert_not_called()
+
+        after = self.read_bytes(tracker)
+        changed = [i for i in range(len(before)) if before[i] != after[i]]
+        assert changed == offsets
+        assert all(after[i : i + 1] == b"x" for i in offsets)
+
+    def test_undo_clears_uppercase_marks(self, tracker):
+        """Undo unchecks both [x] and [X] boxes"""
+        tracker.parse_markdown()
+        tracker.progress_data["history"] = [
+            {"action": "complete", "day": 2, "timestamp": "2024-01-01T00:00:00"}
+        ]
+
+        assert tracker.undo_last_action() == True
+        content = self.read_bytes(tracker).decode("utf-8")
+        assert "- [ ] Task 3" in content
+        assert "  - [ ] Nested task 4" in content
+
+    def test_crlf_line_endings_preserved(self, temp_dir, sample_markdown):
+        """In-place writes keep the file's own line endings"""
+        markdown_file = os.path.join(temp_dir, "crlf_plan.md")
+        with open(markdown_file, "wb") as f:
+            f.write(sample_markdown.replace("\n", "\r\n").encode("utf-8"))
+
+        tracker = StudyTracker(markdown_file, os.path.join(temp_dir, ".progress.json"))
+        tracker.parse_markdown()
+        tracker.mark_day_complete(1)
+
+        with open(markdown_file, "rb") as f:
+            data = f.read()
+        assert data.count(b"\r\n") == sample_markdown.count("\n")
+        assert "- [x] Task with unicode: α β γ\r\n".encode("utf-8") in data
+
+    def test_external_change_is_reparsed(self, tracker):
+        """A file edited after parsing is parsed again before marking"""
+        tracker.parse_markdown()
+
+        with open(tracker.markdown_file, "r+", encoding="utf-8") as f:
+            content = f.read()
+            f.seek(0)
+            f.write("<!-- edited -->\n" + content)
+
+        with patch.object(tracker, "save_markdown") as mock_save:
+            assert tracker.mark_day_complete(1) == True
+            mock_save.assert_not_called()
+
+        content = self.read_bytes(tracker).decode("utf-8")
+        assert content.startswith("<!-- edited -->\n")
+        assert "- [x] Task with unicode: α β γ\n- [x] Task 2" in content
+        assert "- [X] Task 3\n  - [x] Nested task 4" in content
+        assert tracker.progress_data["completed_days"] == [1]
+
+    def test_edit_after_cached_parse_is_reparsed(self, tracker):
+        """Indices served from the cache are not applied to edited lines"""
+        tracker.parse_markdown()
+        with open(tracker.cache_file, "rb") as f:
+            cache = marshal.load(f)
+        cache["stat_trusted"] = True
+        with open(tracker.cache_file, "wb") as f:
+            marshal.dump(cache, f)
+
+        cached = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        cached.parse_markdown()
+        assert cached.markdown_content == []
+
+        with open(tracker.markdown_file, "r+", encoding="utf-8") as f:
+            content = f.read()
+            f.seek(0)
+            f.write("#### Day 9 (1 hour)\n- [ ] Stray task\n" + content)
+
+        assert cached.mark_day_complete(1) == True
+        content = self.read_bytes(tracker).decode("utf-8")
+        assert content.startswith("#### Day 9 (1 hour)\n- [ ] Stray task\n")
+        assert "- [x] Task with unicode: α β γ\n- [x] Task 2" in content
+        assert cached.progress_data["completed_days"] == [1]
+
+    def test_in_place_failure_falls_back_to_rewrite(self, tracker):
+        """When in-place writes are unavailable the full rewrite path is used"""
+        tracker.parse_markdown()
+
+        with patch.object(tracker, "write_marks_in_place", return_value=False):
+            assert tracker.mark_day_complete(1) == True
+
+        content = self.read_bytes(tracker).decode("utf-8")
+        assert "- [x] Task with unicode: α β γ" in content
+        assert "- [x] Task 2" in content
@@ -0,0 +1,151 @@
+"""
+Unit tests for the write-ahead journal in study_tracker.py
+Tests atomic multi-file commits, crash recovery and batched commits
+"""
+
+import pytest
+import json
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, WriteJournal
+
+
+class TestWriteJournal:
+    """Test committing the markdown and progress files together"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+- [ ] Task 2
+
+#### Day 2 (1 hour)
+- [ ] Task 3
+- [ ] Task 4
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with a parsed plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_commit_patches_and_replaces(self, temp_dir):
+        """Patches and replacements land together and the record is removed"""
+        journal = WriteJournal(os.path.join(temp_dir, ".journal"))
+        first = os.path.join(temp_dir, "first.txt")
+        second = os.path.join(temp_dir, "second.txt")
+        for path in (first, second):
+            with open(path, "w") as f:
+                f.write("old content")
+
+        with journal.batch():
+            journal.patch(first, 0, b"OLD")
+            with open(journal.stage(second), "w") as f:
+                f.write("new content")
+            assert journal.read(first) == b"OLD content"
+            assert self.read(first) == "old content"
+
+        assert self.read(first) == "OLD content"
+        assert self.read(second) == "new content"
+        assert sorted(os.listdir(temp_dir)) == ["first.txt", "second.txt"]
+
+    def test_mark_day_complete_commits_once(self, tracker):
+        """The markdown and progress writes share a single commit"""
+        with patch.object(
+            tracker.journal, "commit", wraps=tracker.journal.commit
+        ) as mock_commit:
+            assert tracker.mark_day_complete(1) == True
+            mock_commit.assert_called_once()
+
+        assert "- [x] Task 1\n- [x] Task 2" in self.read(tracker.markdown_file)
+        with open(tracker.progress_file) as f:
+            assert json.load(f)["completed_days"] == [1]
+        assert not os.path.exists(tracker.journal.path)
+
+    def test_failed_staging_changes_nothing(self, tracker, sample_markdown):
+        """An error before the commit point leaves both files as they were"""
+        tracker.save_progress()
+        with open(tracker.progress_file) as f:
+            progress_before = f.read()
+
+        with patch.object(tracker, "save_progress", side_effect=OSError("Disk full")):
+            with pytest.raises(OSError):
+                tracker.mark_day_complete(1)
+
+        assert self.read(tracker.markdown_file) == sample_markdown
+        assert self.read(tracker.progress_file) == progress_before
+        assert not os.path.exists(tracker.journal.path)
+
+    def test_crash_after_commit_point_is_recovered(self, tracker):
+        """Startup finishes a commit whose record was written"""
+        with patch.object(WriteJournal, "apply", side_effect=SystemExit("crash")):
+            with pytest.raises(SystemExit):
+                tracker.mark_day_complete(1)
+
+        # Neither file was touched, but the intent is on disk
+        assert "- [ ] Task 1" in self.read(tracker.markdown_file)
+        assert not os.path.exists(tracker.progress_file)
+        assert os.path.exists(tracker.journal.path)
+
+        recovered = StudyTracker(tracker.markdown_file, tracker.progress_file)
+
+        assert not os.path.exists(recovered.journal.path)
+        assert "- [x] Task 1\n- [x] Task 2" in self.read(tracker.markdown_file)
+        assert recovered.progress_data["completed_days"] == [1]
+        recovered.parse_markdown()
+        assert recovered.get_current_day() == 2
+
+    def test_recovery_ignores_unreadable_record(self, tracker, sample_markdown):
+        """A record that cannot be read was never committed"""
+        with open(tracker.journal.path, "wb") as f:
+            f.write(b"not a journal")
+
+        assert tracker.journal.recover() == False
+        assert not os.path.exists(tracker.journal.path)
+        assert self.read(tracker.markdown_file) == sample_markdown
+
+    def test_rewrite_in_batch_keeps_staged_marks(self, tracker):
+        """A fallback rewrite after in-place marks includes those marks"""
+        with tracker.journal.batch():
+            assert tracker.mark_day_complete(1) == True
+            # As after a cache hit: the lines are reloaded through the journal
+            tracker.markdown_content = []
+            with patch.object(tracker, "write_marks_in_place", return_value=False):
+                assert tracker.mark_day_complete(2) == True
+            assert "- [ ] Task 1" in self.read(tracker.markdown_file)
+
+        content = self.read(tracker.markdown_file)
+        assert "- [x] Task 1\n- [x] Task 2" in content
+        assert "- [x] Task 3\n- [x] Task 4" in content
+        assert tracker.progress_data["completed_days"] == [1, 2]
@@ -0,0 +1,157 @@
+"""
+Unit tests for lazy history loading in study_tracker.py
+Tests that read-only commands never read the history and that it loads on demand
+"""
+
+import pytest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, JsonProgressStorage, LazyProgress, history_loaded
+
+
+class TestLazyProgress:
+    """Test reading the history only when it is used"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+
+#### Day 2 (1 hour)
+- [ ] Task 2
+
+#### Day 3 (1 hour)
+- [ ] Task 3
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with one completed day"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        tracker.mark_day_complete(1)
+        return tracker
+
+    def reopen(self, tracker, storage="json"):
+        return StudyTracker(tracker.markdown_file, tracker.progress_file, storage=storage)
+
+    def test_lazy_progress_mapping(self):
+        """The loader runs once, on the first lookup of the history"""
+        calls = []
+
+        def load():
+            calls.append(1)
+            return [{"action": "complete", "day": 1}]
+
+        progress = LazyProgress({"completed_days": [1]}, load)
+        assert "history" in progress
+        assert not history_loaded(progress)
+        assert list(progress) == ["completed_days"]
+
+        assert progress["history"] == [{"action": "complete", "day": 1}]
+        assert progress.get("history") is progress["history"]
+        assert calls == [1]
+
+        other = LazyProgress({"completed_days": [1]}, load)
+        assert other == progress
+        assert calls == [1, 1]
+        with pytest.raises(KeyError):
+            progress["missing"]
+
+    def test_read_only_commands_skip_history(self, tracker):
+        """--status, --next and --week-summary never read the events log"""
+        reloaded = self.reopen(tracker)
+        with patch.object(JsonProgressStorage, "load_events") as mock_load, patch(
+            "study_tracker.console.print"
+        ):
+            reloaded.show_status()
+            reloaded.show_next()
+            reloaded.show_week_summary()
+            reloaded.show_stats()
+
+        mock_load.assert_not_called()
+        assert not history_loaded(reloaded.progress_data)
+        assert reloaded.progress_data["completed_days"] == [1]
+
+    def test_history_loads_on_first_access(self, tracker):
+        """The history reads back in full when it is used"""
+        reloaded = self.reopen(tracker)
+        assert reloaded.progress_data["history"] == tracker.progress_data["history"]
+        assert history_loaded(reloaded.progress_data)
+
+    def test_save_without_history_keeps_log(self, tracker):
+        """Saving before the history is loaded leaves the log untouched"""
+        with open(tracker.events_file, "rb") as f:
+            events_before = f.read()
+
+        reloaded = self.reopen(tracker)
+        reloaded.progress_data["stats"]["longest_streak"] = 5
+        reloaded.save_progress()
+
+        with open(tracker.events_file, "rb") as f:
+            assert f.read() == events_before
+        again = self.reopen(tracker)
+        assert again.progress_data["stats"]["longest_streak"] == 5
+        assert len(again.progress_data["history"]) == 1
+
+    def test_mark_after_lazy_load_appends(self, tracker):
+        """A mark on a fresh tracker appends one line without reading the log"""
+        reloaded = self.reopen(tracker)
+        reloaded.parse_markdown()
+        assert reloaded.mark_day_complete(2) == True
+        assert not history_loaded(reloaded.progress_data)
+
+        with open(tracker.events_file) as f:
+            assert len(f.readlines()) == 2
+        assert [entry["day"] for entry in reloaded.progress_data["history"]] == [1, 2]
+
+    def test_sqlite_history_is_lazy(self, tracker):
+        """The events table is only read once the history is needed"""
+        imported = self.reopen(tracker, "sqlite")  # Imports the JSON progress
+        imported.storage.connection.close()
+
+        reloaded = self.reopen(tracker, "sqlite")
+        statements = []
+        reloaded.storage.connection.set_trace_callback(statements.append)
+        with patch("study_tracker.console.print"):
+            reloaded.show_status()
+            reloaded.show_next()
+        entry = reloaded.storage.last_event(reloaded.progress_data, "complete")
+        reloaded.storage.connection.set_trace_callback(None)
+
+        assert entry["day"] == 1
+        assert not history_loaded(reloaded.progress_data)
+        assert not any(sql.endswith("FROM events ORDER BY id") for sql in statements)
+
+        # Undo looks up the last completion and appends, still unloaded
+        assert reloaded.undo_last_action() == True
+        assert not history_loaded(reloaded.progress_data)
+        assert [e["action"] for e in self.reopen(tracker, "sqlite").progress_data["history"]] == [
+            "complete",
+            "undo",
+        ]
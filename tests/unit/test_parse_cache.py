@@ -0,0 +1,206 @@
+"""
+Unit tests for the persistent parse cache in study_tracker.py
+Tests cache hits, fingerprint invalidation and recovery from bad cache files
+"""
+
+import pytest
+import marshal
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker
+
+
+class TestParseCache:
+    """Test the fingerprint-keyed checkbox index cache"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+- [x] Task 2
+
+#### Day 2 (1 hour)
+- [ ] Task 3
+  - [ ] Nested task 4
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with test files"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        return StudyTracker(markdown_file, progress_file)
+
+    def trust_cache(self, tracker):
+        """Mark the cached stat as trusted, as if written long ago"""
+        with open(tracker.cache_file, "rb") as f:
+            cache = marshal.load(f)
+        cache["stat_trusted"] = True
+        with open(tracker.cache_file, "wb") as f:
+            marshal.dump(cache, f)
+
+    def test_cache_written_next_to_progress_file(self, tracker):
+        """Parsing stores the index beside the progress file"""
+        tracker.parse_markdown()
+
+        assert tracker.cache_file == os.path.join(
+            os.path.dirname(tracker.progress_file), ".study_parse_cache.bin"
+        )
+        assert os.path.exists(tracker.cache_file)
+
+    def test_cache_hit_skips_markdown(self, tracker):
+        """A trusted stat match serves the index without reading the markdown"""
+        tracker.parse_markdown()
+        expected = list(tracker.checkboxes)
+        self.trust_cache(tracker)
+
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        with patch("study_tracker._parse_range") as mock_parse:
+            fresh.parse_markdown()
+            mock_parse.assert_not_called()
+
+        assert fresh.markdown_content == []
+        assert list(fresh.checkboxes) == expected
+
+    def test_cache_hit_then_mark_day_complete(self, tracker):
+        """Writes after a cache hit load the markdown lines on demand"""
+        tracker.parse_markdown()
+        self.trust_cache(tracker)
+
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        fresh.parse_markdown()
+        assert fresh.mark_day_complete(1) == True
+
+        with open(fresh.markdown_file, "r", encoding="utf-8") as f:
+            content = f.read()
+        assert "- [x] Task 1" in content
+        assert "## 📅 PHASE 1: FUNDAMENTALS" in content
+
+        # The cache follows the write
+        reparsed = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        reparsed.parse_markdown()
+        assert all(cb["checked"] for cb in reparsed.checkboxes if cb["day"] == 1)
+
+    def test_mark_leaves_cache_file_alone(self, tracker):
+        """An in-place mark records its state beside the cache, unhashed"""
+        tracker.parse_markdown()
+        with open(tracker.cache_file, "rb") as f:
+            cached = f.read()
+
+        with patch("study_tracker.hashlib.sha256") as mock_sha256:
+            assert tracker.mark_day_complete(1) == True
+            mock_sha256.assert_not_called()
+
+        with open(tracker.cache_file, "rb") as f:
+            assert f.read() == cached
+        assert os.path.exists(tracker.marks_file)
+
+        # Stats that are not trusted yet send the next run to the blocks
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        fresh.parse_markdown()
+        assert [cb["checked"] for cb in fresh.checkboxes] == [True, True, False, False]
+
+    def test_trusted_marks_serve_the_index(self, tracker):
+        """Marks written in place overlay the cached index on a cache hit"""
+        tracker.parse_markdown()
+        tracker.mark_day_complete(2)
+        with open(tracker.marks_file, "rb") as f:
+            marks = marshal.load(f)
+        marks["stat_trusted"] = True
+        with open(tracker.marks_file, "wb") as f:
+            marshal.dump(marks, f)
+
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        with patch("study_tracker._parse_range") as mock_parse:
+            fresh.parse_markdown()
+            mock_parse.assert_not_called()
+        assert [cb["checked"] for cb in fresh.checkboxes] == [False, True, True, True]
+        assert fresh.checkboxes[3]["content"] == "- [x] Nested task 4"
+
+        # Blocks are reused only against the marks they were hashed with
+        fresh.undo_last_action()
+        os.utime(tracker.markdown_file, ns=(0, 0))
+        again = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        again.parse_markdown()
+        assert [cb["checked"] for cb in again.checkboxes] == [False, True, False, False]
+
+    def test_cached_content_follows_marks(self, tracker):
+        """Line text read from the cache carries marks written after parsing"""
+        tracker.parse_markdown()
+        tracker.mark_day_complete(1)
+        tracker.undo_last_action()
+        tracker.mark_day_complete(2)
+
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        fresh.parse_markdown()
+        with open(tracker.markdown_file, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert [cb["content"] for cb in fresh.checkboxes] == [
+            lines[cb["line_index"]].strip() for cb in fresh.checkboxes
+        ]
+        assert fresh.checkboxes[2]["content"] == "- [x] Task 3"
+        assert fresh.checkboxes[0]["content"] == "- [ ] Task 1"
+
+    def test_external_edit_invalidates_cache(self, tracker):
+        """A changed fingerprint falls back to a full parse"""
+        tracker.parse_markdown()
+        self.trust_cache(tracker)
+
+        with open(tracker.markdown_file, "a", encoding="utf-8") as f:
+            f.write("\n#### Day 3 (1 hour)\n- [ ] Task added by hand\n")
+
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        fresh.parse_markdown()
+
+        assert len(fresh.checkboxes) == 5
+        assert fresh.checkboxes[-1]["day"] == 3
+
+    def test_touched_file_reuses_index(self, tracker):
+        """Same content under a new mtime is verified by hash, not re-parsed"""
+        tracker.parse_markdown()
+        stat = os.stat(tracker.markdown_file)
+        os.utime(tracker.markdown_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        fresh = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        with patch("study_tracker._parse_range") as mock_parse:
+            fresh.parse_markdown()
+            mock_parse.assert_not_called()
+
+        assert len(fresh.checkboxes) == 4
+
+    def test_corrupted_cache_is_ignored(self, tracker):
+        """An unreadable cache file is rebuilt from the markdown"""
+        with open(tracker.cache_file, "w") as f:
+            f.write("not a cache")
+
+        tracker.parse_markdown()
+        assert len(tracker.checkboxes) == 4
+
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        with patch("study_tracker._parse_range") as mock_parse:
+            reloaded.parse_markdown()
+            mock_parse.assert_not_called()
+        assert [cb["day"] for cb in reloaded.checkboxes] == [1, 1, 2, 2]
@@ -0,0 +1,190 @@
+"""
+Unit tests for multi-file plan directories in study_tracker.py
+Tests file ordering, parallel parsing, context carry-over and write routing
+"""
+
+import pytest
+import marshal
+import os
+import tempfile
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, list_plan_files, parse_plan_lines
+
+
+class TestPlanDirectory:
+    """Test plans split across a directory of markdown files"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def plan_files(self):
+        """Plan split over three files; later files inherit context"""
+        return {
+            "week-1.md": """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [x] Task 1
+- [ ] Task 2
+
+#### Day 2 (1 hour)
+- [ ] Task 3
+""",
+            # No headers until Day 3: the first task still belongs to Day 2
+            "week-2.md": """- [ ] Task 4 (continued)
+
+### Week 2
+#### Day 3 (1 hour)
+- [ ] Task 5 with unicode: α β γ
+- [ ] Task 6
+""",
+            "week-10.md": """## 📅 PHASE 2: ADVANCED
+
+### Week 10
+#### Day 4 (1 hour)
+- [X] Task 7
+- [ ] Task 8
+""",
+        }
+
+    @pytest.fixture
+    def plan_dir(self, temp_dir, plan_files):
+        """Write the plan files plus files that are not part of the plan"""
+        plan_dir = os.path.join(temp_dir, "plan")
+        os.makedirs(plan_dir)
+        for name, content in plan_files.items():
+            with open(os.path.join(plan_dir, name), "w", encoding="utf-8") as f:
+                f.write(content)
+        with open(os.path.join(plan_dir, "notes.txt"), "w") as f:
+            f.write("- [ ] Not a plan file\n")
+        with open(os.path.join(plan_dir, ".draft.md"), "w") as f:
+            f.write("#### Day 99\n- [ ] Hidden draft\n")
+        return plan_dir
+
+    @pytest.fixture
+    def tracker(self, temp_dir, plan_dir):
+        """Create a StudyTracker over the plan directory"""
+        return StudyTracker(plan_dir, os.path.join(temp_dir, ".test_progress.json"))
+
+    def read(self, plan_dir, name):
+        with open(os.path.join(plan_dir, name), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_files_listed_in_natural_order(self, plan_dir):
+        """Digit runs sort numerically and non-plan files are skipped"""
+        names = [os.path.basename(path) for path in list_plan_files(plan_dir)]
+        assert names == ["week-1.md", "week-2.md", "week-10.md"]
+
+    def test_directory_parses_like_concatenated_file(self, tracker, plan_dir):
+        """Merged files read exactly like one file with the same lines"""
+        tracker.parse_markdown()
+
+        lines = []
+        for path in list_plan_files(plan_dir):
+            with open(path, "r", encoding="utf-8") as f:
+                lines.extend(f.readlines())
+        expected = parse_plan_lines(lines)
+
+        assert [dict(cb, offset=None) for cb in tracker.checkboxes] == [
+            dict(cb) for cb in expected
+        ]
+        assert tracker.checkboxes.day_runs == expected.day_runs
+        assert [cb["day"] for cb in tracker.checkboxes] == [1, 1, 2, 2, 3, 3, 4, 4]
+        assert tracker.checkboxes[4]["phase"] == "## 📅 PHASE 1: FUNDAMENTALS"
+        assert tracker.get_current_day() == 1
+
+    def test_large_plans_parse_in_process_pool(self, tracker):
+        """Files are handed to worker processes above the size threshold"""
+        with patch("study_tracker._PARALLEL_PARSE_MIN_BYTES", 0), patch(
+            "study_tracker.os.cpu_count", return_value=4
+        ):
+            with patch(
+                "concurrent.futures.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+            ) as mock_pool:
+                tracker.parse_markdown()
+                mock_pool.assert_called_once_with(max_workers=3)
+
+        assert [cb["day"] for cb in tracker.checkboxes] == [1, 1, 2, 2, 3, 3, 4, 4]
+        assert tracker.checkboxes[6]["content"] == "- [X] Task 7"
+
+    def test_small_plans_parse_serially(self, tracker):
+        """Below the threshold no worker processes are started"""
+        with patch("concurrent.futures.ProcessPoolExecutor") as mock_pool:
+            tracker.parse_markdown()
+            mock_pool.assert_not_called()
+
+    def test_marks_written_to_source_file(self, tracker, plan_dir, plan_files):
+        """Checkbox writes land in the file the checkbox came from"""
+        tracker.parse_markdown()
+        assert tracker.mark_day_complete(1) == True
+        assert tracker.mark_day_complete(3) == True
+
+        assert "- [x] Task 2" in self.read(plan_dir, "week-1.md")
+        week_2 = self.read(plan_dir, "week-2.md")
+        assert "- [x] Task 5 with unicode: α β γ\n- [x] Task 6" in week_2
+        assert "- [ ] Task 4 (continued)" in week_2
+        assert self.read(plan_dir, "week-10.md") == plan_files["week-10.md"]
+
+    def test_rewrite_fallback_keeps_files_apart(self, tracker, plan_dir, plan_files):
+        """The full-rewrite fallback writes each file from its own lines"""
+        tracker.parse_markdown()
+
+        with patch.object(tracker, "write_marks_in_place", return_value=False):
+            assert tracker.mark_day_complete(2) == True
+
+        assert self.read(plan_dir, "week-1.md") == plan_files["week-1.md"].replace(
+            "- [ ] Task 3", "- [x] Task 3"
+        )
+        assert self.read(plan_dir, "week-2.md") == plan_files["week-2.md"].replace(
+            "- [ ] Task 4", "- [x] Task 4"
+        )
+        assert self.read(plan_dir, "week-10.md") == plan_files["week-10.md"]
+
+    def test_cache_hit_skips_files(self, tracker, plan_dir):
+        """An unchanged directory is served from the parse cache"""
+        tracker.parse_markdown()
+        with open(tracker.cache_file, "rb") as f:
+            cache = marshal.load(f)
+        cache["stat_trusted"] = True
+        with open(tracker.cache_file, "wb") as f:
+            marshal.dump(cache, f)
+
+        fresh = StudyTracker(plan_dir, tracker.progress_file)
+        with patch("study_tracker._parse_plan_file") as mock_parse:
+            fresh.parse_markdown()
+            mock_parse.assert_not_called()
+
+        assert fresh.markdown_content == []
+        assert [cb["content"] for cb in fresh.checkboxes] == [
+            cb["content"] for cb in tracker.checkboxes
+        ]
+
+        # Writes after a cache hit still reach the right file
+        assert fresh.mark_day_complete(4) == True
+        assert "- [x] Task 8" in self.read(plan_dir, "week-10.md")
+
+    def test_edited_file_invalidates_cache(self, tracker, plan_dir):
+        """Changing one file of the directory triggers a re-parse"""
+        tracker.parse_markdown()
+        with open(os.path.join(plan_dir, "week-10.md"), "a", encoding="utf-8") as f:
+            f.write("\n#### Day 5 (1 hour)\n- [ ] Task added by hand\n")
+
+        fresh = StudyTracker(plan_dir, tracker.progress_file)
+        fresh.parse_markdown()
+
+        assert len(fresh.checkboxes) == 9
+        assert fresh.checkboxes[-1]["day"] == 5
+        assert fresh.checkboxes[-1]["phase"] == "## 📅 PHASE 2: ADVANCED"
@@ -0,0 +1,152 @@
+"""
+Unit tests for cross-process write safety in study_tracker.py
+Tests the progress version, conflict detection and the advisory lock
+"""
+
+import pytest
+import json
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import study_tracker
+from study_tracker import StudyTracker, ProgressConflict
+
+
+class TestProgressLocking:
+    """Test two trackers writing the same files"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+
+#### Day 2 (1 hour)
+- [ ] Task 2
+
+#### Day 3 (1 hour)
+- [ ] Task 3
+"""
+
+    @pytest.fixture
+    def paths(self, temp_dir, sample_markdown):
+        """Write the sample plan and return the plan and progress paths"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        return markdown_file, os.path.join(temp_dir, ".test_progress.json")
+
+    def open_tracker(self, paths, storage="json"):
+        tracker = StudyTracker(*paths, storage=storage)
+        tracker.parse_markdown()
+        return tracker
+
+    def read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_version_increases_per_write(self, paths):
+        """Every committed change bumps the stored version by one"""
+        tracker = self.open_tracker(paths)
+        assert tracker.progress_data["version"] == 0
+
+        tracker.mark_day_complete(1)
+        tracker.undo_last_action()
+        with open(paths[1]) as f:
+            assert json.load(f)["version"] == 2
+        assert tracker.storage.stored_version() == 2
+
+    @pytest.mark.parametrize("storage", ["json", "sqlite"])
+    def test_stale_writer_reapplies(self, paths, storage):
+        """A writer that loaded before another's commit redoes its change"""
+        first = self.open_tracker(paths, storage)
+        second = self.open_tracker(paths, storage)
+
+        assert first.mark_day_complete(1) == True
+        assert second.mark_day_complete(2) == True
+
+        content = self.read(paths[0])
+        assert "- [x] Task 1" in content
+        assert "- [x] Task 2" in content
+        reloaded = StudyTracker(*paths, storage=storage)
+        assert reloaded.progress_data["completed_days"] == [1, 2]
+        assert [entry["day"] for entry in reloaded.progress_data["history"]] == [1, 2]
+        assert reloaded.progress_data["version"] == 2
+
+    def test_current_day_recomputed_on_retry(self, paths):
+        """--done from two shells marks two consecutive days"""
+        first = self.open_tracker(paths)
+        second = self.open_tracker(paths)
+
+        first.mark_day_complete()
+        second.mark_day_complete()
+
+        reloaded = StudyTracker(*paths)
+        assert reloaded.progress_data["completed_days"] == [1, 2]
+
+    def test_stale_undo_sees_other_writes(self, paths):
+        """An undo redone after a conflict undoes the newest completion"""
+        first = self.open_tracker(paths)
+        first.mark_day_complete(1)
+        second = self.open_tracker(paths)
+        first.mark_day_complete(2)
+
+        assert second.undo_last_action() == True
+        reloaded = StudyTracker(*paths)
+        assert reloaded.progress_data["completed_days"] == [1]
+        assert "- [x] Task 1" in self.read(paths[0])
+
+    def test_conflict_detected_before_writing(self, paths):
+        """claim_version refuses a stale write"""
+        first = self.open_tracker(paths)
+        second = self.open_tracker(paths)
+        first.mark_day_complete(1)
+
+        with pytest.raises(ProgressConflict):
+            second.claim_version()
+        assert second.progress_data["version"] == 0
+
+    def test_lock_held_only_to_commit(self, paths):
+        """The lock is taken once per write, after the change is made"""
+        tracker = self.open_tracker(paths)
+        calls = []
+        real_flock = study_tracker.fcntl.flock
+
+        def flock(f, operation):
+            calls.append((operation, tracker.pending))
+            real_flock(f, operation)
+
+        with patch.object(study_tracker.fcntl, "flock", side_effect=flock):
+            tracker.mark_day_complete(1)
+            # Nothing to write: no lock at all
+            tracker.mark_day_complete(1)
+
+        fcntl = study_tracker.fcntl
+        assert [operation for operation, _ in calls] == [fcntl.LOCK_EX, fcntl.LOCK_UN]
+        # The deferred work had been collected before locking
+        assert calls[0][1] is None
+        assert os.path.exists(tracker.lock_file)
+
+    def test_works_without_fcntl(self, paths):
+        """Where fcntl is missing, writes go ahead unlocked"""
+        with patch("study_tracker.fcntl", None):
+            tracker = self.open_tracker(paths)
+            assert tracker.mark_day_complete(1) == True
+        assert not os.path.exists(tracker.lock_file)
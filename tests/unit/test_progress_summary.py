@@ -0,0 +1,121 @@
+"""
+Unit tests for the materialized progress summary in study_tracker.py
+Tests incremental updates on writes, reuse by read commands and invalidation
+"""
+
+import pytest
+import io
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+from rich.console import Console
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker
+
+
+class TestProgressSummary:
+    """Test the summary kept with the progress"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker over the sample plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def reopen(self, tracker):
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        reloaded.parse_markdown()
+        return reloaded
+
+    def shown(self, tracker, command):
+        capture = Console(file=io.StringIO(), width=120)
+        with patch("study_tracker.console", capture):
+            getattr(tracker, command)()
+        return capture.file.getvalue()
+
+    def test_writes_keep_summary_in_step(self, tracker):
+        """Marks, undos and ranges update the counts like a full recount"""
+        tracker.mark_day_complete()
+        assert tracker.progress_data["summary"] == tracker.build_summary()
+
+        tracker.complete_day_range(8, 13)
+        assert tracker.progress_data["summary"] == tracker.build_summary()
+        assert tracker.progress_data["summary"]["projects"]["mini"] == 1
+
+        tracker.undo_last_action()
+        assert tracker.progress_data["summary"] == tracker.build_summary()
+
+        tracker.undo_day_range(1, 3)
+        summary = tracker.progress_data["summary"]
+        assert summary == tracker.build_summary()
+        assert summary["completed"] == 0
+        assert summary["next_milestone"] == [84, "Junior C++ Level"]
+
+    def test_read_commands_use_stored_summary(self, tracker):
+        """After a write, --status and --stats render without recounting"""
+        tracker.mark_day_complete()
+        expected_status = self.shown(tracker, "show_status")
+
+        reloaded = self.reopen(tracker)
+        with patch.object(StudyTracker, "build_summary") as mock_build:
+            status = self.shown(reloaded, "show_status")
+            self.shown(reloaded, "show_stats")
+
+        mock_build.assert_not_called()
+        assert status == expected_status
+
+    def test_writes_skip_project_scan(self, tracker):
+        """With a stored summary, a write classifies only the boxes it flips"""
+        tracker.mark_day_complete()
+
+        reloaded = self.reopen(tracker)
+        with patch.object(StudyTracker, "project_masks") as mock_masks:
+            reloaded.complete_day_range(8, 13)
+
+        mock_masks.assert_not_called()
+        assert reloaded.progress_data["summary"] == reloaded.build_summary()
+        assert reloaded.progress_data["summary"]["projects"]["mini"] == 1
+
+    def test_hand_checked_box_rebuilds(self, tracker):
+        """A box checked outside the tracker invalidates the summary"""
+        tracker.mark_day_complete()
+        with open(tracker.markdown_file, encoding="utf-8") as f:
+            content = f.read()
+        with open(tracker.markdown_file, "w", encoding="utf-8") as f:
+            f.write(content.replace("- [ ] Watch: If-else statements", "- [x] Watch: If-else statements"))
+
+        reloaded = self.reopen(tracker)
+        summary = reloaded.summary()
+        assert summary == reloaded.build_summary()
+        assert summary["completed"] == tracker.progress_data["summary"]["completed"] + 1
+
+    def test_edited_plan_rebuilds(self, tracker):
+        """A plan edited outside the tracker has a new layout"""
+        tracker.mark_day_complete()
+        layout = tracker.progress_data["summary"]["layout"]
+        with open(tracker.markdown_file, "a", encoding="utf-8") as f:
+            f.write("\n#### Day 14 (1 hour - Weekday)\n- [ ] Extra task\n")
+
+        reloaded = self.reopen(tracker)
+        summary = reloaded.summary()
+        assert summary["layout"] != layout
+        assert summary["total"] == tracker.progress_data["summary"]["total"] + 1
@@ -0,0 +1,185 @@
+"""
+Unit tests for machine-readable report output in study_tracker.py
+Tests --format json, csv and ndjson for the status, next, week and stats reports
+"""
+
+import pytest
+import csv
+import io
+import json
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import study_tracker
+from study_tracker import StudyTracker, dump_report
+
+
+class TestWriteReport:
+    """Test the json, csv and ndjson dumps"""
+
+    fields = {"week": 2, "projects": [{"name": "Pricer", "checked": False}]}
+    rows = [{"day": 8, "checked": True}, {"day": 9, "checked": False}]
+
+    def written(self, fmt, rows=None):
+        out = io.StringIO()
+        dump_report(
+            out, fmt, "week_summary", self.fields, iter(rows or self.rows), "days", "day"
+        )
+        return out.getvalue()
+
+    def test_json(self):
+        """Fields and the rows under their key, as one document"""
+        assert json.loads(self.written("json")) == {**self.fields, "days": self.rows}
+
+        out = io.StringIO()
+        dump_report(out, "json", "next", {}, iter(()), "tasks", "task")
+        assert json.loads(out.getvalue()) == {"tasks": []}
+
+    def test_ndjson(self):
+        """A tagged fields line, then one tagged line per row"""
+        lines = [json.loads(line) for line in self.written("ndjson").splitlines()]
+        assert lines == [
+            {"record": "week_summary", **self.fields},
+            {"record": "day", "day": 8, "checked": True},
+            {"record": "day", "day": 9, "checked": False},
+        ]
+
+    def test_csv(self):
+        """A fields line, then the rows, tagged in a record column"""
+        rows = list(csv.reader(io.StringIO(self.written("csv"))))
+        assert rows == [
+            ["record", "week", "projects", "day", "checked"],
+            ["week_summary", "2", '[{"name": "Pricer", "checked": false}]', "", ""],
+            ["day", "", "", "8", "True"],
+            ["day", "", "", "9", "False"],
+        ]
+
+        out = io.StringIO()
+        dump_report(out, "csv", "next", {"day": None}, iter(()), "tasks", "task")
+        assert out.getvalue().splitlines() == ["record,day", "next,"]
+
+    def test_rows_are_streamed(self):
+        """Each row is written before the next one is produced
+
+        The fields line comes first, so row n finds n + 1 lines written.
+        """
+        out = io.StringIO()
+        seen = []
+
+        def rows():
+            for day in range(3):
+                seen.append(out.getvalue().count("\n"))
+                yield {"day": day}
+
+        dump_report(out, "ndjson", "week_summary", {}, rows(), "days", "day")
+        assert seen == [1, 2, 3]
+
+
+class TestReportCommands:
+    """Test --format on the report commands"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker over the sample plan with day 1 done"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        with patch("study_tracker.console.print"):
+            tracker.mark_day_complete()
+        return tracker
+
+    def report(self, tracker, name, fmt, **options):
+        out = io.StringIO()
+        # Data output never builds rich renderables
+        with patch("study_tracker.import_rich", side_effect=AssertionError):
+            tracker.write_report(name, fmt, out, **options)
+        return out.getvalue()
+
+    def test_status_json(self, tracker):
+        """The status fields with the phase breakdown"""
+        data = json.loads(self.report(tracker, "status", "json"))
+        assert data["current_day"] == 2
+        assert data["total_days"] == 20
+        assert data["completed_days"] == 6
+        assert data["next_milestone"] == {
+            "day": 84,
+            "description": "Junior C++ Level",
+            "days_away": 78,
+        }
+        assert [row["phase"] for row in data["phases"]] == [
+            "PHASE 1: C++ FUNDAMENTALS (Weeks 1-8)"
+        ]
+
+    def test_next_ndjson(self, tracker):
+        """The next day, then one line per task"""
+        lines = [json.loads(line) for line in self.report(tracker, "next", "ndjson").splitlines()]
+        assert lines[0]["record"] == "next"
+        assert lines[0]["day"] == 2
+        assert [line["task"] for line in lines[1:]] == [
+            "Watch: C++ Basics - Program Structure",
+            'Code: First "Hello World" program',
+            "Understand compilation process (vs Python interpretation)",
+            "Practice: Compile and run from terminal",
+        ]
+
+    def test_week_summary_csv(self, tracker):
+        """The week's counts, then one CSV row per task of the week"""
+        summary, *rows = csv.DictReader(
+            io.StringIO(self.report(tracker, "week_summary", "csv"))
+        )
+        assert summary["record"] == "week_summary"
+        assert summary["week"] == "1"
+        assert {row["record"] for row in rows} == {"day"}
+        assert len(rows) == 12
+        assert {row["day"] for row in rows} == {"1", "2", "3"}
+        assert [row["checked"] for row in rows[:5]] == ["True"] * 4 + ["False"]
+
+    def test_status_csv_keeps_fields(self, tracker):
+        """The status fields lead the CSV, nested values as JSON"""
+        status, *rows = csv.DictReader(io.StringIO(self.report(tracker, "status", "csv")))
+        assert status["record"] == "status"
+        assert status["current_day"] == "2"
+        assert json.loads(status["next_milestone"])["day"] == 84
+        assert [row["record"] for row in rows] == ["phase"]
+
+    def test_stats_detailed_json(self, tracker):
+        """Stats fields with the history metrics and the phase timeline"""
+        data = json.loads(self.report(tracker, "stats", "json", detailed=True))
+        assert data["total_sessions"] == 1
+        assert data["rolling_sessions"]["7"] == {"last": 1, "best": 1}
+        assert sum(data["weekday_sessions"].values()) == 1
+        assert data["phases"][0]["start_day"] == 1
+        assert data["phases"][0]["end_day"] == 13
+
+    def test_main_format(self):
+        """--format sends the report command to write_report"""
+        with patch("study_tracker.StudyTracker") as mock_class, patch(
+            "sys.argv", ["study_tracker.py", "--stats", "--detailed", "--format", "csv"]
+        ):
+            study_tracker.main()
+        mock_tracker = mock_class.return_value
+        mock_tracker.write_report.assert_called_once_with("stats", "csv", detailed=True)
+        mock_tracker.show_stats.assert_not_called()
+
+        with patch("study_tracker.StudyTracker") as mock_class, patch(
+            "sys.argv", ["study_tracker.py", "--format", "json"]
+        ):
+            study_tracker.main()
+        mock_class.return_value.write_report.assert_called_once_with("status", "json")
@@ -0,0 +1,213 @@
+"""
+Unit tests for the SQLite progress storage in study_tracker.py
+Tests the schema, row-level saves, indexed lookups and JSON import
+"""
+
+import pytest
+import json
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, SqliteProgressStorage, WriteJournal, main
+
+
+class TestSqliteStorage:
+    """Test keeping progress in .study_progress.db"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown content for testing"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [ ] Task 1
+
+#### Day 2 (1 hour)
+- [ ] Task 2
+
+#### Day 3 (1 hour)
+- [ ] Task 3
+"""
+
+    @pytest.fixture
+    def markdown_file(self, temp_dir, sample_markdown):
+        """Write the sample plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        return markdown_file
+
+    @pytest.fixture
+    def tracker(self, temp_dir, markdown_file):
+        """Create a StudyTracker instance on the SQLite backend"""
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+        tracker = StudyTracker(markdown_file, progress_file, storage="sqlite")
+        tracker.parse_markdown()
+        return tracker
+
+    def reopen(self, tracker):
+        return StudyTracker(tracker.markdown_file, tracker.progress_file, storage="sqlite")
+
+    def test_database_in_wal_mode(self, tracker, temp_dir):
+        """The database sits beside the progress file and uses WAL"""
+        assert isinstance(tracker.storage, SqliteProgressStorage)
+        assert tracker.storage.db_file == os.path.join(temp_dir, ".test_progress.db")
+        (mode,) = tracker.storage.connection.execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    def test_progress_round_trip(self, tracker):
+        """Marks and undos read back exactly as they were saved"""
+        assert tracker.mark_day_complete(1) == True
+        assert tracker.mark_day_complete(2) == True
+        assert tracker.undo_last_action() == True
+
+        reloaded = self.reopen(tracker)
+        assert reloaded.progress_data == tracker.progress_data
+        assert reloaded.progress_data["completed_days"] == [1]
+        assert [e["action"] for e in reloaded.progress_data["history"]] == [
+            "complete",
+            "complete",
+            "undo",
+        ]
+        # No JSON progress was written alongside
+        assert not os.path.exists(tracker.progress_file)
+
+    def test_save_touches_only_changed_rows(self, tracker):
+        """Marking a day inserts its rows instead of rewriting every table"""
+        tracker.mark_day_complete(1)
+
+        statements = []
+        tracker.storage.connection.set_trace_callback(statements.append)
+        tracker.mark_day_complete(2)
+        tracker.storage.connection.set_trace_callback(None)
+
+        assert sum(sql.startswith("INSERT INTO events") for sql in statements) == 1
+        assert sum(sql.startswith("INSERT INTO completed_days") for sql in statements) == 1
+        assert not any(sql.startswith("DELETE") for sql in statements)
+
+    def test_last_complete_is_indexed_lookup(self, tracker):
+        """undo finds the last completion through the (action, id) index"""
+        tracker.mark_day_complete(1)
+        tracker.mark_day_complete(2)
+
+        entry = tracker.storage.last_event(tracker.progress_data, "complete")
+        assert entry["day"] == 2
+
+        plan = tracker.storage.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT action, day, timestamp, extra FROM events"
+            " WHERE action = ? ORDER BY id DESC LIMIT 1",
+            ("complete",),
+        ).fetchall()
+        assert "events_action" in str(plan)
+
+    def test_unsaved_history_is_scanned(self, tracker):
+        """Entries added in memory are found before they are saved"""
+        tracker.progress_data["history"] = [
+            {"action": "complete", "day": 3, "timestamp": "2024-01-01T10:00:00"}
+        ]
+        entry = tracker.storage.last_event(tracker.progress_data, "complete")
+        assert entry["day"] == 3
+
+    def test_json_progress_imported_once(self, temp_dir, markdown_file):
+        """Opening the database for the first time imports the JSON files"""
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+        json_tracker = StudyTracker(markdown_file, progress_file)
+        json_tracker.parse_markdown()
+        json_tracker.mark_day_complete(1)
+
+        tracker = StudyTracker(markdown_file, progress_file, storage="sqlite")
+        assert tracker.progress_data == json_tracker.progress_data
+
+        # Later JSON changes no longer matter to the database
+        json_tracker.mark_day_complete(2)
+        assert self.reopen(tracker).progress_data["completed_days"] == [1]
+
+    def test_discarded_batch_rolls_back(self, tracker):
+        """Nothing reaches the database when the journal batch fails"""
+        with pytest.raises(OSError):
+            with tracker.journal.batch():
+                tracker.mark_day_complete(1)
+                raise OSError("Disk full")
+
+        assert self.reopen(tracker).progress_data["history"] == []
+
+        # The next save writes everything again
+        tracker.save_progress()
+        assert self.reopen(tracker).progress_data["completed_days"] == [1]
+
+    def read_plan(self, tracker):
+        with open(tracker.markdown_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_crash_after_database_commit_is_recovered(self, tracker):
+        """Plan writes of a batch the database committed are redone"""
+        with patch.object(WriteJournal, "apply", side_effect=SystemExit("crash")):
+            with pytest.raises(SystemExit):
+                tracker.mark_day_complete(1)
+        assert "- [ ] Task 1" in self.read_plan(tracker)
+
+        recovered = self.reopen(tracker)
+        assert "- [x] Task 1" in self.read_plan(tracker)
+        assert recovered.progress_data["completed_days"] == [1]
+
+    def test_crash_before_database_commit_is_dropped(self, tracker):
+        """A prepared record the database never committed is not redone"""
+        journal = tracker.journal
+        prepared = {}
+
+        def crash(txid):
+            with open(journal.path, "rb") as f:
+                prepared["record"] = f.read()
+            raise SystemExit("crash")
+
+        with patch.object(tracker.storage, "commit", side_effect=crash):
+            with pytest.raises(SystemExit):
+                tracker.mark_day_complete(1)
+        # A killed process leaves the prepared record behind
+        with open(journal.path, "wb") as f:
+            f.write(prepared["record"])
+
+        recovered = self.reopen(tracker)
+        assert not os.path.exists(journal.path)
+        assert "- [ ] Task 1" in self.read_plan(tracker)
+        assert recovered.progress_data["completed_days"] == []
+
+    def test_storage_option(self, markdown_file):
+        """--storage picks the backend"""
+        with patch(
+            "sys.argv",
+            ["study_tracker.py", "--plan", markdown_file, "--storage", "sqlite"],
+        ), patch("study_tracker.StudyTracker") as mock_tracker:
+            main()
+
+        mock_tracker.assert_called_once_with(markdown_file, storage="sqlite")
+
+    def test_existing_database_is_used(self, tracker):
+        """Without --storage a run keeps using the database it finds"""
+        tracker.mark_day_complete(1)
+
+        reopened = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        assert isinstance(reopened.storage, SqliteProgressStorage)
+        assert reopened.progress_data["completed_days"] == [1]
+
+    def test_json_refused_once_database_exists(self, tracker):
+        """Asking for JSON beside a database would read stale progress"""
+        with patch("study_tracker.console.print") as mock_print:
+            with pytest.raises(SystemExit):
+                StudyTracker(tracker.markdown_file, tracker.progress_file, storage="json")
+        assert tracker.storage.db_file in mock_print.call_args[0][0]
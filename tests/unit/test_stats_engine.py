@@ -0,0 +1,178 @@
+"""
+Unit tests for the history statistics engine in study_tracker.py
+Tests rolling session windows, the weekday histogram, velocity and --stats --detailed
+"""
+
+import pytest
+import os
+import random
+import tempfile
+import shutil
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+import sys
+
+from rich.console import Console
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import study_tracker
+from study_tracker import StatsEngine, StudyTracker, stamp_entry
+
+
+def naive_window(rows, today, days):
+    return sum(sessions for ordinal, sessions, _ in rows if today - days < ordinal <= today)
+
+
+@pytest.fixture(params=["numpy", "lists"])
+def backend(request):
+    """Run each engine test with NumPy arrays and with the list fallback"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        yield request.param
+    else:
+        with patch("study_tracker.np", None):
+            yield request.param
+
+
+class TestStatsEngine:
+    """Test the columnar statistics over history rows"""
+
+    def random_rows(self, count, seed=21):
+        rng = random.Random(seed)
+        rows = []
+        for _ in range(count):
+            ordinal = 738000 + rng.randrange(400)
+            if rng.random() < 0.8:
+                rows.append((ordinal, 1, rng.randint(1, 3)))
+            else:
+                rows.append((ordinal, 0, -1))
+        return rows
+
+    def engine(self, rows):
+        return StatsEngine(*(list(column) for column in zip(*rows)))
+
+    def test_windows_match_naive_count(self, backend):
+        """Window sums over unsorted rows equal a direct count"""
+        rows = self.random_rows(3000)
+        engine = self.engine(rows)
+
+        for today in (738000, 738123, 738399, 738500):
+            for days in StatsEngine.WINDOWS:
+                assert engine.window_sessions(today, days) == naive_window(rows, today, days)
+
+    def test_best_window(self, backend):
+        """The best window is the largest count ending on any row's day"""
+        rows = self.random_rows(500, seed=5)
+        engine = self.engine(rows)
+        for days in (1, 7, 30):
+            expected = max(naive_window(rows, ordinal, days) for ordinal, _, _ in rows)
+            assert engine.best_window(days) == expected
+        assert StatsEngine([], [], []).best_window(7) == 0
+
+    def test_weekday_histogram(self, backend):
+        """Sessions are counted on the weekday of their day, Monday first"""
+        monday = date(2024, 1, 1).toordinal()
+        engine = StatsEngine(
+            [monday, monday + 2, monday + 7, monday + 6, monday + 6],
+            [1, 1, 1, 0, 2],
+            [1, 1, 1, -1, 2],
+        )
+        assert engine.weekday_histogram() == [2, 0, 1, 0, 0, 0, 2]
+
+    def test_velocity(self, backend):
+        """Net days per week, recent and overall"""
+        today = date(2024, 3, 1).toordinal()
+        engine = StatsEngine(
+            [today - 27, today - 10, today - 3, today],
+            [1, 1, 0, 1],
+            [7, 5, -2, 2],
+        )
+        assert engine.velocity(today, 2) == pytest.approx((5 - 2 + 2) / 2)
+        assert engine.velocity(today, 4) == pytest.approx(12 / 4)
+        assert engine.velocity(today) == pytest.approx(12 / 4)
+        assert StatsEngine([], [], []).velocity(today) == 0.0
+
+    def test_from_progress(self, backend):
+        """Rollup days, grouped ranges and undos all become rows"""
+        now = datetime(2024, 3, 1, 12, 0)
+        progress = {
+            "rollup": {
+                "2024-01-01": {"sessions": 2, "days_completed": 3, "undos": 1},
+                "2024-01-02": {
+                    "sessions": 1, "days_completed": 4, "undos": 1, "days_undone": 3
+                },
+            },
+            "history": [
+                stamp_entry({"action": "complete", "days": [[1, 5], [8, 9]]}, now),
+                stamp_entry({"action": "undo", "day": 9}, now),
+                stamp_entry({"action": "complete", "day": 10}, now + timedelta(days=1)),
+            ],
+        }
+        engine = StatsEngine.from_progress(progress)
+        today = now.date().toordinal() + 1
+
+        assert len(engine.days) == 4
+        assert engine.window_sessions(today, 2) == 2
+        assert engine.window_sessions(today, 365) == 5
+        assert engine.window(engine.net_sums, today, 2) == 7 - 1 + 1
+        assert engine.window(engine.net_sums, today, 365) == 7 - 1 + 1 + 2 + 1
+
+
+class TestDetailedStats:
+    """Test the --stats --detailed output"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def tracker(self, temp_dir):
+        """Create a StudyTracker with a week of completions"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write("# Test Study Plan\n\n### Week 1\n")
+            for day in range(1, 11):
+                f.write(f"#### Day {day} (1 hour)\n- [ ] Task {day}\n\n")
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        now = datetime.now()
+        tracker.progress_data["history"] = [
+            stamp_entry({"action": "complete", "day": day}, now - timedelta(days=7 - day))
+            for day in range(1, 8)
+        ]
+        return tracker
+
+    def render(self, tracker, detailed):
+        console = Console(width=120, record=True)
+        with patch.object(study_tracker, "console", console):
+            tracker.show_stats(detailed=detailed)
+        return console.export_text()
+
+    def test_detailed_adds_history_metrics(self, tracker):
+        """Rolling windows, weekdays and velocity follow the summary"""
+        text = self.render(tracker, detailed=True)
+
+        assert "Rolling Sessions" in text
+        assert "7 days" in text and "90 days" in text
+        assert "Sessions by Weekday" in text
+        assert "Velocity: 1.8 days/week (last 4 weeks), 7.0 days/week overall" in text
+
+    def test_plain_stats_unchanged(self, tracker):
+        """Without --detailed the history is not summarized"""
+        text = self.render(tracker, detailed=False)
+        assert "Study Statistics" in text
+        assert "Rolling Sessions" not in text
+
+    def test_main_passes_detailed(self):
+        """--stats --detailed reaches show_stats"""
+        with patch("study_tracker.StudyTracker") as mock_class, patch(
+            "sys.argv", ["study_tracker.py", "--stats", "--detailed"]
+        ):
+            study_tracker.main()
+        mock_class.return_value.show_stats.assert_called_once_with(detailed=True)
@@ -0,0 +1,150 @@
+"""
+Unit tests for the incremental streak engine in study_tracker.py
+Tests StreakRuns, the persisted streak index and the full rebuild
+"""
+
+import pytest
+import os
+import random
+import tempfile
+import shutil
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker, StreakRuns
+
+
+class TestStreakRuns:
+    """Test keeping study dates as runs of ordinals"""
+
+    def test_add_merges_neighbours(self):
+        """A date joins the run before, after, or both"""
+        runs = StreakRuns()
+        for ordinal in (10, 12, 20, 11, 19, 12):
+            runs.add(ordinal)
+        assert runs.to_list() == [[10, 12], [19, 20]]
+        assert runs.longest == 3
+
+        runs.add(21)
+        runs.add(18)
+        assert runs.to_list() == [[10, 12], [18, 21]]
+        assert runs.longest == 4
+
+    def test_current_run(self):
+        """Only a run ending today or yesterday is current"""
+        runs = StreakRuns([[1, 3], [7, 9]])
+        assert runs.current(9) == 3
+        assert runs.current(10) == 3
+        assert runs.current(11) == 0
+        assert StreakRuns().current(5) == 0
+
+    def test_incremental_matches_rebuild(self):
+        """Adding dates one by one gives the same runs as sorting them"""
+        rng = random.Random(19)
+        ordinals = [rng.randrange(1000) for _ in range(2000)]
+
+        runs = StreakRuns()
+        for ordinal in ordinals:
+            runs.add(ordinal)
+        rebuilt = StreakRuns.from_ordinals(ordinals)
+
+        assert runs.to_list() == rebuilt.to_list()
+        assert runs.longest == rebuilt.longest
+
+
+class TestStreakIndex:
+    """Test the streak index kept in the progress"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def tracker(self, temp_dir):
+        """Create a StudyTracker instance on a small plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write("# Test Study Plan\n\n### Week 1\n#### Day 1 (1 hour)\n- [ ] Task 1\n")
+
+        return StudyTracker(markdown_file, progress_file)
+
+    def completions(self, days_ago):
+        now = datetime.now()
+        return [
+            {"action": "complete", "day": 1, "timestamp": (now - timedelta(days=d)).isoformat()}
+            for d in days_ago
+        ]
+
+    def test_longest_is_true_longest_run(self, tracker):
+        """An old run longer than the current one is the longest streak"""
+        tracker.progress_data["history"] = self.completions([40, 39, 38, 37, 36, 1, 0])
+        tracker.update_streak()
+
+        stats = tracker.progress_data["stats"]
+        assert stats["current_streak"] == 2
+        assert stats["longest_streak"] == 5
+
+    def test_only_new_entries_are_parsed(self, tracker):
+        """Each call reads just the history added since the last one"""
+        tracker.progress_data["history"] = self.completions(range(200, -1, -1))
+        tracker.update_streak()
+        tracker.progress_data["history"].extend(self.completions([0]))
+
+        with patch("study_tracker.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime.now()
+            mock_datetime.fromisoformat.side_effect = datetime.fromisoformat
+            tracker.update_streak()
+
+        assert mock_datetime.fromisoformat.call_count == 1
+        assert tracker.progress_data["stats"]["current_streak"] == 201
+
+    def test_index_survives_reload(self, tracker):
+        """A fresh tracker continues from the saved index"""
+        tracker.progress_data["history"] = self.completions([2, 1])
+        tracker.update_streak()
+        tracker.save_progress()
+
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        reloaded.progress_data["history"].extend(self.completions([0]))
+        with patch.object(reloaded, "rebuild_streaks") as mock_rebuild:
+            reloaded.update_streak()
+
+        mock_rebuild.assert_not_called()
+        assert reloaded.progress_data["stats"]["current_streak"] == 3
+        assert reloaded.progress_data["streak_index"] == {
+            "runs": [[datetime.now().date().toordinal() - 2, datetime.now().date().toordinal()]],
+            "events": 3,
+        }
+
+    def test_replaced_history_rebuilds(self, tracker):
+        """A history list swapped out after indexing is indexed again"""
+        tracker.progress_data["history"] = self.completions([3, 2, 1, 0])
+        tracker.update_streak()
+        assert tracker.progress_data["stats"]["current_streak"] == 4
+
+        tracker.progress_data["history"] = self.completions([0])
+        tracker.update_streak()
+        assert tracker.progress_data["stats"]["current_streak"] == 1
+        assert tracker.progress_data["stats"]["longest_streak"] == 1
+
+    def test_compaction_keeps_index(self, tracker):
+        """Folding history shifts the index instead of discarding it"""
+        tracker.progress_data["history"] = self.completions(range(120, -1, -1))
+        tracker.update_streak()
+        tracker.compact_history(30)
+
+        index = tracker.progress_data["streak_index"]
+        assert index["events"] == len(tracker.progress_data["history"])
+        with patch.object(tracker, "rebuild_streaks") as mock_rebuild:
+            tracker.update_streak()
+        mock_rebuild.assert_not_called()
+        assert tracker.progress_data["stats"]["longest_streak"] == 121
+        assert tracker.rebuild_streaks().to_list() == index["runs"]
@@ -0,0 +1,144 @@
+"""
+Unit tests for batched tracker transactions in study_tracker.py
+Tests deferred saves, single commits and jump_to_day batching
+"""
+
+import pytest
+import os
+import tempfile
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add parent directory to path to import study_tracker
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from study_tracker import StudyTracker
+
+
+class TestTransactions:
+    """Test deferring saves until a transaction exits"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for test files"""
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def sample_markdown(self):
+        """Sample markdown with several tasks per day"""
+        return """# Test Study Plan
+
+## 📅 PHASE 1: FUNDAMENTALS
+
+### Week 1
+#### Day 1 (1 hour)
+- [x] Task 1
+- [ ] Task 2
+
+#### Day 2 (1 hour)
+- [ ] Task 3
+- [ ] Task 4
+
+#### Day 3 (1 hour)
+- [ ] Task 5
+  - [ ] Nested task 6
+
+#### Day 4 (1 hour)
+- [ ] Task 7
+"""
+
+    @pytest.fixture
+    def tracker(self, temp_dir, sample_markdown):
+        """Create a StudyTracker instance with a parsed plan"""
+        markdown_file = os.path.join(temp_dir, "test_study_plan.md")
+        progress_file = os.path.join(temp_dir, ".test_progress.json")
+
+        with open(markdown_file, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+
+        tracker = StudyTracker(markdown_file, progress_file)
+        tracker.parse_markdown()
+        return tracker
+
+    def read(self, tracker):
+        with open(tracker.markdown_file, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_saves_deferred_until_exit(self, tracker, sample_markdown):
+        """Nothing is written inside the block; everything is written once after"""
+        with patch.object(
+            tracker.journal, "commit", wraps=tracker.journal.commit
+        ) as mock_commit, patch.object(
+            tracker.storage, "save", wraps=tracker.storage.save
+        ) as mock_save:
+            with tracker.transaction():
+                assert tracker.mark_day_complete(1) == True
+                assert tracker.mark_day_complete(2) == True
+                assert self.read(tracker) == sample_markdown
+                assert not os.path.exists(tracker.progress_file)
+                mock_commit.assert_not_called()
+
+            mock_commit.assert_called_once()
+            mock_save.assert_called_once()
+
+        content = self.read(tracker)
+        assert "- [x] Task 2\n\n#### Day 2 (1 hour)\n- [x] Task 3\n- [x] Task 4" in content
+        reloaded = StudyTracker(tracker.markdown_file, tracker.progress_file)
+        assert reloaded.progress_data["completed_days"] == [1, 2]
+
+    def test_streak_updated_once(self, tracker):
+        """update_streak runs once on exit instead of per mark"""
+        with patch.object(
+            tracker, "update_streak", wraps=tracker.update_streak
+        ) as mock_streak:
+            with tracker.transaction():
+                tracker.mark_day_complete(1)
+                tracker.mark_day_complete(2)
+                tracker.mark_day_complete(3)
+
+        # Three deferred calls plus the real one on exit
+        assert mock_streak.call_count == 4
+        assert tracker.progress_data["stats"]["current_streak"] == 1
+
+    def test_failed_transaction_writes_nothing(self, tracker, sample_markdown):
+        """An error inside the block leaves the files untouched"""
+        with pytest.raises(RuntimeError):
+            with tracker.transaction():
+                tracker.mark_day_complete(1)
+                raise RuntimeError("interrupted")
+
+        assert self.read(tracker) == sample_markdown
+        assert not os.path.exists(tracker.progress_file)
+        assert tracker.pending is None
+
+    def test_nested_transactions_join(self, tracker):
+        """Only the outermost transaction commits"""
+        with patch.object(
+            tracker.journal, "commit", wraps=tracker.journal.commit
+        ) as mock_commit:
+            with tracker.transaction():
+                with tracker.transaction():
+                    tracker.mark_day_complete(1)
+                mock_commit.assert_not_called()
+                tracker.undo_last_action()
+            mock_commit.assert_called_once()
+
+        assert "- [ ] Task 2" in self.read(tracker)
+
+    def test_jump_to_day_commits_once(self, tracker):
+        """A bulk jump marks each earlier day and writes the files once"""
+        with patch.object(
+            tracker.journal, "commit", wraps=tracker.journal.commit
+        ) as mock_commit, patch("study_tracker.console.print") as mock_print:
+            with patch.object(tracker, "show_status"):
+                tracker.jump_to_day(4)
+            mock_commit.assert_called_once()
+
+        mock_print.assert_called_with("[green]Marked 3 days as complete[/green]")
+        content = self.read(tracker)
+        assert content.count("[x]") == 6
+        assert "- [ ] Task 7" in content
+        assert tracker.progress_data["completed_days"] == [1, 2, 3]
+        assert tracker.get_current_day() == 4